@@ -1,7 +1,9 @@
 # /// script
 # requires-python = ">=3.12"
 # dependencies = [
-#     "polars>=0.19.0",
+#     "polars>=1.18.0",
+#     "numpy>=1.24.0",
+#     "scipy>=1.11.0",
 #     "galvani>=0.4.1",
 #     "yadg>=6.2.0",
 # ]
@@ -9,14 +11,23 @@
 
 from __future__ import annotations
 
+import argparse
+import base64
+import hashlib
+import inspect
 import json
+import os
 import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
+import numpy as np
 import polars as pl
 from galvani.BioLogic import MPRfile
+from scipy import stats
 from yadg.subcommands import extract as yadg_extract
 
 
@@ -25,6 +36,10 @@ DATA_DIR = ROOT / "data"
 if not DATA_DIR.exists():
     DATA_DIR = ROOT / "apps" / "public" / "data"
 OUT_DIR = ROOT / "apps" / "public" / "data"
+# private intermediate results (not published with the app)
+CACHE_DIR = ROOT / ".cache" / "precompute"
+
+META_COLS = ["study_phase", "participant", "repetition", "flow_rate"]
 
 
 def mpr_extract_metadata(path: Path, file_type: Optional[str] = None) -> tuple[dict, dict]:
@@ -167,6 +182,641 @@ def build_eis_flat_df(data_structure_df: pl.DataFrame) -> pl.DataFrame:
     return pl.concat(frames, how="vertical_relaxed") if frames else pl.DataFrame()
 
 
+def collect_eis_spectra(eis_flat_df: pl.DataFrame) -> pl.DataFrame:
+    # one row per spectrum (experiment + cycle) with the frequency-sorted
+    # impedance data as list columns and a content hash used as cache key
+    # (together with the engine_hash of the evaluation, see split_cached_spectra)
+    spectra_df = (
+        eis_flat_df.filter(pl.col("freq/Hz") > 0)
+        .sort([*META_COLS, "cycle", "freq/Hz"], descending=[False] * 5 + [True])
+        .group_by([*META_COLS, "cycle"], maintain_order=True)
+        .agg(
+            pl.col("freq/Hz").cast(pl.Float64),
+            pl.col("Re(Z)/Ohm").cast(pl.Float64),
+            pl.col("-Im(Z)/Ohm").cast(pl.Float64),
+        )
+        .filter(pl.col("freq/Hz").list.len() >= 5)
+    )
+
+    hashes = [
+        hashlib.sha1(
+            np.asarray(freq).tobytes() + np.asarray(re).tobytes() + np.asarray(im).tobytes()
+        ).hexdigest()
+        for freq, re, im in spectra_df.select("freq/Hz", "Re(Z)/Ohm", "-Im(Z)/Ohm").iter_rows()
+    ]
+
+    return spectra_df.with_columns(pl.Series("spectrum_hash", hashes, dtype=pl.String))
+
+
+def engine_hash(functions: list[Callable[..., Any]], parameters: dict[str, Any]) -> str:
+    # hash of the source code and parameters of an evaluation (fit, DRT, Lin-KK),
+    # stored with its results so that changing either invalidates the cached rows
+    digest = hashlib.sha1()
+    for function in functions:
+        digest.update(inspect.getsource(function).encode())
+    digest.update(json.dumps(parameters, sort_keys=True, default=lambda value: np.asarray(value).tolist()).encode())
+    return digest.hexdigest()
+
+
+def split_cached_spectra(
+    spectra_df: pl.DataFrame, cache_df: Optional[pl.DataFrame], engine: str
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    # split into (rows of cache_df for unchanged spectra computed by the same
+    # engine, spectra to compute)
+    keys = [*META_COLS, "cycle", "spectrum_hash"]
+    if (
+        cache_df is None
+        or cache_df.is_empty()
+        or not {"spectrum_hash", "engine_hash"}.issubset(cache_df.columns)
+    ):
+        return pl.DataFrame(), spectra_df
+
+    cached_df = cache_df.filter(pl.col("engine_hash") == engine).join(spectra_df.select(keys), on=keys, how="semi")
+    return cached_df, spectra_df.join(cached_df.select(keys).unique(), on=keys, how="anti")
+
+
+def read_cached_output(name: str, out_dir: Path = OUT_DIR) -> Optional[pl.DataFrame]:
+    path = out_dir / f"{name}.parquet"
+    return pl.read_parquet(path) if path.exists() else None
+
+
+def pad_eis_spectra(spectra_df: pl.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # pad all spectra to the longest one so they can be processed as one
+    # (n_spectra, n_points) batch; the mask marks the valid samples
+    lengths = spectra_df["freq/Hz"].list.len().to_numpy()
+    n_points = int(lengths.max()) if len(lengths) else 0
+    mask = np.arange(n_points)[None, :] < lengths[:, None]
+
+    freq = np.ones(mask.shape)
+    z = np.zeros(mask.shape, dtype=np.complex128)
+    for i, (f, re, im) in enumerate(
+        spectra_df.select("freq/Hz", "Re(Z)/Ohm", "-Im(Z)/Ohm").iter_rows()
+    ):
+        freq[i, : len(f)] = f
+        z[i, : len(f)] = np.asarray(re) - 1j * np.asarray(im)
+
+    return freq, z, mask
+
+
+# EQUIVALENT CIRCUIT FITTING
+# Randles circuit with constant phase element: R_s - ((R_ct - W) || Q)
+#   Z = R_s + 1 / (1 / (R_ct + sigma / sqrt(jw)) + Q (jw)^alpha)
+# Parameters are fitted as theta = [ln R_s, ln R_ct, ln Q, alpha, ln sigma]
+# with a batched Levenberg-Marquardt solver, i.e. residuals, Jacobians and
+# normal equations are evaluated for all spectra at once. Fits that did not
+# converge (fit_converged) or ended with parameters at their bounds
+# (fit_at_bound, with the names in fit_bound_params) are flagged, not dropped.
+RANDLES_PARAMS = ["R_s/Ohm", "R_ct/Ohm", "Q_dl/F*s^(alpha-1)", "alpha_dl", "sigma_w/Ohm*s^-0.5"]
+THETA_LOWER = np.array([np.log(1e-9), np.log(1e-9), np.log(1e-12), 0.3, np.log(1e-9)])
+THETA_UPPER = np.array([np.log(1e6), np.log(1e6), np.log(1e3), 1.0, np.log(1e6)])
+
+
+def _randles_impedance(
+    theta: np.ndarray, sqrt_s: np.ndarray, log_s: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    r_s, r_ct, q, sigma = (np.exp(theta[:, [i]]) for i in (0, 1, 2, 4))
+    alpha = theta[:, [3]]
+
+    # s = jw is passed as sqrt(s) and log(s) to avoid complex powers
+    s_alpha = np.exp(alpha * log_s)
+    z_w = sigma / sqrt_s
+    z_b = r_ct + z_w
+    y = 1 / z_b + q * s_alpha
+    z = r_s + 1 / y
+
+    # analytic derivatives w.r.t. theta (log-parameters via chain rule)
+    dz_dy = -1 / y**2
+    dz_dzb = dz_dy * (-1 / z_b**2)
+    jac = np.stack(
+        [
+            np.broadcast_to(r_s, z.shape).astype(np.complex128),
+            dz_dzb * r_ct,
+            dz_dy * q * s_alpha,
+            dz_dy * q * s_alpha * log_s,
+            dz_dzb * z_w,
+        ],
+        axis=-1,
+    )
+    return z, jac
+
+
+def _randles_initial_guesses(freq: np.ndarray, z: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # R_s and R_ct from the real-axis span; Q, alpha and sigma are scanned on a
+    # small grid (multi-start) since a single guess often ends in a local minimum
+    re = np.where(mask, z.real, np.nan)
+    r_s = np.clip(np.nanmin(re, axis=1), 1e-6, None)
+    r_ct = np.clip(0.5 * (np.nanmax(re, axis=1) - r_s), 1e-6, None)
+
+    grid = np.array(
+        [
+            [np.log(q), alpha, np.log(sigma)]
+            for q in np.logspace(-3, 1, 5)
+            for alpha in (0.5, 0.75, 0.95)
+            for sigma in (1e-3, 1e-1)
+        ]
+    )
+    theta = np.empty((len(freq), len(grid), 5))
+    theta[..., 0] = np.log(r_s)[:, None]
+    theta[..., 1] = np.log(r_ct)[:, None]
+    theta[..., 2] = grid[None, :, 0]
+    theta[..., 3] = grid[None, :, 1]
+    theta[..., 4] = grid[None, :, 2] + np.log(r_ct)[:, None]
+    return theta
+
+
+def fit_randles_batch(
+    freq: np.ndarray,
+    z: np.ndarray,
+    mask: np.ndarray,
+    max_iter: int = 200,
+    tol: float = 1e-8,
+    n_best_starts: int = 3,
+    prune_after: int = 15,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # every start point of every spectrum is one row of the batch
+    theta0 = _randles_initial_guesses(freq, z, mask)
+    n_spectra, n_starts, _ = theta0.shape
+    theta = np.clip(theta0.reshape(n_spectra * n_starts, -1), THETA_LOWER, THETA_UPPER)
+    freq, z, mask = (np.repeat(a, n_starts, axis=0) for a in (freq, z, mask))
+
+    omega = 2 * np.pi * freq
+    sqrt_s = np.sqrt(omega) * np.exp(0.25j * np.pi)
+    log_s = np.log(omega) + 0.5j * np.pi
+    weight = np.where(mask, 1 / np.abs(np.where(mask, z, 1)), 0.0)
+
+    def _residuals(theta: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        with np.errstate(all="ignore"):
+            z_fit, jac = _randles_impedance(theta, sqrt_s[rows], log_s[rows])
+            res = (z_fit - z[rows]) * weight[rows]
+            jac = jac * weight[rows][..., None]
+            res = np.concatenate([res.real, res.imag], axis=1)
+            cost = np.einsum("bi,bi->b", res, res)
+        return res, np.concatenate([jac.real, jac.imag], axis=1), np.where(np.isfinite(cost), cost, np.inf)
+
+    res, jac, cost = _residuals(theta, np.arange(len(theta)))
+    lam = np.full(len(theta), 1e-2)
+    done = np.zeros(len(theta), dtype=bool)
+    eye = np.eye(theta.shape[1])
+
+    for iteration in range(max_iter):
+        # after a few iterations only the most promising start points are refined
+        if iteration == prune_after and n_starts > n_best_starts:
+            rank = np.argsort(np.argsort(cost.reshape(n_spectra, n_starts), axis=1), axis=1)
+            done |= rank.ravel() >= n_best_starts
+
+        rows = np.flatnonzero(~done)
+        if rows.size == 0:
+            break
+
+        # normal equations of the active rows only (batched matmul + solve)
+        jac_t = jac[rows].transpose(0, 2, 1)
+        jtj = jac_t @ jac[rows]
+        jtr = (jac_t @ res[rows][..., None])[..., 0]
+        damping = lam[rows, None, None] * (jtj * eye + 1e-12 * eye)
+        step = np.nan_to_num(np.linalg.solve(jtj + damping, -jtr[..., None])[..., 0])
+
+        # limit the step length (log-space) and keep parameters in a sane range
+        step_norm = np.linalg.norm(step, axis=1, keepdims=True)
+        step = np.where(step_norm > 2.0, step * 2.0 / np.maximum(step_norm, 1e-300), step)
+        theta_new = np.clip(theta[rows] + step, THETA_LOWER, THETA_UPPER)
+        res_new, jac_new, cost_new = _residuals(theta_new, rows)
+
+        # accept improving steps per row, adapt the damping individually
+        accept = cost_new < cost[rows]
+        small = accept & ((cost[rows] - cost_new) < tol * np.maximum(cost[rows], tol))
+        acc_rows = rows[accept]
+        theta[acc_rows] = theta_new[accept]
+        res[acc_rows] = res_new[accept]
+        jac[acc_rows] = jac_new[accept]
+        cost[acc_rows] = cost_new[accept]
+        lam[rows] = np.where(accept, lam[rows] / 3, np.minimum(lam[rows] * 4, 1e10))
+        done[rows] |= small | (lam[rows] >= 1e10)
+
+    # keep the best start point per spectrum
+    best = np.argmin(cost.reshape(n_spectra, n_starts), axis=1)
+    rows = np.arange(n_spectra) * n_starts + best
+    theta, cost = theta[rows], cost[rows]
+    n_valid = mask[rows].sum(axis=1)
+
+    params = np.exp(theta)
+    params[:, 3] = theta[:, 3]
+    rel_rmse = np.sqrt(cost / (2 * n_valid))
+    # parameters pinned at their bounds (per spectrum and parameter)
+    at_bound = (theta <= THETA_LOWER + 1e-9) | (theta >= THETA_UPPER - 1e-9)
+    return params, rel_rmse, done[rows], at_bound
+
+
+def _fit_randles_chunk(
+    args: tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return fit_randles_batch(*args)
+
+
+def build_eis_circuit_fit_df(
+    eis_flat_df: pl.DataFrame,
+    cache_df: Optional[pl.DataFrame] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 64,
+) -> pl.DataFrame:
+    if eis_flat_df.is_empty():
+        return pl.DataFrame()
+
+    # reuse fits of unchanged spectra from a previous precompute run
+    engine = engine_hash(
+        [_randles_impedance, _randles_initial_guesses, fit_randles_batch],
+        {"theta_lower": THETA_LOWER, "theta_upper": THETA_UPPER},
+    )
+    cached_df, spectra_df = split_cached_spectra(collect_eis_spectra(eis_flat_df), cache_df, engine)
+    if spectra_df.is_empty():
+        return cached_df.sort([*META_COLS, "cycle"])
+
+    # split the spectra into padded batches and fit them in a process pool
+    chunks = [
+        pad_eis_spectra(spectra_df.slice(offset, chunk_size))
+        for offset in range(0, spectra_df.height, chunk_size)
+    ]
+    max_workers = max_workers or min(len(chunks), os.cpu_count() or 1)
+    if max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_fit_randles_chunk, chunks))
+    else:
+        results = [_fit_randles_chunk(chunk) for chunk in chunks]
+
+    params = np.concatenate([r[0] for r in results])
+    at_bound = np.concatenate([r[3] for r in results])
+    fit_df = spectra_df.select([*META_COLS, "cycle", "spectrum_hash"]).with_columns(
+        *[pl.Series(name, params[:, i]) for i, name in enumerate(RANDLES_PARAMS)],
+        pl.Series("fit_rel_rmse", np.concatenate([r[1] for r in results])),
+        pl.Series("fit_converged", np.concatenate([r[2] for r in results])),
+        pl.Series("fit_at_bound", at_bound.any(axis=1)),
+        # names of the pinned parameters (e.g. alpha_dl at 0.3, or sigma_w at its lower bound without diffusion)
+        pl.Series(
+            "fit_bound_params",
+            [[name for name, pinned in zip(RANDLES_PARAMS, row) if pinned] for row in at_bound],
+            dtype=pl.List(pl.String),
+        ),
+        spectra_df["freq/Hz"].list.len().alias("n_points"),
+        pl.lit(engine).alias("engine_hash"),
+    )
+
+    if not cached_df.is_empty():
+        fit_df = pl.concat([cached_df, fit_df], how="vertical_relaxed")
+
+    return fit_df.sort([*META_COLS, "cycle"])
+
+
+# DISTRIBUTION OF RELAXATION TIMES (DRT)
+#   Z(w) = R_inf + jwL + sum_k gamma_k dln(tau) / (1 + jw tau_k)
+# solved as Tikhonov-regularised (2nd derivative) non-negative least squares.
+# The kernel and its Gram matrix only depend on the frequency list, so they
+# are built once per frequency grid and shared by all spectra measured on it.
+DRT_POINTS_PER_DECADE = 10
+DRT_LAMBDA = 1e-3
+
+_drt_kernel_cache: dict[bytes, tuple[np.ndarray, np.ndarray, np.ndarray, float, float]] = {}
+
+
+def drt_kernel(
+    freq: np.ndarray, lam: float = DRT_LAMBDA
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
+    key = freq.tobytes() + np.float64(lam).tobytes()
+    if key in _drt_kernel_cache:
+        return _drt_kernel_cache[key]
+
+    omega = 2 * np.pi * freq
+    # tau grid anchored at multiples of 1 / DRT_POINTS_PER_DECADE decades so
+    # that similar frequency ranges share identical tau values, and limited to
+    # the measured range 1 / w_max .. 1 / w_min (RC elements faster than the
+    # highest frequency are indistinguishable from R_inf and would absorb it)
+    log_tau_min = np.ceil(np.log10(1 / omega.max()) * DRT_POINTS_PER_DECADE - 1e-9) / DRT_POINTS_PER_DECADE
+    log_tau_max = np.floor(np.log10(1 / omega.min()) * DRT_POINTS_PER_DECADE + 1e-9) / DRT_POINTS_PER_DECADE
+    n_tau = int(round((log_tau_max - log_tau_min) * DRT_POINTS_PER_DECADE)) + 1
+    tau = np.logspace(log_tau_min, log_tau_max, n_tau)
+    dlntau = np.log(10) / DRT_POINTS_PER_DECADE
+
+    # columns: R_inf, L (scaled by w_max), gamma_1..gamma_K; rows: Re, Im
+    wt = omega[:, None] * tau[None, :]
+    omega_max = float(omega.max())
+    kernel = np.block(
+        [
+            [np.ones((len(freq), 1)), np.zeros((len(freq), 1)), dlntau / (1 + wt**2)],
+            [np.zeros((len(freq), 1)), (omega / omega_max)[:, None], -wt * dlntau / (1 + wt**2)],
+        ]
+    )
+
+    # second-derivative regularisation on gamma only (+ tiny ridge for uniqueness)
+    diff2 = np.diff(np.eye(n_tau), n=2, axis=0)
+    reg = np.zeros((kernel.shape[1], kernel.shape[1]))
+    reg[2:, 2:] = diff2.T @ diff2 + 1e-6 * np.eye(n_tau)
+    gram = kernel.T @ kernel + lam * reg
+    step = 1 / float(np.linalg.eigvalsh(gram).max())
+
+    _drt_kernel_cache[key] = (tau, kernel, gram, step, omega_max)
+    return _drt_kernel_cache[key]
+
+
+def solve_nnls_batch(
+    kernel: np.ndarray,
+    gram: np.ndarray,
+    step: float,
+    b: np.ndarray,
+    max_iter: int = 20_000,
+    tol: float = 1e-10,
+) -> np.ndarray:
+    # accelerated projected gradient (FISTA) for min ||K x - b||^2 + lam ||L x||^2,
+    # x >= 0, with one column of b / x per spectrum
+    c = kernel.T @ b
+    x = np.zeros((kernel.shape[1], b.shape[1]))
+    y, t = x, 1.0
+    for _ in range(max_iter):
+        x_new = np.maximum(y - step * (gram @ y - c), 0.0)
+        t_new = 0.5 * (1 + np.sqrt(1 + 4 * t * t))
+        y = x_new + ((t - 1) / t_new) * (x_new - x)
+        delta = np.abs(x_new - x).max()
+        x, t = x_new, t_new
+        if delta < tol:
+            break
+    return x
+
+
+def build_eis_drt_df(
+    eis_flat_df: pl.DataFrame,
+    cache_df: Optional[pl.DataFrame] = None,
+    lam: float = DRT_LAMBDA,
+) -> pl.DataFrame:
+    if eis_flat_df.is_empty():
+        return pl.DataFrame()
+
+    engine = engine_hash(
+        [drt_kernel, solve_nnls_batch, build_eis_drt_df],
+        {"lam": lam, "points_per_decade": DRT_POINTS_PER_DECADE},
+    )
+    cached_df, spectra_df = split_cached_spectra(collect_eis_spectra(eis_flat_df), cache_df, engine)
+
+    frames: list[pl.DataFrame] = [cached_df] if not cached_df.is_empty() else []
+    # solve all spectra sharing a frequency grid as one batch
+    grid_key = pl.col("freq/Hz").hash().alias("_grid")
+    for grid_df in spectra_df.with_columns(grid_key).partition_by("_grid"):
+        freq = np.asarray(grid_df["freq/Hz"][0], dtype=np.float64)
+        tau, kernel, gram, step, omega_max = drt_kernel(freq, lam)
+
+        # normalise each spectrum by its largest |Z| so lam acts alike on all
+        re = np.vstack(grid_df["Re(Z)/Ohm"].to_numpy()).T
+        im = -np.vstack(grid_df["-Im(Z)/Ohm"].to_numpy()).T
+        scale = np.abs(re + 1j * im).max(axis=0)
+        x = solve_nnls_batch(kernel, gram, step, np.vstack([re, im]) / scale) * scale
+
+        frames.append(
+            grid_df.select([*META_COLS, "cycle", "spectrum_hash"])
+            .with_columns(
+                pl.Series("R_inf/Ohm", x[0]),
+                pl.Series("L/H", x[1] / omega_max),
+                pl.Series("tau/s", [tau] * len(grid_df)),
+                pl.Series("gamma/Ohm", list(x[2:].T)),
+                pl.lit(engine).alias("engine_hash"),
+            )
+            .explode(["tau/s", "gamma/Ohm"])
+            .with_columns(
+                (1 / (2 * np.pi * pl.col("tau/s"))).alias("freq/Hz"),
+            )
+        )
+
+    if not frames:
+        return pl.DataFrame()
+
+    return (
+        pl.concat(frames, how="vertical_relaxed")
+        .select(
+            [*META_COLS, "cycle", "spectrum_hash", "engine_hash", "R_inf/Ohm", "L/H", "tau/s", "freq/Hz", "gamma/Ohm"]
+        )
+        .sort([*META_COLS, "cycle", "tau/s"])
+    )
+
+
+# KRAMERS-KRONIG VALIDATION (Lin-KK, Schoenleber et al. 2014)
+#   Z(w) = R_0 + jwL + 1/(jwC) + sum_k R_k / (1 + jw tau_k)
+# is a KK-compliant model that is linear in its parameters. The number of RC
+# elements is increased until the mu-criterion (over-fitting) is reached; the
+# relative residuals of the final fit measure the KK compliance. The basis
+# matrices only depend on the frequency list and are shared between spectra.
+KK_MU_CRITERION = 0.85
+KK_MAX_ELEMENTS = 50
+KK_RESIDUAL_LIMIT = 0.02
+
+_lin_kk_basis_cache: dict[bytes, np.ndarray] = {}
+
+
+def lin_kk_basis(freq: np.ndarray, n_rc: int) -> np.ndarray:
+    key = freq.tobytes() + n_rc.to_bytes(2, "little")
+    if key in _lin_kk_basis_cache:
+        return _lin_kk_basis_cache[key]
+
+    omega = 2 * np.pi * freq
+    tau = np.logspace(np.log10(1 / omega.max()), np.log10(1 / omega.min()), n_rc)
+    wt = omega[:, None] * tau[None, :]
+
+    # columns: R_0, L (scaled by w_max), 1/C (scaled by w_min), R_1..R_M; rows: Re, Im
+    zeros, ones = np.zeros((len(freq), 1)), np.ones((len(freq), 1))
+    basis = np.block(
+        [
+            [ones, zeros, zeros, 1 / (1 + wt**2)],
+            [zeros, (omega / omega.max())[:, None], -(omega.min() / omega)[:, None], -wt / (1 + wt**2)],
+        ]
+    )
+
+    _lin_kk_basis_cache[key] = basis
+    return basis
+
+
+def lin_kk_batch(freq: np.ndarray, z: np.ndarray) -> dict[str, np.ndarray]:
+    # z: (n_spectra, n_points) complex impedances measured on the same frequency list
+    weight = np.tile(1 / np.abs(z), 2)
+    b = np.hstack([z.real, z.imag]) * weight
+
+    def _fit(n_rc: int, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        basis = lin_kk_basis(freq, n_rc)[None, :, :] * weight[rows][..., None]
+        x = (np.linalg.pinv(basis) @ b[rows][..., None])[..., 0]
+        return x, (basis @ x[..., None])[..., 0] - b[rows]
+
+    n_spectra, n_points = z.shape
+    max_rc = min(KK_MAX_ELEMENTS, n_points - 3)
+    n_rc = np.full(n_spectra, max_rc)
+    mu = np.full(n_spectra, np.nan)
+    residuals = np.full((n_spectra, 2 * n_points), np.nan)
+    todo = np.ones(n_spectra, dtype=bool)
+
+    for m in range(3, max_rc + 1):
+        rows = np.flatnonzero(todo)
+        if rows.size == 0:
+            break
+
+        x, res = _fit(m, rows)
+        r_k = x[:, 3:]
+        mu_m = 1 - np.abs(np.where(r_k < 0, r_k, 0)).sum(axis=1) / np.maximum(
+            np.where(r_k >= 0, r_k, 0).sum(axis=1), 1e-300
+        )
+        stop = (mu_m <= KK_MU_CRITERION) | (m == max_rc)
+        n_rc[rows[stop]] = m
+        mu[rows[stop]] = mu_m[stop]
+        residuals[rows[stop]] = res[stop]
+        todo[rows[stop]] = False
+
+    res_re, res_im = residuals[:, :n_points], residuals[:, n_points:]
+    max_residual = np.abs(residuals).max(axis=1)
+    return {
+        "kk_n_rc": n_rc,
+        "kk_mu": mu,
+        "kk_residual_re_rms/%": 100 * np.sqrt(np.mean(res_re**2, axis=1)),
+        "kk_residual_im_rms/%": 100 * np.sqrt(np.mean(res_im**2, axis=1)),
+        "kk_residual_max/%": 100 * max_residual,
+        "kk_valid": max_residual <= KK_RESIDUAL_LIMIT,
+    }
+
+
+def build_eis_kk_df(eis_flat_df: pl.DataFrame, cache_df: Optional[pl.DataFrame] = None) -> pl.DataFrame:
+    if eis_flat_df.is_empty():
+        return pl.DataFrame()
+
+    engine = engine_hash(
+        [lin_kk_basis, lin_kk_batch],
+        {
+            "mu_criterion": KK_MU_CRITERION,
+            "max_elements": KK_MAX_ELEMENTS,
+            "residual_limit": KK_RESIDUAL_LIMIT,
+        },
+    )
+    cached_df, spectra_df = split_cached_spectra(collect_eis_spectra(eis_flat_df), cache_df, engine)
+
+    frames: list[pl.DataFrame] = [cached_df] if not cached_df.is_empty() else []
+    # validate all spectra sharing a frequency grid as one batch
+    for grid_df in spectra_df.with_columns(pl.col("freq/Hz").hash().alias("_grid")).partition_by("_grid"):
+        freq = np.asarray(grid_df["freq/Hz"][0], dtype=np.float64)
+        z = np.vstack(grid_df["Re(Z)/Ohm"].to_numpy()) - 1j * np.vstack(grid_df["-Im(Z)/Ohm"].to_numpy())
+        metrics = lin_kk_batch(freq, z)
+        frames.append(
+            grid_df.select([*META_COLS, "cycle", "spectrum_hash"]).with_columns(
+                *[pl.Series(name, values) for name, values in metrics.items()],
+                pl.lit(engine).alias("engine_hash"),
+            )
+        )
+
+    if not frames:
+        return pl.DataFrame()
+
+    return pl.concat(frames, how="vertical_relaxed").sort([*META_COLS, "cycle"])
+
+
+# ENSEMBLE STATISTICS ON A COMMON FREQUENCY GRID
+# The last spectrum of every experiment is interpolated (linear in log f) onto
+# a shared, decade-anchored log-frequency grid; statistics per grid frequency
+# are then computed across repetitions (per participant) and across all
+# participants of a study phase and flow rate.
+EIS_GRID_POINTS_PER_DECADE = 10
+EIS_ENSEMBLE_QUANTITIES = ["Re(Z)/Ohm", "-Im(Z)/Ohm", "|Z|/Ohm", "Phase(Z)/deg"]
+
+
+def interpolate_eis_spectra(eis_flat_df: pl.DataFrame) -> pl.DataFrame:
+    # average repeated frequencies and index the samples by spectrum
+    samples_df = (
+        eis_flat_df.filter(pl.col("freq/Hz") > 0)
+        .group_by([*META_COLS, "cycle", "freq/Hz"])
+        .agg(
+            pl.col("Re(Z)/Ohm").cast(pl.Float64).mean(),
+            pl.col("-Im(Z)/Ohm").cast(pl.Float64).mean(),
+        )
+        .with_columns(pl.col("freq/Hz").cast(pl.Float64).log10().alias("_log_f"))
+        .sort([*META_COLS, "cycle", "_log_f"])
+        .with_columns(pl.struct([*META_COLS, "cycle"]).rank("dense").cast(pl.Int64).alias("_spectrum") - 1)
+    )
+    keys_df = samples_df.select([*META_COLS, "cycle", "_spectrum"]).unique("_spectrum").sort("_spectrum")
+
+    log_f = samples_df["_log_f"].to_numpy()
+    spectrum = samples_df["_spectrum"].to_numpy()
+    grid = np.arange(
+        np.floor(log_f.min() * EIS_GRID_POINTS_PER_DECADE),
+        np.ceil(log_f.max() * EIS_GRID_POINTS_PER_DECADE) + 1,
+    ) / EIS_GRID_POINTS_PER_DECADE
+
+    # one searchsorted over all spectra: offset every spectrum on the x axis so
+    # that the concatenated samples stay sorted, then interpolate linearly
+    offset = grid.max() - grid.min() + 1
+    x = spectrum * offset + (log_f - grid.min())
+    query = (np.arange(len(keys_df))[:, None] * offset + (grid - grid.min())[None, :]).ravel()
+    right = np.clip(np.searchsorted(x, query), 1, len(x) - 1)
+    left = right - 1
+    query_spectrum = np.repeat(np.arange(len(keys_df)), len(grid))
+    inside = (
+        (spectrum[left] == query_spectrum)
+        & (spectrum[right] == query_spectrum)
+        & (x[left] <= query)
+        & (query <= x[right])
+    )
+    weight = np.where(inside, (query - x[left]) / np.where(x[right] > x[left], x[right] - x[left], 1), np.nan)
+
+    values = {
+        col: samples_df[col].to_numpy()[left] * (1 - weight) + samples_df[col].to_numpy()[right] * weight
+        for col in ["Re(Z)/Ohm", "-Im(Z)/Ohm"]
+    }
+    z = values["Re(Z)/Ohm"] - 1j * values["-Im(Z)/Ohm"]
+
+    return (
+        keys_df.select(pl.all().repeat_by(len(grid)).explode())
+        .with_columns(
+            pl.Series("freq/Hz", np.tile(10**grid, len(keys_df))),
+            pl.Series("Re(Z)/Ohm", values["Re(Z)/Ohm"]),
+            pl.Series("-Im(Z)/Ohm", values["-Im(Z)/Ohm"]),
+            pl.Series("|Z|/Ohm", np.abs(z)),
+            pl.Series("Phase(Z)/deg", np.degrees(np.angle(z))),
+        )
+        .drop("_spectrum")
+        .filter(pl.col("Re(Z)/Ohm").is_not_nan())
+    )
+
+
+def build_eis_ensemble_df(eis_flat_df: pl.DataFrame) -> pl.DataFrame:
+    if eis_flat_df.is_empty():
+        return pl.DataFrame()
+
+    # use the last spectrum of every experiment (as shown in the dashboard)
+    last_cycle_df = eis_flat_df.filter(pl.col("cycle") == pl.col("cycle").max().over(META_COLS))
+    grid_df = interpolate_eis_spectra(last_cycle_df)
+
+    stats = [
+        expr
+        for col in EIS_ENSEMBLE_QUANTITIES
+        for expr in (
+            pl.col(col).mean().alias(f"{col}_mean"),
+            pl.col(col).std().alias(f"{col}_std"),
+            pl.col(col).quantile(0.1, "linear").alias(f"{col}_p10"),
+            pl.col(col).median().alias(f"{col}_p50"),
+            pl.col(col).quantile(0.9, "linear").alias(f"{col}_p90"),
+        )
+    ]
+
+    per_participant_df = (
+        grid_df.group_by(["study_phase", "participant", "flow_rate", "freq/Hz"])
+        .agg(pl.len().alias("n_spectra"), *stats)
+        .with_columns(pl.lit("repetitions").alias("ensemble"))
+    )
+    all_participants_df = (
+        grid_df.group_by(["study_phase", "flow_rate", "freq/Hz"])
+        .agg(pl.len().alias("n_spectra"), *stats)
+        .with_columns(
+            pl.lit("participants").alias("ensemble"),
+            pl.lit(None, dtype=pl.String).alias("participant"),
+        )
+    )
+
+    return (
+        pl.concat([per_participant_df, all_participants_df], how="diagonal_relaxed")
+        .select(
+            ["study_phase", "ensemble", "participant", "flow_rate", "freq/Hz", "n_spectra"]
+            + [expr.meta.output_name() for expr in stats]
+        )
+        .sort(["study_phase", "ensemble", "participant", "flow_rate", "freq/Hz"], nulls_last=True)
+    )
+
+
 def build_polarisation_flat_df(data_structure_df: pl.DataFrame) -> pl.DataFrame:
     dataframe_pol = data_structure_df.filter(pl.col("technique") == "02 polarisation")
     frames: list[pl.DataFrame] = []
@@ -215,6 +865,127 @@ def build_polarisation_flat_df(data_structure_df: pl.DataFrame) -> pl.DataFrame:
     return pl.concat(frames, how="vertical_relaxed") if frames else pl.DataFrame()
 
 
+# POLARISATION STEP ANALYSIS
+# Steps are segmented per experiment whenever the technique step (Ns) or the
+# applied current changes (Ns alone is not unique, as it restarts with every
+# loop of the technique). The steady-state plateau of a step is the longest
+# trailing window whose voltage range stays within a band scaled by the
+# voltage noise of the step; if it covers less than PLATEAU_MIN_FRACTION of
+# the step duration, the step is flagged as not in steady state and the
+# statistics are taken from that final fraction instead.
+CURRENT_STEP_THRESHOLD = 0.5  # mA, minimum current change that starts a new step
+CURRENT_STEP_RELATIVE = 0.05  # relative current change that starts a new step
+STEP_MIN_DURATION = 1.0  # s, shorter segments are switching transients
+PLATEAU_VOLTAGE_TOLERANCE = 1e-3  # V, minimum half-width of the plateau band
+PLATEAU_NOISE_FACTOR = 4.0  # half-width of the plateau band in multiples of the voltage noise
+PLATEAU_MIN_FRACTION = 0.1
+
+
+def segment_polarisation_steps(polarisation_flat_df: pl.DataFrame) -> pl.LazyFrame:
+    step_cols = [*META_COLS, "step"]
+    current = pl.col("current/mA").cast(pl.Float64)
+
+    # segment steps on Ns or current changes (time relative to the experiment start, as in the dashboard)
+    return (
+        polarisation_flat_df.lazy()
+        .sort([*META_COLS, "datetime"], maintain_order=True)
+        .with_columns(
+            (
+                (pl.col("datetime") - pl.col("datetime").first().over(META_COLS))
+                .dt.total_nanoseconds()
+                .cast(pl.Float64)
+                / 1_000_000_000.0
+            ).alias("time/s"),
+            (
+                (pl.col("Ns") != pl.col("Ns").shift(1).over(META_COLS))
+                | (
+                    (current - current.shift(1).over(META_COLS)).abs()
+                    > pl.max_horizontal(
+                        pl.lit(CURRENT_STEP_THRESHOLD),
+                        CURRENT_STEP_RELATIVE * current.shift(1).over(META_COLS).abs(),
+                    )
+                )
+            )
+            .fill_null(True)
+            .alias("_new_step"),
+        )
+        .with_columns(pl.col("_new_step").cum_sum().over(META_COLS).cast(pl.UInt32).alias("step"))
+        .with_columns(
+            pl.col("time/s").first().over(step_cols).alias("_t_start"),
+            pl.col("time/s").last().over(step_cols).alias("_t_end"),
+        )
+        .filter(pl.col("_t_end") - pl.col("_t_start") >= STEP_MIN_DURATION)
+        # robust voltage noise per step (MAD of successive differences) -> plateau band
+        .with_columns(
+            (
+                1.4826 / np.sqrt(2) * pl.col("voltage/V").cast(pl.Float64).diff().abs().median().over(step_cols)
+            ).alias("_noise")
+        )
+    )
+
+
+def mark_plateau(
+    lf: pl.LazyFrame,
+    voltage_tolerance: float = PLATEAU_VOLTAGE_TOLERANCE,
+    noise_factor: float = PLATEAU_NOISE_FACTOR,
+    min_fraction: float = PLATEAU_MIN_FRACTION,
+    suffix: str = "",
+) -> pl.LazyFrame:
+    # adds steady_state and _in_plateau (plus suffix) to the segmented steps with their voltage noise (_noise)
+    step_cols = [*META_COLS, "step"]
+    voltage = pl.col("voltage/V").cast(pl.Float64)
+    band = pl.max_horizontal(pl.lit(voltage_tolerance), noise_factor * pl.col("_noise").fill_null(0))
+
+    # the trailing voltage range shrinks monotonically towards the step end, so
+    # comparing it against the band marks the plateau as a suffix of the step
+    in_band = (voltage.cum_max(reverse=True) - voltage.cum_min(reverse=True)).over(step_cols) <= 2 * band
+    in_tail = pl.col("time/s") >= pl.col("_t_end") - min_fraction * (pl.col("_t_end") - pl.col("_t_start"))
+    steady_state = (
+        pl.col("_t_end") - pl.col("time/s").filter(in_band).min().over(step_cols)
+        >= min_fraction * (pl.col("_t_end") - pl.col("_t_start"))
+    )
+    return lf.with_columns(
+        steady_state.alias(f"steady_state{suffix}"),
+        pl.when(steady_state).then(in_band).otherwise(in_tail).alias(f"_in_plateau{suffix}"),
+    )
+
+
+def build_polarisation_steps_df(polarisation_flat_df: pl.DataFrame) -> pl.DataFrame:
+    if polarisation_flat_df.is_empty():
+        return pl.DataFrame()
+
+    step_cols = [*META_COLS, "step"]
+    voltage = pl.col("voltage/V").cast(pl.Float64)
+    current = pl.col("current/mA").cast(pl.Float64)
+    lf = segment_polarisation_steps(polarisation_flat_df)
+
+    lf = mark_plateau(lf)
+
+    plateau = pl.col("_in_plateau")
+    t_plateau = pl.col("time/s").filter(plateau)
+    v_plateau = voltage.filter(plateau)
+
+    return (
+        lf.group_by(step_cols)
+        .agg(
+            pl.col("Ns").first(),
+            pl.col("_t_start").first().alias("step_start/s"),
+            (pl.col("_t_end").first() - pl.col("_t_start").first()).alias("step_duration/s"),
+            t_plateau.min().alias("plateau_start/s"),
+            (pl.col("_t_end").first() - t_plateau.min()).alias("plateau_duration/s"),
+            plateau.sum().alias("n_plateau"),
+            v_plateau.median().alias("voltage/V"),
+            v_plateau.std().alias("voltage_std/V"),
+            (pl.cov(t_plateau, v_plateau) / t_plateau.var()).alias("voltage_slope/V*s^-1"),
+            current.filter(plateau).median().alias("current/mA"),
+            current.filter(plateau).std().alias("current_std/mA"),
+            pl.col("steady_state").first(),
+        )
+        .sort(step_cols)
+        .collect()
+    )
+
+
 def build_cd_cycling_flat_df(data_structure_df: pl.DataFrame) -> pl.DataFrame:
     dataframe_cd = data_structure_df.filter(pl.col("technique") == "03 charge-discharge")
     frames: list[pl.DataFrame] = []
@@ -273,64 +1044,1302 @@ def build_cd_cycling_flat_df(data_structure_df: pl.DataFrame) -> pl.DataFrame:
 
     flat_df = pl.concat(frames, how="vertical_relaxed")
 
-    # pre-compute derived columns (capacity, dQ/dV) so the dashboard
-    # doesn't have to recompute them on every filter change
-    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+    # pre-compute derived columns (capacity) so the dashboard doesn't have to
+    # recompute them on every filter change; dQ/dV is evaluated per half cycle
+    # on a voltage grid in build_cd_cycling_dqdv_df
     flat_df = flat_df.with_columns(
         pl.col("Q charge/discharge/mA.h").alias("capacity/mAh"),
-        (
-            pl.col("Q charge/discharge/mA.h").diff().over(_meta_cols)
-            / pl.col("voltage/V").diff().over(_meta_cols)
-        ).alias("_dQ_dV_raw"),
-    ).with_columns(
-        pl.col("_dQ_dV_raw").rolling_median(25).over(_meta_cols).alias("dQ/dV"),
-    ).drop("_dQ_dV_raw")
+    )
 
     return flat_df
 
 
-def build_temperature_data_df(data_dir: Path) -> pl.DataFrame:
-    frames: list[pl.DataFrame] = []
-    for study_phase in data_dir.iterdir():
-        if not study_phase.is_dir() or study_phase.name.startswith("."):
-            continue
+# CYCLE AGGREGATION
+# Charge, discharge capacity and energy per cycle in one grouped pass over all
+# half cycles. The energy is the trapezoidal integral of V dQ over the
+# cumulative half-cycle capacity, which equals the integral of V I dt (the
+# current column of GCPL files is derived from per-sample charge increments and
+# too noisy to integrate). The cells of the study are compositionally
+# symmetric, so the cell voltage crosses 0 V within every half cycle and the
+# integral of V dQ of a half cycle is dominated by its overpotential; voltage
+# and energy efficiencies (ratios of these integrals) are therefore not
+# meaningful. Instead, the signed integrals of charge and discharge are added to
+# the round-trip energy loss of the cycle, which divided by the charge passed in
+# both half cycles gives the mean overpotential. Incomplete half cycles (e.g.
+# the first charge from the rest state, or an aborted last one) with less than
+# HALF_CYCLE_MIN_FRACTION of the median capacity of their direction are
+# dropped, and a cycle is a complete charge followed by a complete discharge
+# (numbered by the half cycle of the charge // 2).
+HALF_CYCLE_MIN_FRACTION = 0.8
+
+
+def build_cd_cycling_cycle_df(cd_cycling_flat_df: pl.DataFrame) -> pl.DataFrame:
+    if cd_cycling_flat_df.is_empty():
+        return pl.DataFrame()
+
+    voltage = pl.col("voltage/V").cast(pl.Float64)
+    capacity = pl.col("capacity/mAh")
+
+    half_cycle_lf = (
+        cd_cycling_flat_df.lazy()
+        .sort([*META_COLS, "datetime"], maintain_order=True)
+        .with_columns(
+            (
+                (pl.col("datetime") - pl.col("datetime").first().over(META_COLS))
+                .dt.total_nanoseconds()
+                .cast(pl.Float64)
+                / 3_600_000_000_000.0
+            ).alias("time/h")
+        )
+        .group_by([*META_COLS, "half cycle"])
+        .agg(
+            pl.col("time/h").last(),
+            capacity.last().sign().alias("_direction"),
+            capacity.last().abs().alias("capacity/mAh"),
+            ((voltage + voltage.shift(1)) / 2 * capacity.diff()).sum().alias("energy/mWh"),
+        )
+        .filter(
+            (pl.col("_direction") != 0)
+            & (
+                pl.col("capacity/mAh")
+                >= HALF_CYCLE_MIN_FRACTION * pl.col("capacity/mAh").median().over([*META_COLS, "_direction"])
+            )
+        )
+        .sort([*META_COLS, "half cycle"])
+    )
+
+    # pair each half cycle with the following one of the same experiment
+    following_cols = ["half cycle", "_direction", "time/h", "capacity/mAh", "energy/mWh"]
+    return (
+        half_cycle_lf.with_columns(
+            pl.col(following_cols).shift(-1).over(META_COLS).name.prefix("_next_"),
+        )
+        .filter(
+            (pl.col("_direction") > 0)
+            & (pl.col("_next__direction") < 0)
+            & (pl.col("_next_half cycle") == pl.col("half cycle") + 1)
+        )
+        .select(
+            *META_COLS,
+            (pl.col("half cycle") // 2).alias("cycle"),
+            pl.col("_next_time/h").alias("time/h"),
+            pl.col("capacity/mAh").alias("charge_capacity/mAh"),
+            pl.col("_next_capacity/mAh").alias("discharge_capacity/mAh"),
+            pl.col("energy/mWh").alias("charge_energy/mWh"),
+            pl.col("_next_energy/mWh").alias("discharge_energy/mWh"),
+        )
+        .with_columns(
+            (pl.col("charge_energy/mWh") / pl.col("charge_capacity/mAh")).alias("mean_charge_voltage/V"),
+            (-pl.col("discharge_energy/mWh") / pl.col("discharge_capacity/mAh")).alias("mean_discharge_voltage/V"),
+            (pl.col("discharge_capacity/mAh") / pl.col("charge_capacity/mAh") * 100).alias("coulombic_efficiency/%"),
+            (pl.col("charge_energy/mWh") + pl.col("discharge_energy/mWh")).alias("energy_loss/mWh"),
+        )
+        .with_columns(
+            (
+                pl.col("energy_loss/mWh") / (pl.col("charge_capacity/mAh") + pl.col("discharge_capacity/mAh"))
+            ).alias("mean_overpotential/V"),
+        )
+        .sort([*META_COLS, "cycle"])
+        .collect()
+    )
+
+
+# INCREMENTAL CAPACITY ANALYSIS
+# dQ/dV is evaluated per half cycle, so no spikes appear where the current
+# reverses. The charge passed in each half cycle is interpolated onto a uniform
+# voltage grid (anchored at multiples of DQDV_VOLTAGE_STEP) and differentiated
+# with a Savitzky-Golay filter. Beforehand, the voltage is made monotonic with a
+# running maximum in the direction of the half cycle (rising on charge, falling
+# on discharge), as its noise would otherwise fold the curve back onto itself.
+DQDV_VOLTAGE_STEP = 0.005  # V
+DQDV_SAVGOL_WINDOW = 11  # grid points
+DQDV_SAVGOL_POLYORDER = 2
+
+
+def uniform_grid(values: pl.Series, step: float) -> np.ndarray:
+    # multiples of step covering the range of values
+    return np.arange(np.floor(values.min() / step), np.ceil(values.max() / step) + 1) * step
+
+
+def interpolate_on_grid(
+    samples_df: pl.DataFrame, keys: list[str], x: str, y: str, grid: np.ndarray
+) -> pl.DataFrame:
+    # samples_df must be sorted by keys with x non-decreasing within each group
+    samples_df = samples_df.with_columns(pl.struct(keys).rank("dense").cast(pl.Int64).alias("_group") - 1)
+    keys_df = samples_df.select([*keys, "_group"]).unique("_group").sort("_group")
+
+    x_values = samples_df[x].to_numpy()
+    group = samples_df["_group"].to_numpy()
+
+    # one searchsorted over all groups, offset on the x axis as in interpolate_eis_spectra
+    offset = grid.max() - grid.min() + 1
+    x_offset = group * offset + (x_values - grid.min())
+    query = (np.arange(len(keys_df))[:, None] * offset + (grid - grid.min())[None, :]).ravel()
+    right = np.clip(np.searchsorted(x_offset, query), 1, len(x_offset) - 1)
+    # exact hits (e.g. the first sample of a group) are taken as they are
+    left = np.where(x_offset[right] == query, right, right - 1)
+    query_group = np.repeat(np.arange(len(keys_df)), len(grid))
+    inside = (
+        (group[left] == query_group)
+        & (group[right] == query_group)
+        & (x_offset[left] <= query)
+        & (query <= x_offset[right])
+    )
+    dx = x_offset[right] - x_offset[left]
+    weight = np.where(inside, (query - x_offset[left]) / np.where(dx > 0, dx, 1), np.nan)
+    y_values = samples_df[y].to_numpy()
+
+    return (
+        keys_df.select(pl.all().repeat_by(len(grid)).explode())
+        .with_columns(
+            pl.Series(x, np.tile(grid, len(keys_df))),
+            pl.Series(y, y_values[left] * (1 - weight) + y_values[right] * weight),
+        )
+        .drop("_group")
+        .filter(pl.col(y).is_not_nan())
+    )
+
+
+def savgol_derivative_expr(col: str, window: int, delta: float, over: list[str]) -> pl.Expr:
+    # first derivative of the least-squares polynomial over a centred window,
+    # as a weighted sum of shifted values (null at the edges of each group)
+    offsets = np.arange(window) - window // 2
+    basis = offsets[:, None].astype(np.float64) ** np.arange(DQDV_SAVGOL_POLYORDER + 1)[None, :]
+    coeffs = np.linalg.pinv(basis)[1] / delta
+    return sum(
+        float(coeff) * pl.col(col).shift(-int(offset)).over(over)
+        for coeff, offset in zip(coeffs, offsets)
+    )
+
+
+def build_cd_cycling_dqdv_df(cd_cycling_flat_df: pl.DataFrame) -> pl.DataFrame:
+    if cd_cycling_flat_df.is_empty():
+        return pl.DataFrame()
+
+    half_cycle_cols = [*META_COLS, "half cycle"]
+    samples_df = (
+        cd_cycling_flat_df.lazy()
+        .sort([*half_cycle_cols, "datetime"], maintain_order=True)
+        .select(
+            *half_cycle_cols,
+            pl.col("voltage/V").cast(pl.Float64),
+            pl.col("capacity/mAh").cast(pl.Float64),
+        )
+        .with_columns(pl.col("capacity/mAh").last().sign().over(half_cycle_cols).alias("_direction"))
+        .filter(pl.col("_direction") != 0)
+        .with_columns(
+            (pl.col("_direction") * pl.col("voltage/V")).cum_max().over(half_cycle_cols).alias("_voltage"),
+            pl.col("capacity/mAh").abs().alias("_capacity"),
+        )
+        .collect()
+    )
+    grid_df = interpolate_on_grid(
+        samples_df,
+        [*half_cycle_cols, "_direction"],
+        "_voltage",
+        "_capacity",
+        uniform_grid(samples_df["_voltage"], DQDV_VOLTAGE_STEP),
+    )
+
+    # rows run in the direction of each half cycle, i.e. with increasing charge
+    return (
+        grid_df.sort([*half_cycle_cols, "_voltage"])
+        .with_columns(
+            savgol_derivative_expr("_capacity", DQDV_SAVGOL_WINDOW, DQDV_VOLTAGE_STEP, half_cycle_cols).alias("dQ/dV"),
+        )
+        .select(
+            *half_cycle_cols,
+            (pl.col("_direction") * pl.col("_voltage")).alias("voltage/V"),
+            (pl.col("_direction") * pl.col("_capacity")).alias("capacity/mAh"),
+            "dQ/dV",
+        )
+    )
+
+
+def build_cd_cycling_dqdv_index_df(cd_cycling_dqdv_df: pl.DataFrame) -> pl.DataFrame:
+    if cd_cycling_dqdv_df.is_empty():
+        return pl.DataFrame()
+
+    # row range of every half cycle in the (sorted) dQ/dV table, so the dashboard
+    # can slice the displayed half cycles instead of filtering the whole table
+    return (
+        cd_cycling_dqdv_df.with_row_index("_row")
+        .group_by([*META_COLS, "half cycle"], maintain_order=True)
+        .agg(
+            pl.col("_row").first().alias("offset"),
+            pl.len().alias("length"),
+            pl.col("dQ/dV").max().alias("dQ/dV_max"),
+        )
+    )
+
+
+# DIFFERENTIAL VOLTAGE ANALYSIS
+# dV/dQ is the counterpart of dQ/dV on a uniform capacity grid: the voltage of
+# each half cycle (signed in the direction of the half cycle, so that dV/dQ is
+# positive for charge and discharge) is interpolated onto multiples of
+# DVDQ_CAPACITY_STEP and differentiated with the same Savitzky-Golay filter.
+# Every cycle covers the same grid, so curves of many cycles can be overlaid to
+# follow how the capacity features shift as the capacity fades.
+DVDQ_CAPACITY_STEP = 5.0  # mAh
+DVDQ_SAVGOL_WINDOW = 11  # grid points
+
+
+def build_cd_cycling_dvdq_df(cd_cycling_flat_df: pl.DataFrame) -> pl.DataFrame:
+    if cd_cycling_flat_df.is_empty():
+        return pl.DataFrame()
+
+    half_cycle_cols = [*META_COLS, "half cycle"]
+    samples_df = (
+        cd_cycling_flat_df.lazy()
+        .sort([*half_cycle_cols, "datetime"], maintain_order=True)
+        .select(
+            *half_cycle_cols,
+            pl.col("voltage/V").cast(pl.Float64),
+            pl.col("capacity/mAh").cast(pl.Float64),
+        )
+        .with_columns(pl.col("capacity/mAh").last().sign().over(half_cycle_cols).alias("_direction"))
+        .filter(pl.col("_direction") != 0)
+        .with_columns(
+            pl.col("capacity/mAh").abs().cum_max().over(half_cycle_cols).alias("_capacity"),
+            (pl.col("_direction") * pl.col("voltage/V")).alias("_voltage"),
+        )
+        .collect()
+    )
+    grid_df = interpolate_on_grid(
+        samples_df,
+        [*half_cycle_cols, "_direction"],
+        "_capacity",
+        "_voltage",
+        uniform_grid(samples_df["_capacity"], DVDQ_CAPACITY_STEP),
+    )
+
+    # dV/dQ in mV/mAh
+    return (
+        grid_df.sort([*half_cycle_cols, "_capacity"])
+        .with_columns(
+            (
+                savgol_derivative_expr("_voltage", DVDQ_SAVGOL_WINDOW, DVDQ_CAPACITY_STEP, half_cycle_cols) * 1000
+            ).alias("dV/dQ"),
+        )
+        .select(
+            *half_cycle_cols,
+            (pl.col("half cycle") // 2).alias("cycle"),
+            (pl.col("_direction") * pl.col("_capacity")).alias("capacity/mAh"),
+            (pl.col("_direction") * pl.col("_voltage")).alias("voltage/V"),
+            "dV/dQ",
+        )
+    )
+
+
+# CURVE ARRAYS
+# Every half cycle is resampled to CURVE_POINTS points, evenly spaced in the
+# fraction of the charge passed in that half cycle, and stored as one row with
+# fixed-size array columns. The payload of an overlay of many cycles is then
+# known in advance (one row per half cycle), independent of the sampling rate.
+CURVE_POINTS = 64
 
-        temp_dir = study_phase / "Temperature"
-        if not temp_dir.exists() or not temp_dir.is_dir():
-            continue
 
-        target_csv = temp_dir / "DL-200T_temperature.csv"
-        if not target_csv.exists():
-            csv_candidates = sorted(temp_dir.glob("*.csv"))
-            if not csv_candidates:
-                continue
-            target_csv = csv_candidates[0]
-
-        temperature_data_df = pl.read_csv(
-            target_csv,
-            try_parse_dates=True,
-            decimal_comma=True,
-        ).with_columns(
+def build_cd_cycling_curves_df(cd_cycling_flat_df: pl.DataFrame) -> pl.DataFrame:
+    if cd_cycling_flat_df.is_empty():
+        return pl.DataFrame()
+
+    half_cycle_cols = [*META_COLS, "half cycle"]
+    capacity = pl.col("capacity/mAh").abs().cum_max().over(half_cycle_cols)
+    samples_df = (
+        cd_cycling_flat_df.lazy()
+        .sort([*half_cycle_cols, "datetime"], maintain_order=True)
+        .select(
+            *half_cycle_cols,
+            pl.col("voltage/V").cast(pl.Float64),
+            pl.col("capacity/mAh").cast(pl.Float64),
+        )
+        .with_columns(pl.col("capacity/mAh").last().sign().over(half_cycle_cols).alias("_direction"))
+        .with_columns(
             (
-                pl.col("datetime").cast(pl.Datetime)
-                - pl.col("datetime").cast(pl.Datetime).min()
+                (capacity - capacity.first().over(half_cycle_cols))
+                / (capacity.last() - capacity.first()).over(half_cycle_cols)
+            ).alias("_fraction"),
+        )
+        .filter((pl.col("_direction") != 0) & pl.col("_fraction").is_finite())
+        .collect()
+    )
+    grid_df = interpolate_on_grid(
+        samples_df, [*half_cycle_cols, "_direction"], "_fraction", "capacity/mAh", np.linspace(0, 1, CURVE_POINTS)
+    ).join(
+        interpolate_on_grid(
+            samples_df, [*half_cycle_cols, "_direction"], "_fraction", "voltage/V", np.linspace(0, 1, CURVE_POINTS)
+        ),
+        on=[*half_cycle_cols, "_direction", "_fraction"],
+        how="inner",
+        maintain_order="left",
+    )
+
+    array_type = pl.Array(pl.Float32, CURVE_POINTS)
+    return (
+        grid_df.group_by(half_cycle_cols, maintain_order=True)
+        .agg(
+            pl.col("capacity/mAh").cast(pl.Float32),
+            pl.col("voltage/V").cast(pl.Float32),
+        )
+        .filter(pl.col("capacity/mAh").list.len() == CURVE_POINTS)
+        .select(
+            *half_cycle_cols,
+            (pl.col("half cycle") // 2).alias("cycle"),
+            pl.col("capacity/mAh").cast(array_type),
+            pl.col("voltage/V").cast(array_type),
+        )
+    )
+
+
+# PARAMETER SWEEPS
+# The evaluation constants of the dashboard are evaluated on a grid in one
+# vectorised pass per technique and stored as small result cubes (one row per
+# experiment and parameter combination), so their influence on the headline
+# metrics can be explored with sliders instead of recomputing from raw rows.
+# The polarisation steps are evaluated with the plateau detection of
+# build_polarisation_steps_df, whose constants (PLATEAU_VOLTAGE_TOLERANCE,
+# PLATEAU_NOISE_FACTOR, PLATEAU_MIN_FRACTION) are part of the grid.
+SWEEP_PLATEAU_VOLTAGE_TOLERANCES = [0.5e-3, 1e-3, 2e-3, 5e-3]  # V, minimum half-width of the plateau band
+SWEEP_PLATEAU_NOISE_FACTORS = [2.0, 4.0, 8.0]  # half-width of the plateau band in multiples of the voltage noise
+SWEEP_PLATEAU_MIN_FRACTIONS = [0.05, 0.1, 0.2, 0.3]  # minimum plateau duration (fraction of the step)
+SWEEP_REST_CURRENT_TOLERANCES = [0.5, 1.0, 2.0, 5.0]  # mA
+SWEEP_CE_LOWER_LIMITS = [50, 60, 70, 80, 90]  # %
+SWEEP_CE_UPPER_LIMITS = [110, 120, 140, 160]  # %
+SWEEP_DQDV_WINDOWS = [5, 11, 21, 41]  # grid points of the dQ/dV Savitzky-Golay filter
+
+
+def _linregress_exprs(x: pl.Expr, y: pl.Expr, name: str) -> list[pl.Expr]:
+    # closed-form least squares (same slope and stderr as scipy.stats.linregress)
+    r = pl.corr(x, y)
+    return [
+        (pl.cov(x, y) / x.var()).alias(f"{name}_slope"),
+        ((1 - r**2) * y.var() / x.var() / (x.count() - 2)).sqrt().alias(f"{name}_stderr"),
+    ]
+
+
+def build_polarisation_sweep_df(polarisation_flat_df: pl.DataFrame) -> pl.DataFrame:
+    if polarisation_flat_df.is_empty():
+        return pl.DataFrame()
+
+    step_cols = [*META_COLS, "step"]
+    voltage = pl.col("voltage/V").cast(pl.Float64)
+    current = pl.col("current/mA").cast(pl.Float64)
+    grid = [
+        (voltage_tolerance, noise_factor, min_fraction)
+        for voltage_tolerance in SWEEP_PLATEAU_VOLTAGE_TOLERANCES
+        for noise_factor in SWEEP_PLATEAU_NOISE_FACTORS
+        for min_fraction in SWEEP_PLATEAU_MIN_FRACTIONS
+    ]
+
+    # median voltage and current of the plateau of every step for all plateau parameters in one aggregation
+    lf = segment_polarisation_steps(polarisation_flat_df)
+    for i, params in enumerate(grid):
+        lf = mark_plateau(lf, *params, suffix=f"_{i}")
+    steps_df = (
+        lf.group_by(step_cols)
+        .agg(
+            *[voltage.filter(pl.col(f"_in_plateau_{i}")).median().alias(f"voltage_{i}") for i in range(len(grid))],
+            *[current.filter(pl.col(f"_in_plateau_{i}")).median().alias(f"current_{i}") for i in range(len(grid))],
+        )
+        .collect()
+    )
+    steps_df = pl.concat(
+        [
+            steps_df.select(
+                *step_cols,
+                pl.lit(voltage_tolerance * 1000, dtype=pl.Float64).alias("plateau_voltage_tolerance/mV"),
+                pl.lit(noise_factor, dtype=pl.Float64).alias("plateau_noise_factor"),
+                pl.lit(min_fraction, dtype=pl.Float64).alias("plateau_min_fraction"),
+                pl.col(f"voltage_{i}").alias("voltage/V"),
+                pl.col(f"current_{i}").alias("current/mA"),
+            )
+            for i, (voltage_tolerance, noise_factor, min_fraction) in enumerate(grid)
+        ]
+    )
+
+    sweep_cols = [
+        "plateau_voltage_tolerance/mV",
+        "plateau_noise_factor",
+        "plateau_min_fraction",
+        "rest_current_tolerance/mA",
+    ]
+    return (
+        steps_df.join(
+            pl.DataFrame({"rest_current_tolerance/mA": SWEEP_REST_CURRENT_TOLERANCES}),
+            how="cross",
+        )
+        .filter(pl.col("current/mA").abs() > pl.col("rest_current_tolerance/mA"))
+        .group_by([*META_COLS, *sweep_cols])
+        .agg(
+            pl.len().alias("n_steps"),
+            *_linregress_exprs(pl.col("current/mA"), pl.col("voltage/V"), "_rp"),
+        )
+        .filter(pl.col("n_steps") > 2)
+        .with_columns(
+            (pl.col("_rp_slope") * 1000).alias("polarisation_resistance/Ohm"),
+            (pl.col("_rp_stderr") * 1000).alias("polarisation_resistance_stderr/Ohm"),
+        )
+        .drop("_rp_slope", "_rp_stderr")
+        .sort([*META_COLS, *sweep_cols])
+    )
+
+
+def build_cd_cycling_sweep_df(cd_cycling_cycle_df: pl.DataFrame) -> pl.DataFrame:
+    if cd_cycling_cycle_df.is_empty():
+        return pl.DataFrame()
+
+    grid_cols = ["ce_lower_limit/%", "ce_upper_limit/%"]
+    sweep_cols = [*META_COLS, *grid_cols]
+    cycle_df = cd_cycling_cycle_df.filter(pl.col("coulombic_efficiency/%").is_finite())
+
+    grid_df = pl.DataFrame({"ce_lower_limit/%": SWEEP_CE_LOWER_LIMITS}).join(
+        pl.DataFrame({"ce_upper_limit/%": SWEEP_CE_UPPER_LIMITS}), how="cross"
+    )
+
+    return (
+        cycle_df.join(grid_df, how="cross")
+        .filter(
+            (pl.col("coulombic_efficiency/%") > pl.col("ce_lower_limit/%"))
+            & (pl.col("coulombic_efficiency/%") < pl.col("ce_upper_limit/%"))
+        )
+        .sort([*sweep_cols, "cycle"])
+        .with_columns(
+            (
+                pl.col("discharge_capacity/mAh")
+                / pl.col("discharge_capacity/mAh").first().over(sweep_cols)
+                * 100
+            ).alias("capacity_retention/%")
+        )
+        .group_by(sweep_cols)
+        .agg(
+            pl.len().alias("n_cycles"),
+            pl.col("discharge_capacity/mAh").first().alias("initial_discharge_capacity/mAh"),
+            pl.col("coulombic_efficiency/%").mean().alias("mean_coulombic_efficiency/%"),
+            *_linregress_exprs(pl.col("cycle").cast(pl.Float64), pl.col("capacity_retention/%"), "_fade_cycle"),
+            *_linregress_exprs(pl.col("time/h"), pl.col("capacity_retention/%"), "_fade_time"),
+        )
+        .with_columns(
+            pl.col("_fade_cycle_slope").alias("capacity_fade_rate/%/cycle"),
+            (pl.col("_fade_time_slope") * 24).alias("capacity_fade_rate/%/d"),
+        )
+        .select(
+            [
+                *sweep_cols,
+                "n_cycles",
+                "initial_discharge_capacity/mAh",
+                "mean_coulombic_efficiency/%",
+                "capacity_fade_rate/%/cycle",
+                "capacity_fade_rate/%/d",
+            ]
+        )
+        .sort(sweep_cols)
+    )
+
+
+def build_dqdv_sweep_df(cd_cycling_dqdv_df: pl.DataFrame) -> pl.DataFrame:
+    if cd_cycling_dqdv_df.is_empty():
+        return pl.DataFrame()
+
+    half_cycle_cols = [*META_COLS, "half cycle"]
+
+    # differentiate the interpolated charge of every half cycle with each window in one pass
+    lf = cd_cycling_dqdv_df.lazy().with_columns(pl.col("capacity/mAh").abs().alias("_capacity"))
+    lf = pl.concat(
+        [
+            lf.select(
+                *half_cycle_cols,
+                "voltage/V",
+                (pl.col("capacity/mAh").last().over(half_cycle_cols) > 0).alias("_charge"),
+                pl.lit(w, dtype=pl.Int64).alias("dqdv_window"),
+                savgol_derivative_expr("_capacity", w, DQDV_VOLTAGE_STEP, half_cycle_cols).alias("dQ/dV"),
+            )
+            for w in SWEEP_DQDV_WINDOWS
+        ]
+    ).filter(pl.col("dQ/dV").is_finite())
+
+    # voltage of the dQ/dV peak per half cycle, then the median over all charge and discharge half cycles
+    return (
+        lf.group_by([*half_cycle_cols, "dqdv_window"])
+        .agg(
+            pl.col("voltage/V").sort_by("dQ/dV").last().alias("peak_voltage/V"),
+            pl.col("dQ/dV").max().alias("peak_dQ/dV"),
+            pl.col("_charge").first(),
+        )
+        .group_by([*META_COLS, "dqdv_window"])
+        .agg(
+            pl.col("peak_voltage/V").filter(pl.col("_charge")).median().alias("dqdv_peak_voltage_charge/V"),
+            pl.col("peak_voltage/V").filter(~pl.col("_charge")).median().alias("dqdv_peak_voltage_discharge/V"),
+            pl.col("peak_dQ/dV").filter(pl.col("_charge")).median().alias("dqdv_peak_height_charge/mAh*V^-1"),
+            pl.col("peak_dQ/dV").filter(~pl.col("_charge")).median().alias("dqdv_peak_height_discharge/mAh*V^-1"),
+        )
+        .sort([*META_COLS, "dqdv_window"])
+        .collect()
+    )
+
+
+# CROSS-TECHNIQUE EVALUATION
+# The results of the individual techniques are joined once per experiment
+# (study phase, participant, repetition, flow rate): the ohmic series
+# resistance (ESR) from the last impedance spectrum is attached to every
+# polarisation step to remove the iR drop, and the polarisation resistance is
+# split into an ohmic (ESR), a charge-transfer (difference between the low-
+# and high-frequency real-axis values of the spectrum) and the remaining
+# mass-transport contribution that only shows up under DC load. The
+# polarisation resistance is the slope of the step voltage over the step
+# current (as in the polarisation section of the dashboard), and the iR-free
+# resistance the slope of the iR-corrected step voltage (i.e. the polarisation
+# resistance minus the ESR); the overpotential against the open-circuit voltage
+# of the preceding rest step is kept per step for reference only. The
+# contributions add up to the polarisation resistance. A negative contribution
+# (e.g. a charge-transfer resistance from EIS that exceeds the iR-free DC
+# resistance) is kept as is, so the sum still holds, but flagged
+# (negative_contribution) as the split of that experiment is not physical.
+REST_CURRENT_TOLERANCE = 1.0  # mA, same default as in the dashboard
+
+
+def build_series_resistance_df(eis_flat_df: pl.DataFrame) -> pl.DataFrame:
+    if eis_flat_df.is_empty():
+        return pl.DataFrame()
+
+    group_cols = [*META_COLS, "cycle"]
+    x = pl.col("Re(Z)/Ohm").cast(pl.Float64)
+    y = pl.col("-Im(Z)/Ohm").cast(pl.Float64)
+    x0 = x.shift(1).over(group_cols)
+    y0 = y.shift(1).over(group_cols)
+
+    last_cycle_lf = eis_flat_df.lazy().filter(pl.col("cycle") == pl.col("cycle").max().over(META_COLS))
+    low_frequency_lf = last_cycle_lf.group_by(group_cols).agg(
+        x.sort_by("freq/Hz").first().alias("low_frequency_resistance/Ohm")
+    )
+
+    # last x-axis intercept of the last spectrum per experiment (as get_x_intercepts(which="last") in the dashboard)
+    return (
+        last_cycle_lf.sort([*group_cols, "Re(Z)/Ohm"])
+        .with_columns(x0.alias("_x0"), y0.alias("_y0"))
+        .filter(
+            pl.col("_y0").is_not_null()
+            & ((y == 0) | (pl.col("_y0") == 0) | (y.sign() != pl.col("_y0").sign()))
+        )
+        .with_columns(
+            pl.when(y == 0)
+            .then(x)
+            .when(pl.col("_y0") == 0)
+            .then(pl.col("_x0"))
+            .otherwise(pl.col("_x0") - pl.col("_y0") * (x - pl.col("_x0")) / (y - pl.col("_y0")))
+            .alias("ESR/Ohm")
+        )
+        .group_by(group_cols)
+        .agg(pl.col("ESR/Ohm").max())
+        .join(low_frequency_lf, on=group_cols, how="left")
+        .sort(group_cols)
+        .collect()
+    )
+
+
+def build_polarisation_ir_df(
+    polarisation_steps_df: pl.DataFrame, series_resistance_df: pl.DataFrame
+) -> pl.DataFrame:
+    if polarisation_steps_df.is_empty() or series_resistance_df.is_empty():
+        return pl.DataFrame()
+
+    rest = pl.col("current/mA").abs() <= REST_CURRENT_TOLERANCE
+
+    # open-circuit voltage from the preceding rest step (or the following one for leading steps);
+    # experiments without impedance spectrum keep their steps (and polarisation resistance) without ESR
+    return (
+        polarisation_steps_df.join(
+            series_resistance_df.select([*META_COLS, "ESR/Ohm"]), on=META_COLS, how="left"
+        )
+        .sort([*META_COLS, "step"])
+        .with_columns(
+            pl.when(rest)
+            .then(pl.col("voltage/V"))
+            .otherwise(None)
+            .forward_fill()
+            .backward_fill()
+            .over(META_COLS)
+            .alias("ocv/V")
+        )
+        .filter(~rest)
+        .with_columns((pl.col("voltage/V") - pl.col("ocv/V")).alias("overpotential/V"))
+        .with_columns((pl.col("current/mA") / 1000 * pl.col("ESR/Ohm")).alias("ir_drop/V"))
+        .with_columns(
+            (pl.col("voltage/V") - pl.col("ir_drop/V")).alias("ir_free_voltage/V"),
+            (pl.col("overpotential/V") - pl.col("ir_drop/V")).alias("ir_free_overpotential/V"),
+        )
+        .select(
+            [
+                *META_COLS,
+                "step",
+                "Ns",
+                "current/mA",
+                "voltage/V",
+                "ocv/V",
+                "ESR/Ohm",
+                "overpotential/V",
+                "ir_drop/V",
+                "ir_free_voltage/V",
+                "ir_free_overpotential/V",
+                "steady_state",
+            ]
+        )
+    )
+
+
+def build_resistance_split_df(
+    polarisation_ir_df: pl.DataFrame, series_resistance_df: pl.DataFrame
+) -> pl.DataFrame:
+    if polarisation_ir_df.is_empty():
+        return pl.DataFrame()
+
+    return (
+        polarisation_ir_df.group_by(META_COLS)
+        .agg(
+            pl.len().alias("n_steps"),
+            *_linregress_exprs(pl.col("current/mA"), pl.col("voltage/V"), "_rp"),
+            *_linregress_exprs(pl.col("current/mA"), pl.col("ir_free_voltage/V"), "_rp_ir_free"),
+        )
+        .filter(pl.col("n_steps") > 2)
+        .join(series_resistance_df.drop("cycle"), on=META_COLS, how="left")
+        .with_columns(
+            (pl.col("_rp_slope") * 1000).alias("polarisation_resistance/Ohm"),
+            (pl.col("_rp_stderr") * 1000).alias("polarisation_resistance_stderr/Ohm"),
+            (pl.col("_rp_ir_free_slope") * 1000).alias("ir_free_resistance/Ohm"),
+            (pl.col("low_frequency_resistance/Ohm") - pl.col("ESR/Ohm")).alias("R_ct/Ohm"),
+        )
+        .with_columns(
+            (pl.col("ir_free_resistance/Ohm") - pl.col("R_ct/Ohm")).alias("R_mt/Ohm"),
+        )
+        .with_columns(
+            pl.any_horizontal(pl.col("ESR/Ohm", "R_ct/Ohm", "R_mt/Ohm") < 0)
+            .fill_null(False)
+            .alias("negative_contribution"),
+        )
+        .select(
+            [
+                *META_COLS,
+                "n_steps",
+                "polarisation_resistance/Ohm",
+                "polarisation_resistance_stderr/Ohm",
+                "ir_free_resistance/Ohm",
+                "ESR/Ohm",
+                "R_ct/Ohm",
+                "R_mt/Ohm",
+                "negative_contribution",
+            ]
+        )
+        .sort(META_COLS)
+    )
+
+
+# REPRODUCIBILITY STATISTICS (ISO 5725-2)
+# Participants are treated as laboratories and repetitions as replicates; every
+# combination of metric, study phase and flow rate is one level. Cell means and
+# standard deviations are computed for all metrics in one grouped pass, the
+# repeatability (s_r) and reproducibility (s_R) standard deviations and the
+# Mandel h/k statistics in one window pass over the levels. Cochran's test
+# checks the cell variances, the single Grubbs test the cell means; statistics
+# above the 5 % (1 %) critical value mark stragglers (outliers). Critical
+# values use the median number of replicates of a level.
+LEVEL_COLS = ["metric", "study_phase", "flow_rate"]
+CE_LOWER_LIMIT = 60  # %, same default as in the dashboard
+CE_UPPER_LIMIT = 140  # %, same default as in the dashboard
+
+
+def build_reproducibility_values_df(
+    series_resistance_df: pl.DataFrame,
+    resistance_split_df: pl.DataFrame,
+    cd_cycling_sweep_df: pl.DataFrame,
+) -> pl.DataFrame:
+    # one value per metric and experiment
+    metric_frames = [
+        (series_resistance_df, ["ESR/Ohm"]),
+        (resistance_split_df, ["polarisation_resistance/Ohm"]),
+        (
+            cd_cycling_sweep_df.filter(
+                (pl.col("ce_lower_limit/%") == CE_LOWER_LIMIT) & (pl.col("ce_upper_limit/%") == CE_UPPER_LIMIT)
             )
+            if not cd_cycling_sweep_df.is_empty()
+            else cd_cycling_sweep_df,
+            ["initial_discharge_capacity/mAh", "capacity_fade_rate/%/d"],
+        ),
+    ]
+    frames = [
+        df.unpivot(index=META_COLS, on=metrics, variable_name="metric", value_name="value")
+        for df, metrics in metric_frames
+        if not df.is_empty()
+    ]
+    if not frames:
+        return pl.DataFrame()
+
+    return pl.concat(frames).filter(pl.col("value").is_finite()).sort(["metric", *META_COLS])
+
+
+def _classify(statistic: pl.Expr, critical_5: pl.Expr, critical_1: pl.Expr) -> pl.Expr:
+    return (
+        pl.when(statistic.abs() > critical_1)
+        .then(pl.lit("outlier"))
+        .when(statistic.abs() > critical_5)
+        .then(pl.lit("straggler"))
+        .when(critical_5.is_not_null() & statistic.is_not_null())
+        .then(pl.lit("ok"))
+    )
+
+
+def _mandel_critical_values(p: np.ndarray, n: np.ndarray, alpha: float) -> tuple[np.ndarray, np.ndarray]:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = stats.t.ppf(1 - alpha / 2, p - 2)
+        h = (p - 1) * t / np.sqrt(p * (p - 2 + t**2))
+        f = stats.f.ppf(1 - alpha, n - 1, (p - 1) * (n - 1))
+        k = np.sqrt(p / (1 + (p - 1) / f))
+    return h, k
+
+
+def _outlier_critical_values(p: np.ndarray, n: np.ndarray, alpha: float) -> tuple[np.ndarray, np.ndarray]:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        f = stats.f.ppf(1 - alpha / p, n - 1, (p - 1) * (n - 1))
+        cochran = 1 / (1 + (p - 1) / f)
+        t = stats.t.ppf(1 - alpha / (2 * p), p - 2)
+        grubbs = (p - 1) / np.sqrt(p) * np.sqrt(t**2 / (p - 2 + t**2))
+    return cochran, grubbs
+
+
+def build_reproducibility_cells_df(values_df: pl.DataFrame) -> pl.DataFrame:
+    if values_df.is_empty():
+        return pl.DataFrame()
+
+    cell_mean = pl.col("cell_mean")
+    cell_var = pl.col("cell_std") ** 2
+    cells_df = (
+        values_df.group_by([*LEVEL_COLS, "participant"])
+        .agg(
+            pl.len().alias("n"),
+            pl.col("value").mean().alias("cell_mean"),
+            pl.col("value").std().alias("cell_std"),
+        )
+        .with_columns(
+            pl.len().over(LEVEL_COLS).alias("p"),
+            pl.col("n").median().round().over(LEVEL_COLS).alias("_n_level"),
+            ((cell_mean - cell_mean.mean()) / cell_mean.std()).over(LEVEL_COLS).alias("mandel_h"),
+            (pl.col("cell_std") / cell_var.mean().sqrt()).over(LEVEL_COLS).alias("mandel_k"),
+        )
+        .sort([*LEVEL_COLS, "participant"])
+    )
+
+    p = cells_df["p"].cast(pl.Float64).to_numpy()
+    n = cells_df["_n_level"].cast(pl.Float64).to_numpy()
+    h_5, k_5 = _mandel_critical_values(p, n, 0.05)
+    h_1, k_1 = _mandel_critical_values(p, n, 0.01)
+
+    return (
+        cells_df.with_columns(
+            pl.Series("mandel_h_crit_5", h_5, nan_to_null=True),
+            pl.Series("mandel_h_crit_1", h_1, nan_to_null=True),
+            pl.Series("mandel_k_crit_5", k_5, nan_to_null=True),
+            pl.Series("mandel_k_crit_1", k_1, nan_to_null=True),
+        )
+        .with_columns(
+            _classify(pl.col("mandel_h"), pl.col("mandel_h_crit_5"), pl.col("mandel_h_crit_1")).alias("mandel_h_test"),
+            _classify(pl.col("mandel_k"), pl.col("mandel_k_crit_5"), pl.col("mandel_k_crit_1")).alias("mandel_k_test"),
+        )
+        .drop("_n_level")
+    )
+
+
+def build_reproducibility_df(cells_df: pl.DataFrame) -> pl.DataFrame:
+    if cells_df.is_empty():
+        return pl.DataFrame()
+
+    n = pl.col("n").cast(pl.Float64)
+    cell_mean = pl.col("cell_mean")
+    cell_var = pl.col("cell_std").fill_null(0) ** 2
+    grand_mean = (n * cell_mean).sum() / n.sum()
+    p = pl.len().cast(pl.Float64)
+
+    level_df = (
+        cells_df.group_by(LEVEL_COLS)
+        .agg(
+            pl.len().alias("p"),
+            n.sum().cast(pl.Int64).alias("n_total"),
+            pl.col("n").median().round().alias("_n_level"),
+            grand_mean.alias("mean"),
+            ((n - 1) * cell_var).sum().alias("_ss_r"),
+            (n - 1).sum().alias("_df_r"),
+            ((n * (cell_mean - grand_mean) ** 2).sum() / (p - 1)).alias("_s_d2"),
+            ((n.sum() - (n**2).sum() / n.sum()) / (p - 1)).alias("_n_bar"),
+            (cell_var.filter(n > 1).max() / cell_var.filter(n > 1).sum()).alias("cochran_C"),
+            ((cell_mean.max() - cell_mean.mean()) / cell_mean.std()).alias("grubbs_G_high"),
+            ((cell_mean.mean() - cell_mean.min()) / cell_mean.std()).alias("grubbs_G_low"),
+        )
+        .with_columns((pl.col("_ss_r") / pl.col("_df_r")).alias("_s_r2"))
+        .with_columns(
+            ((pl.col("_s_d2") - pl.col("_s_r2")) / pl.col("_n_bar")).clip(lower_bound=0).alias("_s_L2"),
+        )
+        .with_columns(
+            pl.col("_s_r2").sqrt().alias("s_r"),
+            pl.col("_s_L2").sqrt().alias("s_L"),
+            (pl.col("_s_r2") + pl.col("_s_L2")).sqrt().alias("s_R"),
+        )
+        .with_columns(
+            (2.8 * pl.col("s_r")).alias("repeatability_limit"),
+            (2.8 * pl.col("s_R")).alias("reproducibility_limit"),
+            (pl.col("s_r") / pl.col("mean").abs() * 100).alias("s_r/%"),
+            (pl.col("s_R") / pl.col("mean").abs() * 100).alias("s_R/%"),
+        )
+        .sort(LEVEL_COLS)
+    )
+
+    p_values = level_df["p"].cast(pl.Float64).to_numpy()
+    n_values = level_df["_n_level"].cast(pl.Float64).to_numpy()
+    cochran_5, grubbs_5 = _outlier_critical_values(p_values, n_values, 0.05)
+    cochran_1, grubbs_1 = _outlier_critical_values(p_values, n_values, 0.01)
+
+    return (
+        level_df.with_columns(
+            pl.Series("cochran_C_crit_5", cochran_5, nan_to_null=True),
+            pl.Series("cochran_C_crit_1", cochran_1, nan_to_null=True),
+            pl.Series("grubbs_G_crit_5", grubbs_5, nan_to_null=True),
+            pl.Series("grubbs_G_crit_1", grubbs_1, nan_to_null=True),
+        )
+        .with_columns(
+            _classify(pl.col("cochran_C"), pl.col("cochran_C_crit_5"), pl.col("cochran_C_crit_1")).alias("cochran_test"),
+            _classify(pl.col("grubbs_G_high"), pl.col("grubbs_G_crit_5"), pl.col("grubbs_G_crit_1")).alias("grubbs_high_test"),
+            _classify(pl.col("grubbs_G_low"), pl.col("grubbs_G_crit_5"), pl.col("grubbs_G_crit_1")).alias("grubbs_low_test"),
+        )
+        .select(pl.exclude("^_.*$"))
+    )
+
+
+# EXPERIMENT SCHEDULE
+# Start and end of every experiment per technique, taken from the sample
+# timestamps. Pauses between consecutive samples longer than SCHEDULE_GAP
+# (e.g. an interrupted and resumed technique) are counted as gaps; the active
+# time is the duration without them. idle_before/h is the time since the
+# previous technique of the same participant and repetition ended.
+SCHEDULE_GAP = 600  # s
+SCHEDULE_TECHNIQUES = {
+    "Impedance": "eis",
+    "Polarisation": "polarisation",
+    "Charge-discharge": "cd_cycling",
+}
+
+
+def build_experiment_schedule_df(flat_dfs: dict[str, pl.DataFrame]) -> pl.DataFrame:
+    frames = [
+        flat_dfs[key]
+        .lazy()
+        .select([*META_COLS, pl.col("datetime").cast(pl.Datetime("us"))])
+        .sort([*META_COLS, "datetime"], maintain_order=True)
+        .group_by(META_COLS)
+        .agg(
+            pl.col("datetime").first().alias("start_datetime"),
+            pl.col("datetime").last().alias("end_datetime"),
+            (pl.col("datetime").diff().dt.total_seconds() > SCHEDULE_GAP).sum().alias("n_gaps"),
+            pl.col("datetime")
+            .diff()
+            .dt.total_seconds()
+            .filter(pl.col("datetime").diff().dt.total_seconds() > SCHEDULE_GAP)
+            .sum()
+            .alias("_gap_time/s"),
+        )
+        .with_columns(pl.lit(technique).alias("technique"))
+        for technique, key in SCHEDULE_TECHNIQUES.items()
+        if not flat_dfs.get(key, pl.DataFrame()).is_empty()
+    ]
+    if not frames:
+        return pl.DataFrame()
+
+    duration = (pl.col("end_datetime") - pl.col("start_datetime")).dt.total_seconds()
+    return (
+        pl.concat(frames)
+        .with_columns(
+            (duration / 3600).alias("duration/h"),
+            (pl.col("_gap_time/s") / 3600).alias("gap_time/h"),
+            ((duration - pl.col("_gap_time/s")) / 3600).alias("active_time/h"),
+        )
+        .sort(["study_phase", "participant", "repetition", "start_datetime"])
+        .with_columns(
+            (
+                (pl.col("start_datetime") - pl.col("end_datetime").shift(1)).dt.total_seconds() / 3600
+            )
+            .over(["study_phase", "participant", "repetition"])
+            .alias("idle_before/h"),
+        )
+        .select(
+            *META_COLS,
+            "technique",
+            "start_datetime",
+            "end_datetime",
+            "duration/h",
+            "active_time/h",
+            "n_gaps",
+            "gap_time/h",
+            "idle_before/h",
+        )
+        .collect()
+    )
+
+
+# TEMPERATURE CORRELATION
+# The logger temperature (one reading per minute) is attached to every
+# measurement row with an as-of join on datetime per study phase, taking the
+# nearest reading within TEMPERATURE_TOLERANCE. Both sides are sorted by
+# datetime once, so this is a single merge over all experiments instead of a
+# lookup per session. The mean temperature of each experiment is then related
+# to its result per metric, study phase and flow rate (see LEVEL_COLS). The
+# slope is pooled within participants (i.e., fitted to the deviations of the
+# temperatures and results from the participant means), so differences between
+# laboratories are not mistaken for a temperature effect. Only slopes that are
+# significant (two-sided t-test at TEMPERATURE_SIGNIFICANCE with experiments -
+# participants - 1 degrees of freedom) are applied, and the results are
+# corrected to the mean temperature of their level, so the correction never
+# extrapolates beyond the measured temperatures; all other levels stay
+# uncorrected.
+TEMPERATURE_TOLERANCE = "5m"
+TEMPERATURE_SIGNIFICANCE = 0.05
+METRIC_TECHNIQUES = {
+    "ESR/Ohm": "eis",
+    "polarisation_resistance/Ohm": "polarisation",
+    "initial_discharge_capacity/mAh": "cd_cycling",
+    "capacity_fade_rate/%/d": "cd_cycling",
+}
+
+
+def join_temperature(df: pl.DataFrame, temperature_data_df: pl.DataFrame) -> pl.DataFrame:
+    if df.is_empty() or temperature_data_df.is_empty():
+        return df
+
+    temperature_lf = (
+        temperature_data_df.lazy()
+        .select(
+            pl.col("study_phase"),
+            pl.col("datetime").cast(df.schema["datetime"]),
+            pl.col("temperature/°C"),
+        )
+        .sort("datetime")
+    )
+    return (
+        df.lazy()
+        .with_row_index("_row")
+        .sort("datetime", maintain_order=True)
+        .join_asof(
+            temperature_lf,
+            on="datetime",
+            by="study_phase",
+            strategy="nearest",
+            tolerance=TEMPERATURE_TOLERANCE,
+            # both sides are sorted by datetime as a whole, hence also within each study phase
+            check_sortedness=False,
+        )
+        .sort("_row")
+        .drop("_row")
+        .collect()
+    )
+
+
+def build_temperature_metrics_df(
+    values_df: pl.DataFrame,
+    flat_dfs: dict[str, pl.DataFrame],
+    temperature_data_df: pl.DataFrame,
+) -> pl.DataFrame:
+    if values_df.is_empty() or temperature_data_df.is_empty():
+        return pl.DataFrame()
+
+    # mean and spread of the temperature during each experiment
+    experiment_frames = [
+        join_temperature(df.select([*META_COLS, "datetime"]), temperature_data_df)
+        .group_by(META_COLS)
+        .agg(
+            pl.col("temperature/°C").mean(),
+            pl.col("temperature/°C").std().alias("temperature_std/°C"),
+        )
+        .with_columns(pl.lit(technique).alias("technique"))
+        for technique, df in flat_dfs.items()
+        if not df.is_empty()
+    ]
+    if not experiment_frames:
+        return pl.DataFrame()
+
+    temperature = pl.col("temperature/°C")
+    value = pl.col("value")
+    lab_cols = [*LEVEL_COLS, "participant"]
+    dt = pl.col("_dt")
+    dv = pl.col("_dv")
+    dof = pl.col("_dof")
+    slope = pl.col("_temperature_slope")
+    fit_df = (
+        values_df.with_columns(pl.col("metric").replace_strict(METRIC_TECHNIQUES, default=None).alias("technique"))
+        .join(pl.concat(experiment_frames), on=[*META_COLS, "technique"], how="inner")
+        .filter(temperature.is_not_null())
+        # deviations from the participant means (within-laboratory variation only)
+        .with_columns(
+            (temperature - temperature.mean().over(lab_cols)).alias("_dt"),
+            (value - value.mean().over(lab_cols)).alias("_dv"),
+            (pl.len().over(LEVEL_COLS) - pl.col("participant").n_unique().over(LEVEL_COLS) - 1).alias("_dof"),
+        )
+        .with_columns(
+            pl.when(dof > 0)
+            .then(((dt * dv).sum() / (dt**2).sum()).over(LEVEL_COLS))
+            .alias("_temperature_slope"),
+            pl.when(dof > 0).then(pl.corr(dt, dv).over(LEVEL_COLS)).alias("temperature_r"),
+        )
+        .with_columns(
+            slope.alias("temperature_coefficient"),
+            pl.when(dof > 0)
+            .then((((dv - slope * dt) ** 2).sum().over(LEVEL_COLS) / dof / (dt**2).sum().over(LEVEL_COLS)).sqrt())
+            .alias("temperature_coefficient_stderr"),
+            # fitted line per participant (through its mean temperature and result)
+            (value - dv + slope * dt).alias("value_fitted"),
+            temperature.mean().over(LEVEL_COLS).alias("reference_temperature/°C"),
+        )
+    )
+
+    # two-sided critical t value of each level (nan without residual degrees of freedom)
+    dof_values = fit_df["_dof"].cast(pl.Float64).to_numpy()
+    with np.errstate(invalid="ignore"):
+        t_critical = stats.t.ppf(1 - TEMPERATURE_SIGNIFICANCE / 2, np.where(dof_values > 0, dof_values, np.nan))
+
+    return (
+        fit_df.with_columns(pl.Series("_t_critical", t_critical))
+        .with_columns(
+            (pl.col("temperature_coefficient") / pl.col("temperature_coefficient_stderr")).abs().alias("_t"),
+        )
+        .with_columns(
+            (pl.col("_t").is_finite() & pl.col("_t_critical").is_finite() & (pl.col("_t") > pl.col("_t_critical")))
+            .fill_null(False)
+            .alias("temperature_significant"),
+        )
+        .with_columns(
+            # only significant slopes are applied, and only within the measured temperature range
+            pl.when(pl.col("temperature_significant"))
+            .then(value - slope * (temperature - pl.col("reference_temperature/°C")))
+            .otherwise(value)
+            .alias("value_corrected"),
+        )
+        .select(pl.exclude("technique", "^_.*$"))
+        .sort([*LEVEL_COLS, "participant", "repetition"])
+    )
+
+
+# TEMPERATURE LOGS
+# The logger is read out in parts (one file per dump, possibly in sub-folders
+# such as Temperature/part-1) whose time ranges can overlap. All parts of the
+# selected format below the Temperature folder of a study phase are discovered
+# recursively. Parts whose path and content (sha1 of the file, as the logger
+# dumps have a fixed size) did not change since the last run are taken from the
+# cached rows (temperature_parts_df in CACHE_DIR), so only new or modified dumps
+# are parsed. The parts are then merged by timestamp, and readings
+# contained in several overlapping dumps are kept once (from the first part in
+# path order).
+#
+# By default, the native .CL1 files of the DL-200T logger are read, so no manual
+# CSV export is needed; study phases without .CL1 files fall back to the CSV
+# export. They are XML documents with the channel settings and the readings as
+# base64-coded little-endian int16 values in 1/100 °C; the timestamps follow
+# from the start time (bytes: years since 1980, month, day, hour, minute,
+# second) and the sample rate in seconds. A format can be forced for all or
+# single study phases with --temperature-format (e.g. phase_2a=csv).
+TEMPERATURE_FORMATS = (".cl1", ".csv")  # in order of preference
+
+
+def discover_temperature_parts(
+    data_dir: Path, formats: Optional[dict[Optional[str], str]] = None
+) -> pl.DataFrame:
+    # formats: study phase (None for all phases) -> file suffix
+    formats = formats or {}
+    rows = []
+    for study_phase in sorted(data_dir.iterdir()):
+        if not study_phase.is_dir() or study_phase.name.startswith("."):
+            continue
+
+        paths = [path for path in sorted((study_phase / "Temperature").rglob("*")) if path.is_file()]
+        suffix = formats.get(study_phase.name, formats.get(None))
+        if suffix is None:
+            suffix = next(
+                (fmt for fmt in TEMPERATURE_FORMATS if any(path.suffix.lower() == fmt for path in paths)),
+                None,
+            )
+
+        rows.extend(
+            {
+                "study_phase": study_phase.name,
+                "source": path.relative_to(data_dir).as_posix(),
+                "source_hash": hashlib.sha1(path.read_bytes()).hexdigest(),
+            }
+            for path in paths
+            if path.suffix.lower() == suffix
+        )
+    return pl.DataFrame(
+        rows, schema={"study_phase": pl.String, "source": pl.String, "source_hash": pl.String}
+    )
+
+
+def scan_temperature_csv(path: Path) -> pl.LazyFrame:
+    return pl.scan_csv(path, try_parse_dates=True, decimal_comma=True).select(
+        pl.col("datetime").cast(pl.Datetime("us")),
+        pl.col("temperature_C").cast(pl.Float64).alias("temperature/°C"),
+    )
+
+
+def read_temperature_cl1(path: Path) -> pl.DataFrame:
+    root = ET.parse(path).getroot()
+    channel = root.find(".//Channel")
+    if channel is None:
+        raise ValueError(f"No logger channel found in {path}")
+    if channel.findtext("TemperatureUnit") != "0":
+        raise ValueError(f"Unsupported temperature unit in {path} (only °C is supported)")
+
+    blocks = sorted(root.iter("CodedData"), key=lambda block: int(block.get("index", 0)))
+    raw = np.frombuffer(b"".join(base64.b64decode(block.text or "") for block in blocks), dtype="<i2")
+    values = raw[: int(channel.findtext("DataCount", len(raw)))]
+
+    start_time = base64.b64decode(channel.findtext("StarTime") or "")
+    if len(start_time) != 6:
+        raise ValueError(
+            f"Unexpected start time in {path} (expected 6 bytes, got {len(start_time)})"
+        )
+    year, month, day, hour, minute, second = start_time
+    start = np.datetime64(datetime(1980 + year, month, day, hour, minute, second), "us")
+    sample_rate = np.timedelta64(int(channel.findtext("SampleRate")), "s")
+
+    return pl.DataFrame(
+        {
+            "datetime": start + np.arange(len(values)) * sample_rate,
+            "temperature/°C": values / 100.0,
+        }
+    )
+
+
+TEMPERATURE_READERS = {
+    ".csv": scan_temperature_csv,
+    ".cl1": lambda path: read_temperature_cl1(path).lazy(),
+}
+
+
+def build_temperature_parts_df(
+    data_dir: Path,
+    cache_df: Optional[pl.DataFrame] = None,
+    formats: Optional[dict[Optional[str], str]] = None,
+) -> pl.DataFrame:
+    parts_df = discover_temperature_parts(data_dir, formats)
+    keys = ["study_phase", "source", "source_hash"]
+
+    # split into (rows of cache_df for unchanged parts, parts to parse)
+    if cache_df is not None and not cache_df.is_empty() and "source_hash" in cache_df.columns:
+        cached_df = cache_df.join(parts_df, on=keys, how="semi")
+        parts_df = parts_df.join(cached_df.select(keys).unique(), on=keys, how="anti")
+    else:
+        cached_df = pl.DataFrame()
+
+    frames = [
+        TEMPERATURE_READERS[Path(row["source"]).suffix.lower()](data_dir / row["source"]).select(
+            pl.lit(row["study_phase"]).alias("study_phase"),
+            pl.lit(row["source"]).alias("source"),
+            pl.lit(row["source_hash"]).alias("source_hash"),
+            pl.all(),
+        )
+        for row in parts_df.iter_rows(named=True)
+    ]
+    if not cached_df.is_empty():
+        frames.append(cached_df.lazy())
+    if not frames:
+        return pl.DataFrame()
+
+    return (
+        pl.concat(frames, how="vertical_relaxed")
+        .sort(["study_phase", "source", "datetime"], maintain_order=True)
+        .collect()
+    )
+
+
+def build_temperature_data_df(temperature_parts_df: pl.DataFrame) -> pl.DataFrame:
+    if temperature_parts_df.is_empty():
+        return pl.DataFrame()
+
+    return (
+        temperature_parts_df.lazy()
+        .sort(["study_phase", "datetime", "source"], maintain_order=True)
+        .unique(subset=["study_phase", "datetime"], keep="first", maintain_order=True)
+        .with_columns(
+            (pl.col("datetime") - pl.col("datetime").min().over("study_phase"))
             .dt.total_seconds(fractional=True)
             .alias("time/s"),
-            pl.lit(study_phase.name).alias("study_phase"),
-        ).select(
+        )
+        .select(
             pl.col("study_phase"),
             pl.col("datetime"),
             pl.col("time/s"),
-            pl.col("temperature_C").cast(pl.Float64).alias("temperature/°C"),
+            pl.col("temperature/°C"),
         )
-        frames.append(temperature_data_df)
+        .collect()
+    )
 
-    return pl.concat(frames, how="vertical_relaxed") if frames else pl.DataFrame()
+
+# TEMPERATURE AGGREGATES
+# Mean, minimum and maximum temperature per study phase in bins of several
+# widths (polars duration string -> bin width in seconds). The dashboard picks
+# the finest resolution that keeps the visible time window below a fixed number
+# of bins, so it can show the whole study as well as a single experiment
+# without aggregating the logger data itself.
+TEMPERATURE_RESOLUTIONS = {"1m": 60, "10m": 600, "1h": 3_600, "12h": 43_200}
+
+
+def build_temperature_aggregates_df(temperature_data_df: pl.DataFrame) -> pl.DataFrame:
+    if temperature_data_df.is_empty():
+        return pl.DataFrame()
+
+    temperature = pl.col("temperature/°C")
+    frames = [
+        temperature_data_df.lazy()
+        .group_by("study_phase", pl.col("datetime").dt.truncate(every).alias("t_bin"))
+        .agg(
+            temperature.mean().alias("temp_mean"),
+            temperature.min().alias("temp_min"),
+            temperature.max().alias("temp_max"),
+            pl.len().alias("n"),
+        )
+        .with_columns(
+            pl.lit(every).alias("resolution"),
+            pl.lit(seconds).alias("resolution/s"),
+        )
+        for every, seconds in TEMPERATURE_RESOLUTIONS.items()
+    ]
+    return (
+        pl.concat(frames)
+        .select("study_phase", "resolution", "resolution/s", "t_bin", "temp_mean", "temp_min", "temp_max", "n")
+        .sort(["study_phase", "resolution/s", "t_bin"])
+        .collect()
+    )
+
+
+def parse_temperature_format(value: str) -> tuple[Optional[str], str]:
+    # "[study_phase=]format" -> (study phase or None for all phases, file suffix)
+    study_phase, _, fmt = value.rpartition("=")
+    suffix = "." + fmt.lower().lstrip(".")
+    if suffix not in TEMPERATURE_FORMATS:
+        choices = ", ".join(f[1:] for f in TEMPERATURE_FORMATS)
+        raise argparse.ArgumentTypeError(f"unknown temperature format {fmt!r} (choose from {choices})")
+    return study_phase or None, suffix
 
 
-def main() -> None:
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Precompute the IFBS dashboard data (*.parquet).")
+    parser.add_argument(
+        "--temperature-format",
+        type=parse_temperature_format,
+        action="append",
+        default=[],
+        metavar="[STUDY_PHASE=]FORMAT",
+        help="read the temperature logs from cl1 or csv files, for all or a single study phase "
+        "(can be repeated; default: cl1 if available, otherwise csv)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
     OUT_DIR.mkdir(parents=True, exist_ok=True)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
     data_structure_df = build_data_structure_df(DATA_DIR)
     if data_structure_df.height == 0:
@@ -342,20 +2351,108 @@ def main() -> None:
     eis_flat_df = build_eis_flat_df(data_structure_df)
     polarisation_flat_df = build_polarisation_flat_df(data_structure_df)
     cd_cycling_flat_df = build_cd_cycling_flat_df(data_structure_df)
-    temperature_data_df = build_temperature_data_df(DATA_DIR)
+    # logger dumps that did not change since the last run are reused
+    temperature_parts_df = build_temperature_parts_df(
+        DATA_DIR,
+        cache_df=read_cached_output("temperature_parts_df", CACHE_DIR),
+        formats=dict(args.temperature_format),
+    )
+    temperature_data_df = build_temperature_data_df(temperature_parts_df)
+    temperature_aggregates_df = build_temperature_aggregates_df(temperature_data_df)
+    experiment_schedule_df = build_experiment_schedule_df(
+        {"eis": eis_flat_df, "polarisation": polarisation_flat_df, "cd_cycling": cd_cycling_flat_df}
+    )
+
+    # results of spectra that did not change since the last run are reused
+    eis_circuit_fit_df = build_eis_circuit_fit_df(
+        eis_flat_df, cache_df=read_cached_output("eis_circuit_fit_df")
+    )
+    eis_drt_df = build_eis_drt_df(eis_flat_df, cache_df=read_cached_output("eis_drt_df"))
+    eis_kk_df = build_eis_kk_df(eis_flat_df, cache_df=read_cached_output("eis_kk_df"))
+    eis_ensemble_df = build_eis_ensemble_df(eis_flat_df)
+    polarisation_steps_df = build_polarisation_steps_df(polarisation_flat_df)
+    cd_cycling_cycle_df = build_cd_cycling_cycle_df(cd_cycling_flat_df)
+    cd_cycling_dqdv_df = build_cd_cycling_dqdv_df(cd_cycling_flat_df)
+    cd_cycling_dqdv_index_df = build_cd_cycling_dqdv_index_df(cd_cycling_dqdv_df)
+    cd_cycling_dvdq_df = build_cd_cycling_dvdq_df(cd_cycling_flat_df)
+    cd_cycling_curves_df = build_cd_cycling_curves_df(cd_cycling_flat_df)
+    polarisation_sweep_df = build_polarisation_sweep_df(polarisation_flat_df)
+    cd_cycling_sweep_df = build_cd_cycling_sweep_df(cd_cycling_cycle_df)
+    dqdv_sweep_df = build_dqdv_sweep_df(cd_cycling_dqdv_df)
+
+    # cross-technique results (joined once per experiment)
+    series_resistance_df = build_series_resistance_df(eis_flat_df)
+    polarisation_ir_df = build_polarisation_ir_df(polarisation_steps_df, series_resistance_df)
+    resistance_split_df = build_resistance_split_df(polarisation_ir_df, series_resistance_df)
+
+    # inter-laboratory statistics over the per-experiment results
+    reproducibility_values_df = build_reproducibility_values_df(
+        series_resistance_df, resistance_split_df, cd_cycling_sweep_df
+    )
+    reproducibility_cells_df = build_reproducibility_cells_df(reproducibility_values_df)
+    reproducibility_df = build_reproducibility_df(reproducibility_cells_df)
+    temperature_metrics_df = build_temperature_metrics_df(
+        reproducibility_values_df,
+        {"eis": eis_flat_df, "polarisation": polarisation_flat_df, "cd_cycling": cd_cycling_flat_df},
+        temperature_data_df,
+    )
 
     data_structure_df.write_parquet(OUT_DIR / "data_structure_df.parquet")
     eis_flat_df.write_parquet(OUT_DIR / "eis_flat_df.parquet")
     polarisation_flat_df.write_parquet(OUT_DIR / "polarisation_flat_df.parquet")
     cd_cycling_flat_df.write_parquet(OUT_DIR / "cd_cycling_flat_df.parquet")
+    temperature_parts_df.write_parquet(CACHE_DIR / "temperature_parts_df.parquet")
     temperature_data_df.write_parquet(OUT_DIR / "temperature_data_df.parquet")
+    temperature_aggregates_df.write_parquet(OUT_DIR / "temperature_aggregates_df.parquet")
+    experiment_schedule_df.write_parquet(OUT_DIR / "experiment_schedule_df.parquet")
+    eis_circuit_fit_df.write_parquet(OUT_DIR / "eis_circuit_fit_df.parquet")
+    eis_drt_df.write_parquet(OUT_DIR / "eis_drt_df.parquet")
+    eis_kk_df.write_parquet(OUT_DIR / "eis_kk_df.parquet")
+    eis_ensemble_df.write_parquet(OUT_DIR / "eis_ensemble_df.parquet")
+    polarisation_steps_df.write_parquet(OUT_DIR / "polarisation_steps_df.parquet")
+    cd_cycling_cycle_df.write_parquet(OUT_DIR / "cd_cycling_cycle_df.parquet")
+    cd_cycling_dqdv_df.write_parquet(OUT_DIR / "cd_cycling_dqdv_df.parquet")
+    cd_cycling_dqdv_index_df.write_parquet(OUT_DIR / "cd_cycling_dqdv_index_df.parquet")
+    cd_cycling_dvdq_df.write_parquet(OUT_DIR / "cd_cycling_dvdq_df.parquet")
+    cd_cycling_curves_df.write_parquet(OUT_DIR / "cd_cycling_curves_df.parquet")
+    polarisation_sweep_df.write_parquet(OUT_DIR / "polarisation_sweep_df.parquet")
+    cd_cycling_sweep_df.write_parquet(OUT_DIR / "cd_cycling_sweep_df.parquet")
+    dqdv_sweep_df.write_parquet(OUT_DIR / "dqdv_sweep_df.parquet")
+    series_resistance_df.write_parquet(OUT_DIR / "series_resistance_df.parquet")
+    polarisation_ir_df.write_parquet(OUT_DIR / "polarisation_ir_df.parquet")
+    resistance_split_df.write_parquet(OUT_DIR / "resistance_split_df.parquet")
+    reproducibility_cells_df.write_parquet(OUT_DIR / "reproducibility_cells_df.parquet")
+    reproducibility_df.write_parquet(OUT_DIR / "reproducibility_df.parquet")
+    temperature_metrics_df.write_parquet(OUT_DIR / "temperature_metrics_df.parquet")
 
     print("✅ Precompute finished")
     print(f"  data_structure_df: {data_structure_df.height} rows")
     print(f"  eis_flat_df: {eis_flat_df.height} rows")
     print(f"  polarisation_flat_df: {polarisation_flat_df.height} rows")
     print(f"  cd_cycling_flat_df: {cd_cycling_flat_df.height} rows")
+    print(f"  temperature_parts_df: {temperature_parts_df.height} rows")
     print(f"  temperature_data_df: {temperature_data_df.height} rows")
+    print(f"  temperature_aggregates_df: {temperature_aggregates_df.height} rows")
+    print(f"  experiment_schedule_df: {experiment_schedule_df.height} rows")
+    print(f"  eis_circuit_fit_df: {eis_circuit_fit_df.height} rows")
+    print(f"  eis_drt_df: {eis_drt_df.height} rows")
+    print(f"  eis_kk_df: {eis_kk_df.height} rows")
+    print(f"  eis_ensemble_df: {eis_ensemble_df.height} rows")
+    print(f"  polarisation_steps_df: {polarisation_steps_df.height} rows")
+    print(f"  cd_cycling_cycle_df: {cd_cycling_cycle_df.height} rows")
+    print(f"  cd_cycling_dqdv_df: {cd_cycling_dqdv_df.height} rows")
+    print(f"  cd_cycling_dqdv_index_df: {cd_cycling_dqdv_index_df.height} rows")
+    print(f"  cd_cycling_dvdq_df: {cd_cycling_dvdq_df.height} rows")
+    print(f"  cd_cycling_curves_df: {cd_cycling_curves_df.height} rows")
+    print(f"  polarisation_sweep_df: {polarisation_sweep_df.height} rows")
+    print(f"  cd_cycling_sweep_df: {cd_cycling_sweep_df.height} rows")
+    print(f"  dqdv_sweep_df: {dqdv_sweep_df.height} rows")
+    print(f"  series_resistance_df: {series_resistance_df.height} rows")
+    print(f"  polarisation_ir_df: {polarisation_ir_df.height} rows")
+    print(f"  resistance_split_df: {resistance_split_df.height} rows")
+    print(f"  reproducibility_cells_df: {reproducibility_cells_df.height} rows")
+    print(f"  reproducibility_df: {reproducibility_df.height} rows")
+    print(f"  temperature_metrics_df: {temperature_metrics_df.height} rows")
 
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "marimo[recommended]>=0.20.1",
-#     "polars>=0.19.0",
+#     "polars>=1.18.0",
 #     "scipy>=1.11.0",
 #     "numpy>=1.24.0",
 #     "altair>=5.0.0",
@@ -28,7 +28,7 @@ with app.setup:
     import sys
     from pathlib import Path
     from typing import Any, Optional
-    from datetime import datetime
+    from datetime import datetime, timedelta
 
     # detect WASM runtime (deployed marimo notebook in browser/pyodide)
     # must be defined before conditional imports below
@@ -41,6 +41,7 @@ with app.setup:
     import polars as pl
 
     # computation
+    import hashlib
     from functools import partial
     from scipy.stats import linregress
     import numpy as np
@@ -48,7 +49,43 @@ with app.setup:
     # visualization
     import altair as alt
 
-    if is_wasm():
+    # chart data transport: natively, vegafusion evaluates the chart transforms
+    # in the kernel and only sends their results. In the browser (WASM), the
+    # chart rows are handed over as Arrow IPC (marimo's Arrow transformer, which
+    # references them by URL) instead of being inlined as JSON into the spec.
+    # Encoded datasets are memoised by content hash, so a table shared by
+    # several charts is only serialised once. This only takes effect where
+    # marimo cannot serve virtual files and falls back to data URLs (i.e., in
+    # the Pyodide build); elsewhere, each chart keeps its own virtual file.
+    # NOTE: the transformer name must start with "marimo", otherwise
+    # mo.ui.altair_chart replaces it with marimo_arrow.
+    _chart_data_cache: dict[str, dict] = {}
+
+    def to_shared_chart_data(data: Any, transform: Any, max_entries: int = 64, **kwargs) -> dict:
+        if not isinstance(data, pl.DataFrame):
+            return transform(data)
+
+        _key = hashlib.sha1(
+            str(data.schema).encode() + data.hash_rows().to_numpy().tobytes()
+        ).hexdigest()
+        if _key not in _chart_data_cache:
+            _result = transform(data)
+            # virtual files are released with the cell that created them, so
+            # only self-contained data URLs can be shared between cells
+            if not _result["url"].startswith("data:"):
+                return _result
+            if len(_chart_data_cache) >= max_entries:
+                _chart_data_cache.pop(next(iter(_chart_data_cache)))
+            _chart_data_cache[_key] = _result
+        return _chart_data_cache[_key]
+
+    if is_wasm() and "marimo_arrow" in alt.data_transformers.names():
+        alt.data_transformers.enable("marimo_arrow")
+        alt.data_transformers.register(
+            "marimo_shared_arrow", partial(to_shared_chart_data, transform=alt.data_transformers.get())
+        )
+        alt.data_transformers.enable("marimo_shared_arrow")
+    elif is_wasm():
         alt.data_transformers.enable("default")
     else:
         alt.data_transformers.enable("vegafusion")
@@ -136,8 +173,9 @@ def _():
         *,
         x: str = "x",
         y: str = "y",
-        group: str = "dataset",
-        which: str = "all",  # "all" | "first" | "last" | "closest_to_zero"
+        group: str | list[str] = "dataset",
+        which: str = "all",  # "all" | "first" | "last" | "closest_to_zero" | "high_frequency"
+        freq: Optional[str] = None,
         assume_sorted: bool = False,
     ) -> pl.DataFrame:
         """
@@ -147,9 +185,15 @@ def _():
         Requirements:
           - df must be a Polars DataFrame or LazyFrame (NOT a Series)
           - columns: group, x, y must exist and be numeric (x,y)
+          - group may be a single column name or a list of column names, so all
+            experiments and cycles can be handled in one query
+          - which="high_frequency" requires `freq`; samples are then ordered by
+            descending frequency (sweep order) instead of by x, and the crossing
+            of the highest-frequency segment is returned
 
         Performance:
-          - O(n) if assume_sorted=True and already sorted by [group, x]
+          - O(n) if assume_sorted=True and already sorted by [*group, x]
+            (or [*group, freq] descending if `freq` is given)
           - otherwise includes a sort (O(n log n))
           - runs lazily if df is LazyFrame; collects only at the end
         """
@@ -160,19 +204,35 @@ def _():
                 "Pass the full table (with group/x/y columns), not df['col']."
             )
 
+        if which == "high_frequency" and freq is None:
+            raise ValueError("which='high_frequency' requires the `freq` column name.")
+
+        group_cols = [group] if isinstance(group, str) else list(group)
+
         lf = df.lazy() if isinstance(df, pl.DataFrame) else df
 
         # Ensure we are sorting a frame, not a Series
         if not assume_sorted:
-            lf = lf.sort([group, x])
+            if freq is None:
+                lf = lf.sort([*group_cols, x])
+            else:
+                lf = lf.sort(
+                    [*group_cols, freq],
+                    descending=[*([False] * len(group_cols)), True],
+                )
 
         x_c = pl.col(x)
         y_c = pl.col(y)
 
         lf = lf.with_columns(
             [
-                x_c.shift(1).over(group).alias("_x0"),
-                y_c.shift(1).over(group).alias("_y0"),
+                x_c.shift(1).over(group_cols).alias("_x0"),
+                y_c.shift(1).over(group_cols).alias("_y0"),
+                *(
+                    [pl.col(freq).shift(1).over(group_cols).alias("_f0")]
+                    if freq is not None
+                    else []
+                ),
             ]
         ).filter(pl.col("_y0").is_not_null())
 
@@ -195,29 +255,35 @@ def _():
                 )
                 .alias("x_intercept")
             )
-            .select([pl.col(group), pl.col("x_intercept")])
+            .select(
+                [
+                    *[pl.col(c) for c in group_cols],
+                    pl.col("x_intercept"),
+                    *([pl.col("_f0")] if freq is not None else []),
+                ]
+            )
         )
 
         if which == "all":
-            return lf.collect()
+            return lf.drop("_f0", strict=False).collect()
 
         if which == "first":
             return (
-                lf.group_by(group)
+                lf.group_by(group_cols)
                 .agg(pl.col("x_intercept").min().alias("x_intercept"))
                 .collect()
             )
 
         if which == "last":
             return (
-                lf.group_by(group)
+                lf.group_by(group_cols)
                 .agg(pl.col("x_intercept").max().alias("x_intercept"))
                 .collect()
             )
 
         if which == "closest_to_zero":
             return (
-                lf.group_by(group)
+                lf.group_by(group_cols)
                 .agg(
                     pl.col("x_intercept")
                     .sort_by(pl.col("x_intercept").abs())
@@ -227,8 +293,20 @@ def _():
                 .collect()
             )
 
+        if which == "high_frequency":
+            return (
+                lf.group_by(group_cols)
+                .agg(
+                    pl.col("x_intercept")
+                    .sort_by(pl.col("_f0"), descending=True)
+                    .first()
+                    .alias("x_intercept")
+                )
+                .collect()
+            )
+
         raise ValueError(
-            "which must be one of: 'all', 'first', 'last', 'closest_to_zero'."
+            "which must be one of: 'all', 'first', 'last', 'closest_to_zero', 'high_frequency'."
         )
 
     # define evaluation parameters
@@ -262,7 +340,140 @@ def _():
             how="cross",
         )
 
-    return get_linregress_params, get_x_intercepts
+    # closed-form linear regression as expressions, to be used within a group_by().agg()
+    # (same slope, stderr and rvalue as scipy.stats.linregress, without a Python call per group)
+    def get_linregress_exprs(x: pl.Expr, y: pl.Expr, name: str) -> list[pl.Expr]:
+        _valid = x.count() > 2
+        _r = pl.corr(x, y)
+        return [
+            pl.when(_valid).then(pl.cov(x, y) / x.var()).alias(f"{name}_slope"),
+            pl.when(_valid)
+            .then(((1 - _r**2) * y.var() / x.var() / (x.count() - 2)).sqrt())
+            .alias(f"{name}_stderr"),
+            pl.when(_valid).then(_r**2).alias(f"{name}_r2"),
+        ]
+
+    # bootstrap confidence intervals of the mean of each metric over experiments (one row per experiment);
+    # experiments are resampled jointly for all metrics, and the results are cached per selection hash
+    # (least recently used entries are evicted beyond max_entries, as in get_cached_chart)
+    _bootstrap_cache: dict[str, pl.DataFrame] = {}
+
+    def get_bootstrap_ci(
+        df: pl.DataFrame,
+        metrics: list[str],
+        n_resamples: int = 10_000,
+        confidence_level: float = 0.95,
+        batch_size: int = 1_000,
+        seed: int = 0,
+        max_entries: int = 32,
+    ) -> pl.DataFrame:
+        if df.is_empty():
+            return pl.DataFrame({"metric": metrics}).with_columns(
+                pl.lit(0).alias("n"),
+                *[pl.lit(None, dtype=pl.Float64).alias(_col) for _col in ["mean", "ci_lower", "ci_upper"]],
+            )
+
+        _values = df.select(pl.col(metrics).cast(pl.Float64)).to_numpy()
+        _key = hashlib.sha1(
+            _values.tobytes() + repr((metrics, n_resamples, confidence_level, batch_size, seed)).encode()
+        ).hexdigest()
+        if _key in _bootstrap_cache:
+            # move to the end (most recently used)
+            _bootstrap_cache[_key] = _bootstrap_cache.pop(_key)
+            return _bootstrap_cache[_key]
+
+        # draw the resampled experiment indices batch by batch (no Python loop per replicate)
+        _rng = np.random.default_rng(seed)
+        _valid = ~np.isnan(_values)
+        _filled = np.where(_valid, _values, 0.0)
+        _means = []
+        for _start in range(0, n_resamples, batch_size):
+            _idx = _rng.integers(0, len(_values), size=(min(batch_size, n_resamples - _start), len(_values)))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                _means.append(_filled[_idx].sum(axis=1) / _valid[_idx].sum(axis=1))
+        _means = np.concatenate(_means)
+
+        _alpha = (1 - confidence_level) / 2
+        _result = pl.DataFrame(
+            {
+                "metric": metrics,
+                "n": _valid.sum(axis=0),
+                "mean": _filled.sum(axis=0) / np.where(_valid.any(axis=0), _valid.sum(axis=0), np.nan),
+                "ci_lower": np.nanquantile(_means, _alpha, axis=0),
+                "ci_upper": np.nanquantile(_means, 1 - _alpha, axis=0),
+            }
+        )
+        _bootstrap_cache[_key] = _result
+        if len(_bootstrap_cache) > max_entries:
+            _bootstrap_cache.pop(next(iter(_bootstrap_cache)))
+        return _result
+
+    # points within an x window, reduced to the minimum and maximum y per x bin and group; with one bin per
+    # screen pixel this keeps the peaks and steps of the full-resolution curve, and windows with at most
+    # two points per bin are returned unchanged (i.e., at raw resolution)
+    def get_minmax_resampled(
+        df: pl.DataFrame,
+        x: str,
+        y: str,
+        over: list[str],
+        n_bins: int = 2000,
+        window: Optional[tuple[float, float]] = None,
+    ) -> pl.DataFrame:
+        if window is not None:
+            df = df.filter(pl.col(x).is_between(*window))
+        if df.is_empty() or df.group_by(over).len()["len"].max() <= 2 * n_bins:
+            return df
+
+        _width = (df[x].max() - df[x].min()) / n_bins or 1.0
+        _bin = [*over, ((pl.col(x) - df[x].min()) / _width).floor()]
+        _index = pl.int_range(pl.len()).over(_bin)
+        return df.filter((_index == pl.col(y).arg_min().over(_bin)) | (_index == pl.col(y).arg_max().over(_bin)))
+
+    # rendered charts are cached per content hash of their input tables and parameters (the least recently
+    # used entries are evicted), so a chart with unchanged inputs is neither rebuilt nor re-serialised
+    # (Altair, vegafusion); the build function must only depend on its arguments (or on values derived from them)
+    _chart_cache: dict[str, mo.Html] = {}
+
+    # bytecode and constants of a function (recursively for nested functions), so an edited build function
+    # (e.g., in edit mode) does not match the cached charts of its previous version
+    def _update_code_hash(_hash: Any, _code: Any) -> None:
+        _hash.update(_code.co_code)
+        for _const in _code.co_consts:
+            if hasattr(_const, "co_code"):
+                _update_code_hash(_hash, _const)
+            else:
+                _hash.update(repr(_const).encode())
+        _hash.update(repr(_code.co_names).encode())
+
+    def get_cached_chart(build: Any, *tables: pl.DataFrame, max_entries: int = 32, **params: Any) -> mo.Html:
+        _code = build.__code__
+        _hash = hashlib.sha1(f"{_code.co_filename}:{_code.co_firstlineno}:{build.__qualname__}".encode())
+        _update_code_hash(_hash, _code)
+        _hash.update(repr(sorted(params.items())).encode())
+        for _table in tables:
+            _hash.update(str(_table.schema).encode())
+            _hash.update(_table.hash_rows().to_numpy().tobytes())
+        _key = _hash.hexdigest()
+
+        if _key in _chart_cache:
+            # move to the end (most recently used)
+            _chart_cache[_key] = _chart_cache.pop(_key)
+            return _chart_cache[_key]
+
+        _chart = mo.as_html(build(*tables, **params))
+        _chart_cache[_key] = _chart
+        if len(_chart_cache) > max_entries:
+            _chart_cache.pop(next(iter(_chart_cache)))
+        return _chart
+
+    return (
+        get_bootstrap_ci,
+        get_cached_chart,
+        get_linregress_exprs,
+        get_linregress_params,
+        get_minmax_resampled,
+        get_x_intercepts,
+    )
 
 
 @app.cell(hide_code=True)
@@ -280,7 +491,53 @@ def _():
     wheel_zoom_y = alt.selection_interval(
         bind="scales", encodings=["y"], zoom="wheel![!event.altKey]"
     )
-    return wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y
+
+    def decimate_spectra(
+        df: pl.DataFrame,
+        *,
+        group: list[str],
+        freq: str = "freq/Hz",
+        max_points: int = 1500,
+        min_points_per_decade: int = 2,
+        max_points_per_decade: int = 10,
+    ) -> pl.DataFrame:
+        """
+        Reduce impedance spectra to a capped number of points per frequency decade
+        before handing them to Altair.
+
+        The frequency axis is split into log-spaced bins and only the highest-frequency
+        sample of each bin and spectrum (group) is kept. The number of bins per decade
+        shrinks with the number of spectra, so the chart data stays at roughly
+        `max_points` rows no matter how many experiments are selected (bounded by
+        `min_points_per_decade` / `max_points_per_decade`).
+        """
+
+        df = df.filter(pl.col(freq) > 0)
+        if df.is_empty():
+            return df
+
+        log_f = pl.col(freq).log10()
+        n_spectra = df.select(pl.struct(group).n_unique()).item()
+        n_decades = max(df.select(log_f.max() - log_f.min()).item(), 1.0)
+        points_per_decade = int(
+            np.clip(
+                max_points / (n_spectra * n_decades),
+                min_points_per_decade,
+                max_points_per_decade,
+            )
+        )
+
+        return (
+            df.sort(
+                [*group, freq],
+                descending=[*([False] * len(group)), True],
+            )
+            .with_columns((log_f * points_per_decade).floor().alias("_bin"))
+            .unique([*group, "_bin"], keep="first", maintain_order=True)
+            .drop("_bin")
+        )
+
+    return decimate_spectra, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y
 
 
 @app.cell
@@ -306,10 +563,48 @@ def _(study_phase_selector):
 def _(
     cd_cycling_filtered_capacity_fade_time,
     cd_cycling_initial_discharge_capacity,
-    data_structure_df,
-    study_phase_selector,
+    get_bootstrap_ci,
+    polarisation_resistance_df,
+    series_resistance_df,
     theoretical_capacity_mAh,
 ):
+    # STUDY METRICS CONFIDENCE INTERVALS
+
+    # collect the headline metrics with one row per experiment
+    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+    _per_experiment = [
+        cd_cycling_initial_discharge_capacity.select(
+            *_meta_cols,
+            pl.col("capacity/mAh").alias("initial_capacity/mAh"),
+            (pl.col("capacity/mAh") / theoretical_capacity_mAh * 100).alias("capacity_utilization/%"),
+        ),
+        cd_cycling_filtered_capacity_fade_time.select(*_meta_cols, "capacity_fade_rate/%/d"),
+        # ESR of the last spectrum of each experiment
+        series_resistance_df.sort([*_meta_cols, "cycle"])
+        .group_by(_meta_cols, maintain_order=True)
+        .agg(pl.col("ESR/Ohm").last()),
+        polarisation_resistance_df.select(*_meta_cols, "polarisation_resistance/Ohm").unique(_meta_cols),
+    ]
+    _headline_metrics_df = _per_experiment[0]
+    for _df in _per_experiment[1:]:
+        _headline_metrics_df = _headline_metrics_df.join(_df, on=_meta_cols, how="full", coalesce=True)
+
+    # 95 % bootstrap confidence intervals of the mean over all selected experiments
+    headline_metrics_ci_df = get_bootstrap_ci(
+        _headline_metrics_df.sort(_meta_cols),
+        metrics=[
+            "initial_capacity/mAh",
+            "capacity_utilization/%",
+            "capacity_fade_rate/%/d",
+            "ESR/Ohm",
+            "polarisation_resistance/Ohm",
+        ],
+    )
+    return (headline_metrics_ci_df,)
+
+
+@app.cell
+def _(data_structure_df, headline_metrics_ci_df, study_phase_selector):
     # STUDY METRICS SUMMARY
 
     stat_phase = mo.stat(
@@ -357,51 +652,35 @@ def _(
         background_color="#f8f8f8",
     )
 
-    stat_capacity = mo.stat(
-        value=f"{(
-            cd_cycling_initial_discharge_capacity["capacity/mAh"].mean()
-        ):.1f} ± {(
-            cd_cycling_initial_discharge_capacity["capacity/mAh"].std()
-        ):.1f}",
-        label="Initial Capacity (mAh)",
-        caption="Average over all experiments",
-    ).style(
-        padding="0px",          # optional, damit der Rahmen nicht “auf Kante” sitzt
-        border="1px solid #aaaaaa",
-        border_radius="5px",
-        background_color="#f8f8f8",
-    )
-
-    stat_capacity_utilization = mo.stat(
-        value=f"{(
-            (cd_cycling_initial_discharge_capacity["capacity/mAh"] / theoretical_capacity_mAh * 100).mean()
-        ):.1f} ± {(
-        (cd_cycling_initial_discharge_capacity["capacity/mAh"] / theoretical_capacity_mAh * 100).std()
-        ):.1f}",
-        label="Capacity Utilization (%)",
-        caption="Average over all experiments",
-    ).style(
-        padding="0px",          # optional, damit der Rahmen nicht “auf Kante” sitzt
-        border="1px solid #aaaaaa",
-        border_radius="5px",
-        background_color="#f8f8f8",
-    )
+    def _ci_stat(metric: str, label: str, precision: int, **kwargs):
+        _row = headline_metrics_ci_df.filter(pl.col("metric") == metric).row(0, named=True)
+        return mo.stat(
+            value=f"{_row['mean']:.{precision}f}" if _row["n"] else "–",
+            label=label,
+            caption=(
+                f"95 % CI [{_row['ci_lower']:.{precision}f}, {_row['ci_upper']:.{precision}f}], {_row['n']} experiments"
+                if _row["n"]
+                else "No data selected"
+            ),
+            **kwargs,
+        ).style(
+            padding="0px",          # optional, damit der Rahmen nicht “auf Kante” sitzt
+            border="1px solid #aaaaaa",
+            border_radius="5px",
+            background_color="#f8f8f8",
+        )
 
-    stat_fade_rate = mo.stat(
-        value=f"{(
-            cd_cycling_filtered_capacity_fade_time['capacity_fade_rate/%/d'].mean()
-        ):.2f} ± {(
-            cd_cycling_filtered_capacity_fade_time['capacity_fade_rate/%/d'].std()
-        ):.2f}",
-        label="Capacity Fade (% d⁻¹)",
-        caption="Average over all experiments",
-        direction=f"{"increase" if cd_cycling_filtered_capacity_fade_time['capacity_fade_rate/%/d'].mean() > 0 else "decrease"}",
-    ).style(
-        padding="0px",          # optional, damit der Rahmen nicht “auf Kante” sitzt
-        border="1px solid #aaaaaa",
-        border_radius="5px",
-        background_color="#f8f8f8",
+    stat_capacity = _ci_stat("initial_capacity/mAh", "Initial Capacity (mAh)", 1)
+    stat_capacity_utilization = _ci_stat("capacity_utilization/%", "Capacity Utilization (%)", 1)
+    _fade_rate = headline_metrics_ci_df.filter(pl.col("metric") == "capacity_fade_rate/%/d")["mean"][0]
+    stat_fade_rate = _ci_stat(
+        "capacity_fade_rate/%/d",
+        "Capacity Fade (% d⁻¹)",
+        2,
+        direction="increase" if (_fade_rate or 0) > 0 else "decrease",
     )
+    stat_esr = _ci_stat("ESR/Ohm", "ESR (Ω)", 3)
+    stat_polarisation_resistance = _ci_stat("polarisation_resistance/Ohm", "Polarisation Resistance (Ω)", 3)
 
     mo.vstack([
 
@@ -412,7 +691,9 @@ def _(
             stat_capacity, 
             stat_capacity_utilization,
             stat_fade_rate,
-        ], justify="start", gap="1"),
+            stat_esr,
+            stat_polarisation_resistance,
+        ], justify="start", gap="1", wrap=True),
 
     ])
     return
@@ -620,238 +901,325 @@ def _(load_precomputed_df, study_phase_selector):
     # LOAD ALL PRECOMPUTED DATAFRAMES
 
     with mo.status.progress_bar(
-        total=4,
+        total=21,
         title="Loading data",
         subtitle="Starting…",
         completion_title="Loading data",
         completion_subtitle="All datasets loaded",
         remove_on_exit=True,
     ) as bar:
-        temperature_data_df = (
-            load_precomputed_df("temperature_data_df")
+        temperature_aggregates_df = (
+            load_precomputed_df("temperature_aggregates_df")
             .filter(pl.col("study_phase") == study_phase_selector.value)
             .select(
-                pl.col("datetime").cast(pl.Datetime),
-                pl.col("time/s").cast(pl.Float64),
-                pl.col("temperature/°C").cast(pl.Float64),
+                pl.col("resolution"),
+                pl.col("resolution/s").cast(pl.Int64),
+                pl.col("t_bin").cast(pl.Datetime),
+                pl.col("temp_mean").cast(pl.Float64),
+                pl.col("temp_min").cast(pl.Float64),
+                pl.col("temp_max").cast(pl.Float64),
             )
         )
         bar.update(subtitle="Temperature data loaded")
 
+        experiment_schedule_df = load_precomputed_df("experiment_schedule_df")
+        bar.update(subtitle="Experiment schedule loaded")
+
         eis_flat_df = load_precomputed_df("eis_flat_df")
         bar.update(subtitle="EIS data loaded")
 
+        eis_drt_df = load_precomputed_df("eis_drt_df")
+        bar.update(subtitle="DRT data loaded")
+
+        eis_kk_df = load_precomputed_df("eis_kk_df")
+        bar.update(subtitle="Kramers-Kronig validation loaded")
+
+        eis_ensemble_df = load_precomputed_df("eis_ensemble_df")
+        bar.update(subtitle="EIS ensemble statistics loaded")
+
         polarisation_flat_df = load_precomputed_df("polarisation_flat_df")
         bar.update(subtitle="Polarisation data loaded")
 
+        polarisation_steps_df = load_precomputed_df("polarisation_steps_df")
+        bar.update(subtitle="Polarisation step analysis loaded")
+
+        resistance_split_df = load_precomputed_df("resistance_split_df")
+        bar.update(subtitle="Resistance contributions loaded")
+
+        reproducibility_df = load_precomputed_df("reproducibility_df")
+        reproducibility_cells_df = load_precomputed_df("reproducibility_cells_df")
+        bar.update(subtitle="Reproducibility statistics loaded", increment=2)
+
+        temperature_metrics_df = load_precomputed_df("temperature_metrics_df")
+        bar.update(subtitle="Temperature correlation loaded")
+
         cd_cycling_flat_df = load_precomputed_df("cd_cycling_flat_df")
         bar.update(subtitle="Charge-discharge data loaded")
 
-    return (temperature_data_df, eis_flat_df, polarisation_flat_df, cd_cycling_flat_df,)
+        cd_cycling_cycle_df = load_precomputed_df("cd_cycling_cycle_df")
+        bar.update(subtitle="Cycle energies and efficiencies loaded")
+
+        cd_cycling_dqdv_df = load_precomputed_df("cd_cycling_dqdv_df")
+        cd_cycling_dqdv_index_df = load_precomputed_df("cd_cycling_dqdv_index_df")
+        bar.update(subtitle="Incremental capacity curves loaded", increment=2)
+
+        cd_cycling_dvdq_df = load_precomputed_df("cd_cycling_dvdq_df")
+        bar.update(subtitle="Differential voltage curves loaded")
+
+        cd_cycling_curves_df = load_precomputed_df("cd_cycling_curves_df")
+        bar.update(subtitle="Resampled half-cycle curves loaded")
+
+        polarisation_sweep_df = load_precomputed_df("polarisation_sweep_df")
+        cd_cycling_sweep_df = load_precomputed_df("cd_cycling_sweep_df")
+        dqdv_sweep_df = load_precomputed_df("dqdv_sweep_df")
+        bar.update(subtitle="Parameter sweeps loaded", increment=3)
+
+    return (temperature_aggregates_df, experiment_schedule_df, eis_flat_df, eis_drt_df, eis_kk_df, eis_ensemble_df, polarisation_flat_df, polarisation_steps_df, resistance_split_df, reproducibility_df, reproducibility_cells_df, temperature_metrics_df, cd_cycling_flat_df, cd_cycling_cycle_df, cd_cycling_dqdv_df, cd_cycling_dqdv_index_df, cd_cycling_dvdq_df, cd_cycling_curves_df, polarisation_sweep_df, cd_cycling_sweep_df, dqdv_sweep_df,)
 
 
 @app.cell
-def _(temperature_data_df):
+def _(
+    experiment_schedule_df,
+    flow_rate_selector,
+    participant_selector,
+    repetition_selector,
+    study_phase_selector,
+):
     # PARTICIPANT SCHEDULES & TEMPERATURE DATA EVALUATION
-    # STEP 2a: Build an area chart to visualize the temperature data over time
+    # STEP 2a: Collect the experiment time ranges for each participant and experiment technique
+    # NOTE: the start and end time of every experiment and technique are precomputed in precompute.py (see build_experiment_schedule_df)
 
-    # reduce data to mean, min, and max values per 12h
-    temperature_data_filtered_df = (
-        temperature_data_df
-        .with_columns(
-            # truncate datetime to 12h bins for grouping
-            # (e.g., 2024-01-01 08:15 -> 2024-01-01 00:00, 
-            #        2024-01-01 14:30 -> 2024-01-01 12:00, 
-            # etc.)
-            pl.col("datetime").dt.truncate("12h").alias("t_bin")
+    # reduce the schedule to the start time of the first experiment of a participant and the end time of the last experiment of a participant (within a study phase and repetition) for each of the experiment techniques (Impedance, Polarisation, Charge-discharge cycling)
+    experiment_schedule_filtered_df = (
+        experiment_schedule_df.filter(
+            pl.col("study_phase").is_in([study_phase_selector.value])
+            & pl.col("participant").is_in(participant_selector.value)
+            & pl.col("repetition").is_in(repetition_selector.value)
+            & pl.col("flow_rate").is_in(flow_rate_selector.value)
+        )
+        .group_by(
+            "study_phase",
+            "participant",
+            "repetition",
+            "technique",
         )
-        .group_by(["t_bin"])
         .agg(
-            # aggregate mean, min, and max value per 12h bin
-            pl.col("temperature/°C").mean().alias("temp_mean"),
-            pl.col("temperature/°C").min().alias("temp_min"),
-            pl.col("temperature/°C").max().alias("temp_max"),
+            pl.col("start_datetime").min().cast(pl.Datetime),
+            pl.col("end_datetime").max().cast(pl.Datetime),
+            pl.col("active_time/h").sum(),
+            pl.col("n_gaps").sum(),
         )
-        .sort(["t_bin"])
+        .sort(["study_phase", "start_datetime"])
     )
+    return (experiment_schedule_filtered_df,)
 
-    # get domain for the temperature values with some padding for better visualization
-    _all_min = temperature_data_filtered_df["temp_min"]
-    _all_max = temperature_data_filtered_df["temp_max"]
-    _temperature_domain = [_all_min.min() - 0.1, _all_max.max() + 0.1]
-
-    # build chart with mean value as line and min-max range as band
-    # A) Base chart to add mean line and band
-    base = alt.Chart(
-        temperature_data_filtered_df
-    ).encode(
-        x=alt.X("t_bin:T", title=""),
-    )
 
-    # B) Band for min-max range
-    band = base.mark_area(
-        interpolate="monotone",
-        color="orange",
-        opacity=0.35,
-    ).encode(
-        y=alt.Y("temp_min:Q", title="Temperature / °C", scale=alt.Scale(domain=_temperature_domain), stack=None),
-        y2=alt.Y2("temp_max:Q"),
-    )
+@app.cell
+def _(experiment_schedule_filtered_df, temperature_aggregates_df):
+    # PARTICIPANT SCHEDULES & TEMPERATURE DATA EVALUATION
+    # STEP 2b: Select the temperature data to visualize over time
+    # NOTE: the mean, min, and max values are precomputed at several resolutions in precompute.py (see build_temperature_aggregates_df)
 
-    # C) Mean line
-    mean_line = base.mark_line(
-        point=alt.OverlayMarkDef(
-            shape="circle",
-            size=50,
-            color="darkorange",
-        ),
-        color="darkorange",
-        interpolate="monotone",
-    ).encode(
-        y=alt.Y("temp_mean:Q", title="Temperature / °C", scale=alt.Scale(domain=_temperature_domain), stack=None),
-        tooltip=[
-        alt.Tooltip("t_bin:T", title="Datetime", format="%Y-%m-%d %H:%M:%S"),
-        alt.Tooltip("temp_max:Q", title="Max / °C", format=".2f"),
-        alt.Tooltip("temp_mean:Q", title="Mean / °C", format=".2f"),
-        alt.Tooltip("temp_min:Q", title="Min / °C", format=".2f"),
-        ],
-    )
+    # visible time window: the range of the displayed experiments (or the whole study phase if none are selected)
+    if experiment_schedule_filtered_df.is_empty():
+        _window_start = temperature_aggregates_df["t_bin"].min()
+        _window_end = temperature_aggregates_df["t_bin"].max()
+    else:
+        _window_start = experiment_schedule_filtered_df["start_datetime"].min()
+        _window_end = experiment_schedule_filtered_df["end_datetime"].max()
 
-    temperature_time_chart = (
-        alt.layer(band + mean_line)
-        .properties(
-            width=975,
-            height=150,
-        )
+    # pick the finest resolution that shows the window with at most 10000 bins
+    # (i.e., single experiments of up to ~7 days are shown with one bin per minute)
+    _resolutions = (
+        temperature_aggregates_df.select("resolution", "resolution/s").unique().sort("resolution/s")
     )
+    _window_s = (_window_end - _window_start).total_seconds() if _window_end is not None else 0
+    _fitting = _resolutions.filter(pl.col("resolution/s") >= _window_s / 10000)
+    _resolution = _fitting if not _fitting.is_empty() else _resolutions.tail(1)
+
+    # reduce data to the mean, min, and max values of the bins within the window (plus one bin on each side)
+    if _resolution.is_empty():
+        # study phases without temperature logs have no aggregates
+        temperature_resolution = None
+        temperature_data_filtered_df = temperature_aggregates_df
+    else:
+        temperature_resolution = _resolution["resolution"][0]
+        _resolution_s = _resolution["resolution/s"][0]
+        temperature_data_filtered_df = temperature_aggregates_df.filter(
+            (pl.col("resolution") == temperature_resolution)
+            & pl.col("t_bin").is_between(
+                _window_start - timedelta(seconds=2 * _resolution_s),
+                _window_end + timedelta(seconds=_resolution_s),
+            )
+        ).sort(["t_bin"])
 
-    return (temperature_time_chart,)
+    return temperature_data_filtered_df, temperature_resolution
 
 
 @app.cell
 def _(
-    cd_cycling_filtered_df,
-    eis_filtered_df,
-    flow_rate_selector,
-    participant_selector,
-    polarisation_filtered_df,
-    repetition_selector,
-    study_phase_selector,
-    temperature_time_chart,
+    experiment_schedule_filtered_df,
+    get_cached_chart,
+    temperature_data_filtered_df,
+    temperature_resolution,
     wheel_zoom_x,
     wheel_zoom_xy,
     wheel_zoom_y,
 ):
     # PARTICIPANT SCHEDULES & TEMPERATURE DATA EVALUATION
-    # STEP 2b: Build a Gantt chart showing the experiment time ranges for each participant and experiment technique, and overlay it with the temperature data
+    # STEP 2c: Build a Gantt chart showing the experiment time ranges for each participant and experiment technique, and overlay it with the temperature data
+    # NOTE: the rendered chart is cached per content of the schedule and temperature data
+
+    def _build_chart(
+        schedule_df: pl.DataFrame,
+        temperature_df: pl.DataFrame,
+        resolution: Optional[str],
+        zoom: tuple[alt.Parameter, ...],
+    ) -> alt.VConcatChart:
+        # get domain for the temperature values with some padding for better visualization
+        _all_min = temperature_df["temp_min"]
+        _all_max = temperature_df["temp_max"]
+        _temperature_domain = (
+            [_all_min.min() - 0.1, _all_max.max() + 0.1]
+            # experiments outside the logging period have no temperature data
+            if not temperature_df.is_empty()
+            else alt.Undefined
+        )
 
-    # create a dataframe containing the start times of the first experiment of a participant and the end time of the last experiment of a participant (within a study phase) over all repetitions for each of the experiment phases (Impedance, Polarisation, Charge-discharge cycling)). The dataframe should have columns (study_phase, participant, technique, start_time/s, end_time/s), where technique is the experiment technique.
-    def _ranges(df, typ):
-        return (
-            df.filter(
-                pl.col("study_phase").is_in([study_phase_selector.value])
-                & pl.col("participant").is_in(participant_selector.value)
-                & pl.col("repetition").is_in(repetition_selector.value)
-                & pl.col("flow_rate").is_in(flow_rate_selector.value)
-            )
-            .group_by(
-                "study_phase", 
-                "participant",
-                "repetition",
-            ).agg(
-                pl.col("datetime").min().alias("start_datetime"),
-                pl.col("datetime").max().alias("end_datetime"),
-            )
-            .with_columns(
-                pl.lit(typ).alias("technique")
-            )
-            .select(
-                "study_phase",
-                "participant",
-                "repetition",
-                "technique",
-                pl.col("start_datetime").cast(pl.Datetime),
-                pl.col("end_datetime").cast(pl.Datetime),
-            )
+        # build chart with mean value as line and min-max range as band
+        # A) Base chart to add mean line and band
+        base = alt.Chart(
+            temperature_df
+        ).encode(
+            x=alt.X("t_bin:T", title=""),
         )
 
-    _experiment_schedules = (
-        pl.DataFrame(schema={
-            "study_phase": pl.String,
-            "participant": pl.String,
-            "repetition": pl.Int32,
-            "technique": pl.String,
-            "start_datetime": pl.Datetime,
-            "end_datetime": pl.Datetime,
-        })
-        .vstack(_ranges(eis_filtered_df, "Impedance"))
-        .vstack(_ranges(polarisation_filtered_df, "Polarisation"))
-        .vstack(_ranges(cd_cycling_filtered_df, "Charge-discharge"))
-        .sort(["study_phase", "start_datetime"])
-    )
+        # B) Band for min-max range
+        band = base.mark_area(
+            interpolate="monotone",
+            color="orange",
+            opacity=0.35,
+        ).encode(
+            y=alt.Y("temp_min:Q", title="Temperature / °C", scale=alt.Scale(domain=_temperature_domain), stack=None),
+            y2=alt.Y2("temp_max:Q"),
+        )
 
-    # create a Gantt chart visualizing the experiment time ranges for each participant and experiment technique, with the x-axis showing the time in days and the y-axis showing the participant. The bars should be colored by experiment technique and have tooltips showing the study phase, participant, experiment technique, start time, and end time.
-    experiment_schedule_chart = (
-        alt.Chart(_experiment_schedules)
-        .mark_bar()
-        .encode(
-            x=alt.X("start_datetime:T", title=""),
-            x2="end_datetime:T",
-            y=alt.Y("participant:N", title=""),
-            yOffset=alt.YOffset("technique:N", sort=["01 impedance", "02 polarisation", "03 charge-discharge"]),
-            color=alt.Color("technique:N", title="Technique"),
+        # C) Mean line (with point markers only as long as they can be told apart)
+        mean_line = base.mark_line(
+            point=alt.OverlayMarkDef(
+                shape="circle",
+                size=50,
+                color="darkorange",
+            ) if temperature_df.height <= 200 else False,
+            color="darkorange",
+            interpolate="monotone",
+        ).encode(
+            y=alt.Y("temp_mean:Q", title="Temperature / °C", scale=alt.Scale(domain=_temperature_domain), stack=None),
             tooltip=[
-                "study_phase:N",
-                "participant:N",
-                "technique:N",
-                alt.Tooltip("start_datetime:T", title="Start time"),
-                alt.Tooltip("end_datetime:T", title="End time"),
+            alt.Tooltip("t_bin:T", title="Datetime", format="%Y-%m-%d %H:%M:%S"),
+            alt.Tooltip("temp_max:Q", title="Max / °C", format=".2f"),
+            alt.Tooltip("temp_mean:Q", title="Mean / °C", format=".2f"),
+            alt.Tooltip("temp_min:Q", title="Min / °C", format=".2f"),
             ],
         )
-        .properties(
-            width=975,
-            height=150,
-        )
-    )
 
-    # create a combined chart overlaying the temperature data on the experiment schedule chart
-    combined_temperature_chart = (
-        alt.vconcat(
-            experiment_schedule_chart,
-            temperature_time_chart,
+        temperature_time_chart = (
+            alt.layer(band + mean_line)
+            .properties(
+                width=975,
+                height=150,
+            )
         )
-        .resolve_scale(x="shared")
-        .properties(
-            title=alt.TitleParams(
-                text="Figure 13. Experiment time ranges with temperature data",
-                subtitle=[
-                    "Combined Gantt chart and line chart visualizing the experiment schedules per participant, along with the temperature data over time. The Gantt chart displays the time ranges of the different", 
-                    "techniques: Impedance spectroscopy (orange), polarisation (red), and charge-discharge cycling (blue) for each participant. while the line chart shows the temperature data over time.The x-axis", 
-                    " is shared between the two charts to allow for easy comparison of the experiment schedules with the temperature data.",
+
+        # create a Gantt chart visualizing the experiment time ranges for each participant and experiment technique, with the x-axis showing the time in days and the y-axis showing the participant. The bars should be colored by experiment technique and have tooltips showing the study phase, participant, experiment technique, start time, and end time.
+        experiment_schedule_chart = (
+            alt.Chart(schedule_df)
+            .mark_bar()
+            .encode(
+                x=alt.X("start_datetime:T", title=""),
+                x2="end_datetime:T",
+                y=alt.Y("participant:N", title=""),
+                yOffset=alt.YOffset("technique:N", sort=["01 impedance", "02 polarisation", "03 charge-discharge"]),
+                color=alt.Color("technique:N", title="Technique"),
+                tooltip=[
+                    "study_phase:N",
+                    "participant:N",
+                    "technique:N",
+                    alt.Tooltip("start_datetime:T", title="Start time"),
+                    alt.Tooltip("end_datetime:T", title="End time"),
+                    alt.Tooltip("active_time/h:Q", title="Active time / h", format=".1f"),
+                    alt.Tooltip("n_gaps:Q", title="Interruptions"),
                 ],
-                anchor="start",
-                orient="top",
-                offset=20,
+            )
+            .properties(
+                width=975,
+                height=150,
             )
         )
-        .interactive()
-        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y)
-        .configure_legend(
-            title=None,
-            orient="top",
-            direction='horizontal',
-            disable=True,
+
+        # create a combined chart overlaying the temperature data on the experiment schedule chart
+        return (
+            alt.vconcat(
+                experiment_schedule_chart,
+                temperature_time_chart,
+            )
+            .resolve_scale(x="shared")
+            .properties(
+                title=alt.TitleParams(
+                    text="Figure 13. Experiment time ranges with temperature data",
+                    subtitle=[
+                        "Combined Gantt chart and line chart visualizing the experiment schedules per participant, along with the temperature data over time. The Gantt chart displays the time ranges of the different", 
+                        "techniques: Impedance spectroscopy (orange), polarisation (red), and charge-discharge cycling (blue) for each participant. while the line chart shows the temperature data over time.The x-axis", 
+                        " is shared between the two charts to allow for easy comparison of the experiment schedules with the temperature data.",
+                        f"The temperature is shown as mean and min-max range per {resolution} bin over the time range of the selected experiments."
+                        if resolution is not None
+                        else "No temperature data was recorded for the selected study phase.",
+                    ],
+                    anchor="start",
+                    orient="top",
+                    offset=20,
+                )
+            )
+            .interactive()
+            .add_params(*zoom)
+            .configure_legend(
+                title=None,
+                orient="top",
+                direction='horizontal',
+                disable=True,
+            )
         )
+
+    combined_temperature_chart = get_cached_chart(
+        _build_chart,
+        experiment_schedule_filtered_df,
+        temperature_data_filtered_df,
+        resolution=temperature_resolution,
+        zoom=(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y),
     )
 
     return (combined_temperature_chart,)
 
 
 @app.cell
-def _(combined_temperature_chart, temperature_data_df):
+def _(
+    combined_temperature_chart,
+    temperature_aggregates_df,
+    temperature_data_filtered_df,
+):
     # PARTICIPANT SCHEDULES & TEMPERATURE DATA EVALUATION
     # STEP 3: Display the content of the section and explain what it does
 
+    # at the finest resolution, each bin holds a single logger reading
+    _temperature = temperature_aggregates_df.filter(
+        pl.col("resolution/s") == pl.col("resolution/s").min()
+    )["temp_mean"]
+    _temperature_summary = (
+        f"The **average temperature** over the recorded time period was **{_temperature.mean():.1f} °C ± {(_temperature.std() if len(_temperature) > 1 else 0):.1f} °C** (uncertainty: standard deviation) with a **minimum temperature of {_temperature.min()} °C** and **maximum temperature of {_temperature.max()} °C**."
+        if not _temperature.is_empty()
+        else "No temperature data was recorded for the selected study phase."
+    )
+
     mo.vstack(
         [
             mo.md("## Participant schedules and temperature data"),
@@ -861,12 +1229,12 @@ def _(combined_temperature_chart, temperature_data_df):
             mo.md("<br>"),
             mo.md("### Raw data exploration"),
             mo.md("""
-                The expandable sections enables you to explore the raw temperature data in more detail. You can view the data in a tabular format and apply filter and custom computations or use the interactive data explorer to filter, sort, and visualize the data as needed. While the functions are limited, it may help you gain a better understanding of the underlying data beyond the prepared visualizations below.
+                The expandable sections enables you to explore the temperature data shown in the plot below (mean, min, and max values per bin) in more detail. You can view the data in a tabular format and apply filter and custom computations or use the interactive data explorer to filter, sort, and visualize the data as needed. While the functions are limited, it may help you gain a better understanding of the underlying data beyond the prepared visualizations below.
             """),
             mo.accordion(
                 {
-                    "Data table": temperature_data_df,
-                    # "Data explorer": mo.ui.data_explorer(temperature_data_df),
+                    "Data table": temperature_data_filtered_df,
+                    # "Data explorer": mo.ui.data_explorer(temperature_data_filtered_df),
                 },
                 lazy=True,
                 multiple=True,
@@ -874,7 +1242,7 @@ def _(combined_temperature_chart, temperature_data_df):
             mo.md("<br>"),
             mo.md("### Participant schedules and temperature over time"),
             mo.md(f"""
-                The plot shows the participant schedules and the temperature data over time. You can use this plot to analyze the temperature behavior during the experiments and identify trends or differences between different time periods. The **average temperature** over the recorded time period was **{temperature_data_df["temperature/°C"].mean():.1f} °C ± {(temperature_data_df["temperature/°C"].std() if len(temperature_data_df) > 1 else 0):.1f} °C** (uncertainty: standard deviation) with a **minimum temperature of {temperature_data_df["temperature/°C"].min()} °C** and **maximum temperature of {temperature_data_df["temperature/°C"].max()} °C**.
+                The plot shows the participant schedules and the temperature data over time. You can use this plot to analyze the temperature behavior during the experiments and identify trends or differences between different time periods. {_temperature_summary}
             """),
             mo.md("<br>"),
             mo.lazy(combined_temperature_chart, show_loading_indicator=True),
@@ -882,9 +1250,23 @@ def _(combined_temperature_chart, temperature_data_df):
     )
     return
 
+@app.cell
+def _():
+    # IMPEDANCE SPECTROSCOPY EVALUATION
+    # STEP 1a: Create a checkbox to exclude spectra failing the Kramers-Kronig validation
+    # NOTE: the Lin-KK validation is precomputed per spectrum in precompute.py
+    eis_kk_filter_checkbox = mo.ui.checkbox(
+        label="Exclude spectra failing the Kramers-Kronig (Lin-KK) validation",
+        value=False,
+    )
+    return (eis_kk_filter_checkbox,)
+
+
 @app.cell
 def _(
     eis_flat_df,
+    eis_kk_df,
+    eis_kk_filter_checkbox,
     flow_rate_selector,
     participant_selector,
     recalculate_time,
@@ -924,13 +1306,61 @@ def _(
             pl.col("cycle") == pl.col("max_cycle")
         ).drop("max_cycle")
     )
+
+    # optionally drop spectra that failed the precomputed Kramers-Kronig validation
+    if eis_kk_filter_checkbox.value:
+        eis_filtered_df = eis_filtered_df.join(
+            eis_kk_df.filter(pl.col("kk_valid")).select(
+                "study_phase",
+                "participant",
+                "repetition",
+                "flow_rate",
+                "cycle",
+            ),
+            on=["study_phase", "participant", "repetition", "flow_rate", "cycle"],
+            how="semi",
+        )
+    # NOTE: the result may be empty if no selected spectrum passed the validation; the dependent cells stop on their own,
+    # so that the section (and with it the checkbox) is still displayed
     return (eis_filtered_df,)
 
 
 @app.cell
-def _(eis_filtered_df, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y):
+def _(decimate_spectra, eis_filtered_df):
+    # IMPEDANCE SPECTROSCOPY EVALUATION
+    # STEP 1c: Build the reduced chart data shared by the Nyquist and Bode plots
+    # NOTE: only the columns used by the chart encodings are kept and the spectra are decimated per frequency decade
+
+    mo.stop(eis_filtered_df.is_empty())
+
+    eis_chart_df = decimate_spectra(
+        eis_filtered_df.select(
+            [
+                "participant",
+                "repetition",
+                "flow_rate",
+                "freq/Hz",
+                "Re(Z)/Ohm",
+                "-Im(Z)/Ohm",
+            ]
+        ),
+        group=["participant", "repetition", "flow_rate"],
+    ).with_columns(
+        (pl.col("Re(Z)/Ohm") ** 2 + pl.col("-Im(Z)/Ohm") ** 2).sqrt().alias("|Z|/Ohm"),
+        pl.arctan2(-pl.col("-Im(Z)/Ohm"), pl.col("Re(Z)/Ohm")).degrees().alias("Phase(Z)/deg"),
+    ).with_columns(
+        # limit the number of significant digits to keep the chart JSON small
+        pl.col("freq/Hz", "Re(Z)/Ohm", "-Im(Z)/Ohm", "|Z|/Ohm", "Phase(Z)/deg")
+        .cast(pl.Float64)
+        .round_sig_figs(4)
+    )
+    return (eis_chart_df,)
+
+
+@app.cell
+def _(eis_chart_df, eis_filtered_df, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y):
     # IMPEDANCE SPECTROSCOPY EVALUATION
-    # STEP 2: Plot the Nyquist plots for the selected files
+    # STEP 2a: Plot the Nyquist plots for the selected files
 
     # compute per-axis data ranges, then build centered domains with equal span
     _re_min = eis_filtered_df["Re(Z)/Ohm"].min()
@@ -956,21 +1386,19 @@ def _(eis_filtered_df, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y):
     _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
     _flow_rate_selection = alt.selection_point(fields=["flow_rate"], bind="legend")
 
-    # select only columns needed for the chart
-    _chart_data = eis_filtered_df.select(
+    # select only columns needed for the chart (axis domains above use the full data)
+    _chart_data = eis_chart_df.select(
         [
-            "study_phase",
             "participant",
             "repetition",
             "flow_rate",
-            "cycle",
             "Re(Z)/Ohm",
             "-Im(Z)/Ohm",
             "freq/Hz",
         ]
     )
 
-    # build Nyquist plot from single flat DataFrame
+    # build Nyquist plot from the reduced chart DataFrame
     nyquist_plots = (
         (
             alt.Chart(_chart_data)
@@ -1001,11 +1429,9 @@ def _(eis_filtered_df, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y):
                     alt.value(0.025),
                 ),
                 tooltip=[
-                    "study_phase:O",
                     "participant:N",
                     "repetition:O",
                     "flow_rate:O",
-                    "cycle:O",
                     alt.Tooltip("freq/Hz:Q", format=".1f"),
                     "Re(Z)/Ohm:Q",
                     "-Im(Z)/Ohm:Q",
@@ -1038,39 +1464,100 @@ def _(eis_filtered_df, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y):
 
 
 @app.cell
-def _(eis_filtered_df, get_x_intercepts):
+def _(eis_chart_df, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y):
     # IMPEDANCE SPECTROSCOPY EVALUATION
-    # STEP 3a: Extract the ohmic series resistance from the EIS data into a separate dataframe
+    # STEP 2b: Plot the Bode magnitude and phase for the selected files (same reduced data as the Nyquist plots)
 
-    # partition by metadata columns and compute x-intercepts per group,
-    # since get_x_intercepts uses .over(group) internally and "cycle number"
-    # values repeat across different files
-    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
-    series_resistance_df = pl.concat(
-        [
-            get_x_intercepts(
-                df=group_df,
-                x="Re(Z)/Ohm",
-                y="-Im(Z)/Ohm",
-                group="cycle",
-                which="last",
-                assume_sorted=False,
-            )
-            .with_columns(pl.lit(group_df[col][0]).alias(col) for col in _meta_cols)
-            .select(
-                *_meta_cols,
-                pl.col("cycle"),
-                pl.col("x_intercept").alias("ESR/Ohm"),
-            )
-            for group_df in eis_filtered_df.partition_by(_meta_cols, as_dict=False)
-        ],
-        how="vertical_relaxed",
-    )
-    return (series_resistance_df,)
+    # create selectors and bind them to the legend
+    _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
+    _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
 
+    _base = (
+        alt.Chart(eis_chart_df)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X(
+                "freq/Hz:Q",
+                title="Frequency / Hz",
+                scale=alt.Scale(type="log"),
+            ),
+            color=alt.Color("participant:N", title="Participant"),
+            strokeDash=alt.StrokeDash("repetition:N", title="Repetition"),
+            detail="flow_rate:N",
+            opacity=alt.condition(
+                _participant_selection & _repetition_selection,
+                alt.value(1.0),
+                alt.value(0.05),
+            ),
+            tooltip=[
+                "participant:N",
+                "repetition:O",
+                "flow_rate:O",
+                alt.Tooltip("freq/Hz:Q", format=".1f"),
+                alt.Tooltip("|Z|/Ohm:Q", format=".4f"),
+                alt.Tooltip("Phase(Z)/deg:Q", format=".2f"),
+            ],
+        )
+        .properties(width=720, height=200)
+    )
 
-@app.cell
-def esr_per_participant_1(series_resistance_df):
+    bode_plots = (
+        alt.vconcat(
+            _base.encode(
+                y=alt.Y("|Z|/Ohm:Q", title="|Z| / Ω", scale=alt.Scale(type="log"))
+            )
+            .add_params(_participant_selection, _repetition_selection)
+            .interactive()
+            .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y),
+            _base.encode(y=alt.Y("Phase(Z)/deg:Q", title="Phase(Z) / °")),
+        )
+        # share the frequency axis, so zooming the magnitude plot also zooms the phase plot
+        .resolve_scale(x="shared")
+        .properties(
+            title=alt.TitleParams(
+                text="Figure 16. Bode plots for selected participants and repetitions",
+                subtitle="Impedance magnitude and phase over frequency for each selected file.",
+                anchor="start",
+                orient="top",
+                offset=20,
+            )
+        )
+    )
+    return (bode_plots,)
+
+
+@app.cell
+def _(eis_filtered_df, get_x_intercepts):
+    # IMPEDANCE SPECTROSCOPY EVALUATION
+    # STEP 3a: Extract the ohmic series resistance from the EIS data into a separate dataframe
+
+    mo.stop(eis_filtered_df.is_empty())
+
+    # compute the x-intercepts for all experiments and cycles in one lazy query,
+    # grouping by the metadata columns together with "cycle" since cycle
+    # numbers repeat across different files
+    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+    series_resistance_df = (
+        get_x_intercepts(
+            df=eis_filtered_df.lazy(),
+            x="Re(Z)/Ohm",
+            y="-Im(Z)/Ohm",
+            group=[*_meta_cols, "cycle"],
+            which="last",
+            assume_sorted=False,
+        )
+        .select(
+            *_meta_cols,
+            pl.col("cycle"),
+            pl.col("x_intercept").alias("ESR/Ohm"),
+        )
+        .sort([*_meta_cols, "cycle"])
+    )
+    return (series_resistance_df,)
+
+
+@app.cell
+def esr_per_participant_1(series_resistance_df):
     # IMPEDANCE SPECTROSCOPY EVALUATION
     # STEP 3b: Plot series resistance values per participants (mean value over repetitions)
     #          with error bars representing the standard deviation of the mean)
@@ -1233,7 +1720,172 @@ def esr_per_repetition(series_resistance_df):
 
 
 @app.cell
-def section_impedance_spectroscopy(eis_filtered_df):
+def _(eis_drt_df, eis_filtered_df, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y):
+    # IMPEDANCE SPECTROSCOPY EVALUATION
+    # STEP 3d: Plot the distribution of relaxation times (DRT) for the selected spectra
+    # NOTE: the DRT is precomputed per spectrum in precompute.py (regularised NNLS)
+
+    mo.stop(eis_filtered_df.is_empty())
+
+    # keep only the spectra that are shown in the Nyquist plot (last cycle of each experiment)
+    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+    eis_drt_filtered_df = eis_drt_df.join(
+        eis_filtered_df.select([*_meta_cols, "cycle"]).unique(),
+        on=[*_meta_cols, "cycle"],
+        how="semi",
+    ).select(
+        [
+            *_meta_cols,
+            "cycle",
+            "tau/s",
+            "freq/Hz",
+            "gamma/Ohm",
+        ]
+    )
+
+    # create selectors and bind them to the legend
+    _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
+    _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
+
+    eis_drt_plot = (
+        alt.Chart(eis_drt_filtered_df)
+        .mark_line()
+        .encode(
+            x=alt.X(
+                "tau/s:Q",
+                title="Relaxation time τ / s",
+                scale=alt.Scale(type="log"),
+            ),
+            y=alt.Y("gamma/Ohm:Q", title="γ(ln τ) / Ω"),
+            color=alt.Color("participant:N", title="Participant"),
+            strokeDash=alt.StrokeDash("repetition:N", title="Repetition"),
+            detail="flow_rate:N",
+            opacity=alt.condition(
+                _participant_selection & _repetition_selection,
+                alt.value(1.0),
+                alt.value(0.05),
+            ),
+            tooltip=[
+                "participant:N",
+                "repetition:O",
+                "flow_rate:O",
+                alt.Tooltip("tau/s:Q", format=".3e"),
+                alt.Tooltip("freq/Hz:Q", format=".3e"),
+                alt.Tooltip("gamma/Ohm:Q", format=".4f"),
+            ],
+        )
+        .properties(
+            title=alt.TitleParams(
+                text="Figure 14. Distribution of relaxation times",
+                subtitle="DRT of the selected impedance spectra, obtained by Tikhonov-regularised non-negative least squares.",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+            width=720,
+            height=300,
+        )
+        .add_params(_participant_selection, _repetition_selection)
+        .interactive()
+        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y)
+    )
+    return (eis_drt_plot,)
+
+
+@app.cell
+def _(
+    eis_ensemble_df,
+    flow_rate_selector,
+    participant_selector,
+    study_phase_selector,
+    wheel_zoom_x,
+    wheel_zoom_xy,
+    wheel_zoom_y,
+):
+    # IMPEDANCE SPECTROSCOPY EVALUATION
+    # STEP 3e: Plot the ensemble Bode magnitude (mean and 10-90 % band over repetitions) per participant
+    # NOTE: the spectra are interpolated onto a common log-frequency grid and aggregated in precompute.py
+
+    eis_ensemble_filtered_df = eis_ensemble_df.filter(
+        (pl.col("ensemble") == "repetitions")
+        & (pl.col("study_phase") == study_phase_selector.value)
+        & pl.col("participant").is_in(participant_selector.value)
+        & pl.col("flow_rate").is_in(flow_rate_selector.value)
+    ).select(
+        [
+            "participant",
+            "flow_rate",
+            "freq/Hz",
+            "n_spectra",
+            "|Z|/Ohm_mean",
+            "|Z|/Ohm_std",
+            "|Z|/Ohm_p10",
+            "|Z|/Ohm_p90",
+        ]
+    )
+
+    # create selector and bind it to the legend
+    _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
+
+    _base = alt.Chart(eis_ensemble_filtered_df).encode(
+        x=alt.X(
+            "freq/Hz:Q",
+            title="Frequency / Hz",
+            scale=alt.Scale(type="log"),
+        ),
+        color=alt.Color("participant:N", title="Participant"),
+        detail="flow_rate:N",
+    )
+
+    _band = _base.mark_area(opacity=0.2).encode(
+        y=alt.Y("|Z|/Ohm_p10:Q", title="|Z| / Ω", scale=alt.Scale(type="log")),
+        y2="|Z|/Ohm_p90:Q",
+        opacity=alt.condition(
+            _participant_selection,
+            alt.value(0.2),
+            alt.value(0.02),
+        ),
+    )
+
+    _line = _base.mark_line().encode(
+        y=alt.Y("|Z|/Ohm_mean:Q"),
+        opacity=alt.condition(
+            _participant_selection,
+            alt.value(1.0),
+            alt.value(0.05),
+        ),
+        tooltip=[
+            "participant:N",
+            "flow_rate:O",
+            "n_spectra:Q",
+            alt.Tooltip("freq/Hz:Q", format=".3e"),
+            alt.Tooltip("|Z|/Ohm_mean:Q", format=".4f"),
+            alt.Tooltip("|Z|/Ohm_std:Q", format=".4f"),
+        ],
+    )
+
+    eis_ensemble_plot = (
+        (_band + _line)
+        .properties(
+            title=alt.TitleParams(
+                text="Figure 15. Ensemble Bode magnitude per participant",
+                subtitle="Mean impedance magnitude of the last spectrum of each repetition with the 10-90 % percentile band.",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+            width=720,
+            height=300,
+        )
+        .add_params(_participant_selection)
+        .interactive()
+        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y)
+    )
+    return (eis_ensemble_plot,)
+
+
+@app.cell
+def section_impedance_spectroscopy(eis_filtered_df, eis_kk_filter_checkbox):
     # IMPEDANCE SPECTROSCOPY EVALUATION
     # STEP 4: Display the content of the section and explain what it does
 
@@ -1244,6 +1896,10 @@ def section_impedance_spectroscopy(eis_filtered_df):
             mo.md("""
                 This section allows you to visualize the results of the Impedance Spectroscopy experiments. You can select one or more files containing the EIS data, and the notebook will generate Nyquist plots, extract ohmic series resistances for each selected file, and compare different repetitions and runs.
             """),
+            mo.md("""
+                Each spectrum was validated with a linear Kramers-Kronig test (Lin-KK) during precomputation. Spectra with relative residuals above 2 % indicate non-stationary or non-linear behaviour during the measurement and can be excluded from all evaluations below.
+            """),
+            eis_kk_filter_checkbox,
             mo.md("<br>"),
             mo.md("### Raw data exploration"),
             mo.md("""
@@ -1256,7 +1912,9 @@ def section_impedance_spectroscopy(eis_filtered_df):
                 },
                 lazy=True,
                 multiple=True,
-            ),
+            )
+            if not eis_filtered_df.is_empty()
+            else mo.md("*None of the selected spectra passed the Kramers-Kronig validation. Untick the checkbox above to show them.*"),
 
         ]
     )
@@ -1280,6 +1938,23 @@ def _(nyquist_plots):
     return
 
 
+@app.cell
+def _(bode_plots):
+    # display section content
+    mo.vstack(
+        [
+            mo.md("### Bode plots"),
+            mo.md("""
+                The Bode plots show the same spectra as the Nyquist plots, but with the impedance magnitude and phase over the frequency. This makes the frequency range of the individual processes visible, which is lost in the Nyquist representation. For plotting, all spectra are reduced to a limited number of points per frequency decade.
+            """),
+            mo.md("<br>"),
+            mo.lazy(bode_plots, show_loading_indicator=True),
+            mo.md("<br>"),
+        ]
+    )
+    return
+
+
 @app.cell
 def _(
     series_resistance_per_participant_plot,
@@ -1310,6 +1985,40 @@ def _(
     return
 
 
+@app.cell
+def _(eis_drt_plot):
+    # display section content
+    mo.vstack(
+        [
+            mo.md("### Distribution of relaxation times (DRT)"),
+            mo.md("""
+                The DRT deconvolutes each impedance spectrum into a distribution of relaxation processes over their characteristic time constant τ. Separate peaks correspond to processes with different time constants (e.g., charge transfer at short and mass transport at long relaxation times), which overlap in the Nyquist plot. The DRT was computed for the spectra shown in the Nyquist plot above by a non-negative least squares fit regularised with the second derivative of the distribution; the relaxation times are limited to the measured frequency range (τ between 1/(2π f_max) and 1/(2π f_min)), as faster processes cannot be told apart from the ohmic resistance.
+            """),
+            mo.md("<br>"),
+            mo.lazy(eis_drt_plot, show_loading_indicator=True),
+            mo.md("<br>"),
+        ]
+    )
+    return
+
+
+@app.cell
+def _(eis_ensemble_plot):
+    # display section content
+    mo.vstack(
+        [
+            mo.md("### Ensemble spectra across repetitions"),
+            mo.md("""
+                To compare the spread between repetitions, the last spectrum of each experiment was interpolated onto a common logarithmic frequency grid (10 points per decade) during precomputation. The plot shows the mean impedance magnitude per participant and flow rate together with the band between the 10th and 90th percentile over all repetitions. Narrow bands indicate a reproducible cell assembly, while wide bands point to differences between the repetitions. The repetition selector does not apply to this plot.
+            """),
+            mo.md("<br>"),
+            mo.lazy(eis_ensemble_plot, show_loading_indicator=True),
+            mo.md("<br>"),
+        ]
+    )
+    return
+
+
 @app.cell
 def _(
     flow_rate_selector,
@@ -1340,101 +2049,226 @@ def _(
 
 
 @app.cell
-def _(polarisation_filtered_df):
+def _(get_cached_chart, polarisation_filtered_df):
     # POLARISATION DATA EVALUATION
     # STEP 2a: Plot the time-voltage curves
+    # NOTE: the downsampled and rendered chart is cached per content of the filtered data
+
+    def _build_chart(polarisation_df: pl.DataFrame) -> alt.Chart:
+        # shift time to start at 0 per file (identified by metadata group)
+        _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+        _chart_data = polarisation_df.with_columns(
+            (pl.col("time/s") - pl.col("time/s").min()).over(_meta_cols).alias("time/s"),
+        ).select(
+            [
+                *_meta_cols,
+                "Ns",
+                "time/s",
+                "voltage/V",
+                "current/mA",
+            ]
+        )
+
+        # downsample the data for better performance in the plot to a maximum of 20000 points
+        for n in range(1, 100, 1):
 
-    # shift time to start at 0 per file (identified by metadata group)
+            # bin width
+            bin_w = n * 1  # time bin width in s (e.g., 1 s, 2 s, etc.)
+    
+            _downsampled_chart_data = (
+                _chart_data.with_columns(
+                    # build time-based bins
+                    ((pl.col("time/s") / bin_w).round() * bin_w).alias("time_bin"),
+                )
+                .with_columns(
+                    # compute median time within each bin per sequence (Ns)
+                    pl.col("time/s").median().over([
+                        *_meta_cols, 
+                        "Ns", 
+                        "time_bin",
+                    ]).alias("_t_med"),
+                )
+                .with_columns(
+                    # compute distance to median time within each bin per sequence (Ns)
+                    # to keep the closest-to-median point for better curve representation after downsampling
+                    (pl.col("time/s") - pl.col("_t_med")).abs().alias("_t_dist")
+                )
+                .sort([
+                    *_meta_cols, 
+                    "Ns", 
+                    "time_bin", 
+                    "_t_dist",
+                ])
+                .group_by([
+                    *_meta_cols, 
+                    "Ns", 
+                    "time_bin"
+                ])
+                .agg(
+                    # keep the first row after sorting by distance to median time as the representative point for each bin
+                    pl.all().first()
+                )
+                .drop(["_t_med", "_t_dist"])
+                .sort([
+                    *_meta_cols,
+                    "Ns", 
+                    "time/s"
+                ])
+            )
+
+            #print(n, bin_w, len(_downsampled_chart_data), len(_chart_data))
+            if len(_downsampled_chart_data) <= 20000:
+                break
+
+        # create selectors and bind them to the legend
+        _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
+        _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
+        _flow_rate_selection = alt.selection_point(fields=["flow_rate"], bind="legend")
+
+        # build polarisation plot from single flat DataFrame
+        return (
+            alt.Chart(_downsampled_chart_data)
+            .mark_point()
+            .encode(
+                x=alt.X("time/s", title="Time / s"),
+                y=alt.Y("voltage/V", title="Voltage / V"),
+                color=alt.Color("participant:N", title="Participant"),
+                shape=alt.Shape("repetition:N", title="Repetition"),
+                size=alt.Size(
+                    "flow_rate:N",
+                    title="Flow Rate (mL/min⁻¹)",
+                    scale=alt.Scale(range=[30, 150]),
+                ),
+                opacity=alt.condition(
+                    _participant_selection 
+                    & _repetition_selection
+                    & _flow_rate_selection,
+                    alt.value(1.0),
+                    alt.value(0.0),
+                ),
+                tooltip=[
+                    "participant:N",
+                    "repetition:O",
+                    "flow_rate:Q",
+                    alt.Tooltip("time/s:Q", format=".1f"),
+                    alt.Tooltip("voltage/V:Q", format=".4f"),
+                ],
+            )
+            .properties(
+                title="Polarisation Plot",
+            )
+            .add_params(_participant_selection, _repetition_selection, _flow_rate_selection)
+        ).properties(
+            title=alt.TitleParams(
+                text="Figure 4. Current-overvoltage curves for selected participants and repetitions",
+                subtitle="Current-overvoltage curves showing the relationship between current and overvoltage for each selected file.",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+            height=400,
+        )
+
+    polarisation_plots = get_cached_chart(_build_chart, polarisation_filtered_df)
+    return (polarisation_plots,)
+
+
+@app.cell
+def _(get_minmax_resampled, polarisation_filtered_df):
+    # POLARISATION DATA EVALUATION
+    # STEP 2b: Build an overview of the time-voltage curves to select a time window shown at full resolution
+
+    # shift time to start at 0 per file (identified by metadata group), as in Figure 4
     _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
-    _chart_data = polarisation_filtered_df.with_columns(
+    polarisation_time_voltage_df = polarisation_filtered_df.with_columns(
         (pl.col("time/s") - pl.col("time/s").min()).over(_meta_cols).alias("time/s"),
     ).select(
         [
             *_meta_cols,
-            "Ns",
             "time/s",
             "voltage/V",
-            "current/mA",
         ]
     )
 
-    # downsample the data for better performance in the plot to a maximum of 20000 points
-    for n in range(1, 100, 1):
+    # coarse overview limited to a maximum of 5000 points over all curves
+    _n_bins = max(min(500, 2500 // polarisation_time_voltage_df.select(_meta_cols).n_unique()), 25)
 
-        # bin width
-        bin_w = n * 1  # time bin width in s (e.g., 1 s, 2 s, etc.)
-    
-        _downsampled_chart_data = (
-            _chart_data.with_columns(
-                # build time-based bins
-                ((pl.col("time/s") / bin_w).round() * bin_w).alias("time_bin"),
-            )
-            .with_columns(
-                # compute median time within each bin per sequence (Ns)
-                pl.col("time/s").median().over([
-                    *_meta_cols, 
-                    "Ns", 
-                    "time_bin",
-                ]).alias("_t_med"),
-            )
-            .with_columns(
-                # compute distance to median time within each bin per sequence (Ns)
-                # to keep the closest-to-median point for better curve representation after downsampling
-                (pl.col("time/s") - pl.col("_t_med")).abs().alias("_t_dist")
-            )
-            .sort([
-                *_meta_cols, 
-                "Ns", 
-                "time_bin", 
-                "_t_dist",
-            ])
-            .group_by([
-                *_meta_cols, 
-                "Ns", 
-                "time_bin"
-            ])
-            .agg(
-                # keep the first row after sorting by distance to median time as the representative point for each bin
-                pl.all().first()
-            )
-            .drop(["_t_med", "_t_dist"])
-            .sort([
-                *_meta_cols,
-                "Ns", 
-                "time/s"
-            ])
+    # the brushed time window is reported back to the notebook (see polarisation_overview_chart.selections)
+    _time_window = alt.selection_interval(encodings=["x"], name="time_window")
+
+    polarisation_overview_chart = mo.ui.altair_chart(
+        alt.Chart(
+            get_minmax_resampled(polarisation_time_voltage_df, "time/s", "voltage/V", _meta_cols, n_bins=_n_bins)
         )
+        .mark_line(strokeWidth=1)
+        .encode(
+            x=alt.X("time/s:Q", title="Time / s"),
+            y=alt.Y("voltage/V:Q", title="Voltage / V"),
+            color=alt.Color("participant:N", title="Participant"),
+            detail=["repetition:N", "flow_rate:N"],
+        )
+        .add_params(_time_window)
+        .properties(
+            title=alt.TitleParams(
+                text="Figure 25. Overview of the time-voltage curves",
+                subtitle=f"Minimum and maximum voltage in {_n_bins} time bins per curve. Drag over the chart to select the time window shown at full resolution in Figure 26.",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+            width=975,
+            height=150,
+        ),
+        legend_selection=False,
+    )
+    return polarisation_overview_chart, polarisation_time_voltage_df
+
+
+@app.cell
+def _(
+    get_minmax_resampled,
+    polarisation_overview_chart,
+    polarisation_time_voltage_df,
+    wheel_zoom_x,
+    wheel_zoom_xy,
+    wheel_zoom_y,
+):
+    # POLARISATION DATA EVALUATION
+    # STEP 2c: Re-query the selected time window at screen resolution (up to one min-max pair per pixel and curve)
 
-        #print(n, bin_w, len(_downsampled_chart_data), len(_chart_data))
-        if len(_downsampled_chart_data) <= 20000:
-            break
+    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+    # one bin per pixel of the plot width, limited to a maximum of 20000 points over all curves
+    _n_curves = polarisation_time_voltage_df.select(_meta_cols).n_unique()
+    _n_bins = max(min(1000, 10000 // _n_curves), 50)
+
+    _window = polarisation_overview_chart.selections.get("time_window", {}).get("time/s")
+    _window = tuple(_window) if _window else None
+    _n_points = (
+        polarisation_time_voltage_df.filter(pl.col("time/s").is_between(*_window)).height
+        if _window
+        else polarisation_time_voltage_df.height
+    )
+    _window_df = get_minmax_resampled(
+        polarisation_time_voltage_df,
+        "time/s",
+        "voltage/V",
+        _meta_cols,
+        n_bins=_n_bins,
+        window=_window,
+    )
 
     # create selectors and bind them to the legend
     _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
-    _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
-    _flow_rate_selection = alt.selection_point(fields=["flow_rate"], bind="legend")
 
-    # build polarisation plot from single flat DataFrame
-    polarisation_plots = (
-        alt.Chart(_downsampled_chart_data)
-        .mark_point()
+    polarisation_detail_plot = (
+        alt.Chart(_window_df)
+        .mark_line(point=alt.OverlayMarkDef(size=15) if _window_df.height == _n_points else False)
         .encode(
-            x=alt.X("time/s", title="Time / s"),
-            y=alt.Y("voltage/V", title="Voltage / V"),
+            x=alt.X("time/s:Q", title="Time / s", scale=alt.Scale(zero=False)),
+            y=alt.Y("voltage/V:Q", title="Voltage / V", scale=alt.Scale(zero=False)),
             color=alt.Color("participant:N", title="Participant"),
-            shape=alt.Shape("repetition:N", title="Repetition"),
-            size=alt.Size(
-                "flow_rate:N",
-                title="Flow Rate (mL/min⁻¹)",
-                scale=alt.Scale(range=[30, 150]),
-            ),
-            opacity=alt.condition(
-                _participant_selection 
-                & _repetition_selection
-                & _flow_rate_selection,
-                alt.value(1.0),
-                alt.value(0.0),
-            ),
+            detail=["repetition:N", "flow_rate:N"],
+            opacity=alt.condition(_participant_selection, alt.value(1.0), alt.value(0.1)),
             tooltip=[
                 "participant:N",
                 "repetition:O",
@@ -1444,48 +2278,38 @@ def _(polarisation_filtered_df):
             ],
         )
         .properties(
-            title="Polarisation Plot",
+            title=alt.TitleParams(
+                text="Figure 26. Time-voltage curves in the selected time window",
+                subtitle=f"Showing {_window_df.height} of {_n_points} data points (minimum and maximum voltage per pixel, raw data in narrow windows). Use the mouse wheel to zoom (shift: x only, alt: y only).",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+            width=975,
+            height=300,
         )
-        .add_params(_participant_selection, _repetition_selection, _flow_rate_selection)
-    ).properties(
-        title=alt.TitleParams(
-            text="Figure 4. Current-overvoltage curves for selected participants and repetitions",
-            subtitle="Current-overvoltage curves showing the relationship between current and overvoltage for each selected file.",
-            anchor="start",
-            orient="top",
-            offset=20,
-        ),
-        height=400,
+        .interactive()
+        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y, _participant_selection)
     )
-    return (polarisation_plots,)
+    return (polarisation_detail_plot,)
 
 
 @app.cell
-def _(get_linregress_params, polarisation_filtered_df):
+def _(get_linregress_params, polarisation_filtered_df, polarisation_steps_df):
     # POLARISATION DATA EVALUATION
     # STEP 3a: Calculate the polarisation resistances based on the step voltages and applied currents (using a linear regression)
+    # NOTE: the steps and their steady-state plateaus are detected in precompute.py (see build_polarisation_steps_df)
 
     # define evaluation parameters
-    step_evaluation_tail_length = 10  # number of samples from the end of each step to consider for the evaluation
     rest_current_tolerance = 1        # rest current tolerance (± X mA) to filter out rest steps
 
-    # aggregate the data: group_by now includes metadata columns alongside Ns
+    # keep the plateau statistics of the selected experiments
     _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
     polarisation_current_voltage_df = (
-        polarisation_filtered_df.group_by(
-            *_meta_cols,
-            "Ns",
-            maintain_order=True,
-        )
-        .agg(
-            pl.col("voltage/V")
-            .tail(step_evaluation_tail_length)
-            .median()
-            .alias("voltage/V"),
-            pl.col("current/mA")
-            .tail(step_evaluation_tail_length)
-            .median()
-            .alias("current/mA"),
+        polarisation_steps_df.join(
+            polarisation_filtered_df.select(_meta_cols).unique(),
+            on=_meta_cols,
+            how="semi",
         )
         .with_columns(
             (pl.col("voltage/V") / pl.col("current/mA") * 1000).alias(
@@ -1496,8 +2320,11 @@ def _(get_linregress_params, polarisation_filtered_df):
             [
                 *_meta_cols,
                 "Ns",
+                "step",
                 "voltage/V",
                 "current/mA",
+                "plateau_duration/s",
+                "steady_state",
                 "polarisation_resistance/Ohm",
             ]
         )
@@ -1506,7 +2333,7 @@ def _(get_linregress_params, polarisation_filtered_df):
     # drop rows where current is close to zero (rest steps) based on the defined tolerance
     polarisation_current_voltage_df = polarisation_current_voltage_df.filter(
         (pl.col("current/mA").abs() > rest_current_tolerance)
-    ).sort([*_meta_cols, "Ns"])
+    ).sort([*_meta_cols, "step"])
 
     # perform linear regression on grouped data to get polarisation resistance as slope of the voltage-current curve for each participant, repetition, and flow rate
     polarisation_resistance_df = (
@@ -1520,7 +2347,7 @@ def _(get_linregress_params, polarisation_filtered_df):
                 y_name="voltage/V",
                 with_columns=[
                     *_meta_cols,
-                    "Ns",
+                    "step",
                     "current/mA",
                     "voltage/V",
                 ],
@@ -1533,20 +2360,16 @@ def _(get_linregress_params, polarisation_filtered_df):
         .select(
             [
                 *_meta_cols,
-                "Ns",
+                "step",
                 "voltage/V",
                 "current/mA",
                 "polarisation_resistance/Ohm",
                 "polarisation_resistance_stderr/Ohm",
             ]
         )
-        .sort([*_meta_cols, "Ns"])
-    )
-    return (
-        polarisation_current_voltage_df,
-        polarisation_resistance_df,
-        step_evaluation_tail_length,
+        .sort([*_meta_cols, "step"])
     )
+    return polarisation_current_voltage_df, polarisation_resistance_df
 
 
 @app.cell
@@ -1802,6 +2625,127 @@ def _(polarisation_resistance_df):
     return (polarisation_resistance_per_repetition_plot,)
 
 
+@app.cell
+def _(polarisation_filtered_df, resistance_split_df):
+    # POLARISATION DATA EVALUATION
+    # STEP 3e: Plot the contributions to the polarisation resistance (mean value over repetitions)
+    # NOTE: ESR and polarisation steps are joined per experiment in precompute.py (see build_resistance_split_df)
+
+    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+    _contributions = {
+        "ESR/Ohm": "Ohmic (ESR)",
+        "R_ct/Ohm": "Charge transfer (EIS)",
+        "R_mt/Ohm": "Mass transport (DC)",
+    }
+
+    # only experiments with an impedance spectrum (ESR) can be split into contributions
+    _experiments_df = resistance_split_df.join(
+        polarisation_filtered_df.select(_meta_cols).unique(),
+        on=_meta_cols,
+        how="semi",
+    ).filter(pl.col("ESR/Ohm").is_not_null())
+
+    # the contributions add up to the polarisation resistance (shown as a tick), also if one of them is negative
+    resistance_contributions_df = (
+        _experiments_df.group_by("participant", "flow_rate")
+        .agg(
+            pl.col("polarisation_resistance/Ohm").mean(),
+            *[pl.col(_col).mean() for _col in _contributions],
+        )
+        .unpivot(
+            index=["participant", "flow_rate", "polarisation_resistance/Ohm"],
+            on=list(_contributions),
+            variable_name="contribution",
+            value_name="resistance/Ohm",
+        )
+        .with_columns(
+            pl.col("contribution").replace_strict(_contributions),
+            (pl.col("resistance/Ohm") < 0).alias("negative"),
+        )
+        .sort(["participant", "flow_rate", "contribution"])
+    )
+
+    # experiments whose resistance split contains a negative contribution (see build_resistance_split_df)
+    resistance_negative_contributions_df = _experiments_df.filter(pl.col("negative_contribution")).select(
+        [
+            *_meta_cols,
+            "polarisation_resistance/Ohm",
+            *_contributions,
+        ]
+    )
+
+    # create selector and bind it to the legend
+    _contribution_selection = alt.selection_point(fields=["contribution"], bind="legend")
+
+    # A) Stacked contributions (negative ones are stacked below zero and outlined)
+    _bars = (
+        alt.Chart()
+        .mark_bar()
+        .encode(
+            x=alt.X("participant:N", title="Participant"),
+            y=alt.Y("resistance/Ohm:Q", title="Resistance / Ω", stack="zero"),
+            color=alt.Color(
+                "contribution:N",
+                title="Contribution",
+                sort=list(_contributions.values()),
+            ),
+            order=alt.Order("contribution:N"),
+            opacity=alt.condition(
+                _contribution_selection,
+                alt.value(1.0),
+                alt.value(0.2),
+            ),
+            stroke=alt.condition(alt.datum.negative, alt.value("black"), alt.value(None)),
+            strokeDash=alt.condition(alt.datum.negative, alt.value([4, 2]), alt.value([1, 0])),
+            tooltip=[
+                "participant:N",
+                "flow_rate:O",
+                "contribution:N",
+                alt.Tooltip("resistance/Ohm:Q", format=".4f"),
+                alt.Tooltip("polarisation_resistance/Ohm:Q", title="Polarisation resistance / Ω", format=".4f"),
+            ],
+        )
+        .add_params(_contribution_selection)
+    )
+
+    # B) Total polarisation resistance
+    _total = (
+        alt.Chart()
+        .mark_tick(color="black", thickness=2)
+        .encode(
+            x=alt.X("participant:N", title="Participant"),
+            y=alt.Y("polarisation_resistance/Ohm:Q"),
+            tooltip=[
+                "participant:N",
+                "flow_rate:O",
+                alt.Tooltip("polarisation_resistance/Ohm:Q", title="Polarisation resistance / Ω", format=".4f"),
+            ],
+        )
+    )
+
+    resistance_contributions_plot = (
+        alt.layer(_bars, _total, data=resistance_contributions_df)
+        .properties(
+            width=200,
+            height=300,
+        )
+        .facet(column=alt.Column("flow_rate:O", title="Flow Rate (mL min⁻¹)"))
+        .properties(
+            title=alt.TitleParams(
+                text="Figure 18. Contributions to the polarisation resistance",
+                subtitle=[
+                    "Mean ohmic, charge-transfer and mass-transport resistance per participant and flow rate. The black tick marks the polarisation resistance (sum of the contributions).",
+                    "Negative contributions (dashed outline) are stacked below zero, so the bar above zero exceeds the polarisation resistance by their magnitude.",
+                ],
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+        )
+    )
+    return resistance_contributions_plot, resistance_negative_contributions_df
+
+
 @app.cell
 def section_polarisation(polarisation_filtered_df):
     # display section content
@@ -1830,7 +2774,12 @@ def section_polarisation(polarisation_filtered_df):
 
 
 @app.cell
-def _(polarisation_plots, polarisation_voltage_current_plots):
+def _(
+    polarisation_detail_plot,
+    polarisation_overview_chart,
+    polarisation_plots,
+    polarisation_voltage_current_plots,
+):
     mo.vstack(
         [
             mo.md("### Current-overvoltage curves"),
@@ -1840,7 +2789,13 @@ def _(polarisation_plots, polarisation_voltage_current_plots):
             mo.md("<br>"),
             mo.lazy(polarisation_plots, show_loading_indicator=True),
             mo.lazy(polarisation_voltage_current_plots, show_loading_indicator=True),
-
+            mo.md("<br>"),
+            mo.md("### Time-voltage curves at full resolution"),
+            mo.md("""
+                The plot above is downsampled to keep it responsive. To inspect the raw data, select a time window in the overview below by dragging over it: the selected window is queried again from the full-resolution data and reduced to at most one minimum and maximum voltage per pixel, so narrow windows show every recorded data point.
+            """),
+            polarisation_overview_chart,
+            mo.lazy(polarisation_detail_plot, show_loading_indicator=True),
         ]
     )
     return
@@ -1850,13 +2805,12 @@ def _(polarisation_plots, polarisation_voltage_current_plots):
 def _(
     polarisation_resistance_per_participant_plot,
     polarisation_resistance_per_repetition_plot,
-    step_evaluation_tail_length,
 ):
     mo.vstack(
         [
             mo.md("### Polarisation resistance comparison"),
-            mo.md(f"""
-                These plots compare the extracted polarisation resistance values across participants and repititions. The polarisation resistance was calculated from the voltage and current values of the polarisation steps by first collecting the median voltage _versus_ median current of the last {step_evaluation_tail_length} points of each polarisation step. Subsequently, a linear regression was performed over the collected data. The first plot shows the mean polarisation resistance values for each participant with error bars representing the standard deviation across all selected repetitions. The second plot shows the mean polarisation resistance values for each repetition with error bars representing the standard deviation across all selected participants. You can use these plots to identify trends or differences in polarisation resistance values between participants and repetitions.
+            mo.md("""
+                These plots compare the extracted polarisation resistance values across participants and repititions. The polarisation resistance was calculated from the voltage and current values of the polarisation steps by first collecting the median voltage _versus_ median current of the steady-state plateau of each polarisation step. The plateau is the final part of a step in which the voltage stays within a band of a few times its noise level (at least 1 mV); steps that do not settle within their last 10 % are evaluated over this last 10 %. Subsequently, a linear regression was performed over the collected data. The first plot shows the mean polarisation resistance values for each participant with error bars representing the standard deviation across all selected repetitions. The second plot shows the mean polarisation resistance values for each repetition with error bars representing the standard deviation across all selected participants. You can use these plots to identify trends or differences in polarisation resistance values between participants and repetitions.
             """),
             mo.md("<br>"),
             mo.lazy(
@@ -1876,6 +2830,32 @@ def _(
     return
 
 
+@app.cell
+def _(resistance_contributions_plot, resistance_negative_contributions_df):
+    mo.vstack(
+        [
+            mo.md("### Contributions to the polarisation resistance"),
+            mo.md("""
+                To separate the loss mechanisms, the ohmic series resistance (ESR) of the last impedance spectrum of each experiment was joined to its polarisation steps. The polarisation resistance is the same slope of the step voltage over the step current as in Figures 6 and 7; subtracting the iR drop from the step voltages gives the iR-free polarisation resistance (i.e., the polarisation resistance minus the ESR). Experiments without impedance spectrum are not split. Its charge-transfer part is estimated from the impedance spectrum as the difference between the real part at the lowest frequency and the ESR; the remainder is attributed to mass transport, which only becomes visible under DC load and therefore depends strongly on the flow rate.
+            """),
+            mo.md("<br>"),
+            mo.lazy(resistance_contributions_plot, show_loading_indicator=True),
+            mo.vstack(
+                [
+                    mo.md(f"""
+                        **Note:** {resistance_negative_contributions_df.height} of the selected experiments have a negative contribution (dashed outline in Figure 18). The charge-transfer resistance from the impedance spectrum exceeds the iR-free polarisation resistance (or another contribution is negative), so the split of these experiments is not physical. Their contributions are kept as measured, so that they still add up to the polarisation resistance, and are included in the means above.
+                    """),
+                    resistance_negative_contributions_df,
+                ]
+            )
+            if not resistance_negative_contributions_df.is_empty()
+            else mo.md(""),
+            mo.md("<br>"),
+        ]
+    )
+    return
+
+
 @app.cell
 def _(
     cd_cycling_flat_df,
@@ -1901,10 +2881,10 @@ def _(
 
 
 @app.cell
-def _(cd_cycling_filtered_df):
+def _(cd_cycling_dqdv_index_df, cd_cycling_filtered_df):
     # CHARGE-DISCHARGE CYCLING EVALUATION
     # STEP 2a: Prepare dataframes for the voltage-capacity as well as voltage-dQ/dV curves from the charge-discharge cycling data
-    # NOTE: capacity/mAh and dQ/dV are precomputed in precompute.py
+    # NOTE: capacity/mAh is precomputed in precompute.py, dQ/dV per half cycle on a uniform voltage grid (see build_cd_cycling_dqdv_df)
 
     _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
     df_filtered_cd_cycling_data = cd_cycling_filtered_df.select(
@@ -1915,46 +2895,30 @@ def _(cd_cycling_filtered_df):
             "voltage/V",
             "current/mA",
             "capacity/mAh",
-            "dQ/dV",
         ]
     )
 
-    # downsample the data for better performance in the plot
-    # bin voltage to every 10 mV per half cycle and keep only keep median values within each voltage bin 
-    # to preserve the overall curve shape while reducing the number of points
-    df_filtered_cd_cycling_chart_data = (
-        df_filtered_cd_cycling_data.with_columns(
-            (pl.col("voltage/V") / 0.01).round().alias("voltage_bin"),
-        ).group_by(
-            *_meta_cols,
-            "half cycle",
-            "voltage_bin",
-        ).agg(
-            pl.col("voltage/V").median().alias("voltage/V"),
-            pl.col("current/mA").median().alias("current/mA"),
-            pl.col("capacity/mAh").median().alias("capacity/mAh"),
-            pl.col("dQ/dV").median().alias("dQ/dV"),
-        ).sort(
-            [
-                *_meta_cols,
-                "half cycle",
-                "voltage_bin",
-            ]
-        ).drop("voltage_bin")
+    # the voltage grid (5 mV) of the precomputed dQ/dV curves already reduces the number of points
+    # while preserving the overall curve shape; the curves are sorted by experiment and half cycle,
+    # so only the row ranges of the selected experiments are kept here and sliced for the chart
+    df_filtered_cd_cycling_chart_index = cd_cycling_dqdv_index_df.join(
+        cd_cycling_filtered_df.select(_meta_cols).unique(),
+        on=_meta_cols,
+        how="semi",
     )
 
     # create a ui slider to chose the half-cycle to display
     # (removed stray mo.ui.slider(start=1, stop=10, step=1))
     slider_half_cycle = mo.ui.slider(
         label="",
-        start=int(df_filtered_cd_cycling_chart_data["half cycle"].min() / 2),
-        stop=int(df_filtered_cd_cycling_chart_data["half cycle"].max() / 2),
+        start=int(df_filtered_cd_cycling_chart_index["half cycle"].min() / 2),
+        stop=int(df_filtered_cd_cycling_chart_index["half cycle"].max() / 2),
         step=1,
         full_width=True,
         show_value=True,
     )
     return (
-        df_filtered_cd_cycling_chart_data,
+        df_filtered_cd_cycling_chart_index,
         df_filtered_cd_cycling_data,
         slider_half_cycle,
     )
@@ -1962,7 +2926,8 @@ def _(cd_cycling_filtered_df):
 
 @app.cell
 def _(
-    df_filtered_cd_cycling_chart_data,
+    cd_cycling_dqdv_df,
+    df_filtered_cd_cycling_chart_index,
     slider_half_cycle,
     wheel_zoom_x,
     wheel_zoom_xy,
@@ -1975,10 +2940,17 @@ def _(
     _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
     _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
 
-    # filter the data for the selected cycle (i.e., half cycle) 
-    _cd_cycling_capacity_voltage_data = df_filtered_cd_cycling_chart_data.filter(
+    # slice the rows of the selected cycle (i.e., half cycle) from the precomputed curves
+    _selected_half_cycles = df_filtered_cd_cycling_chart_index.filter(
         (pl.col("half cycle") == slider_half_cycle.value)
         | (pl.col("half cycle") == slider_half_cycle.value + 1)
+    )
+    mo.stop(_selected_half_cycles.is_empty())
+    _cd_cycling_capacity_voltage_data = pl.concat(
+        [
+            cd_cycling_dqdv_df.slice(_offset, _length)
+            for _offset, _length in _selected_half_cycles.select("offset", "length").iter_rows()
+        ]
     ).with_columns(
         pl.col("capacity/mAh").abs().alias("capacity/mAh"),
     )
@@ -1986,7 +2958,7 @@ def _(
     # compute per-axis data ranges, then build domains with some padding
     _all_voltage = _cd_cycling_capacity_voltage_data["voltage/V"]
     _voltage_domain = [_all_voltage.min(), _all_voltage.max()]
-    _dqdv_domain = [0, df_filtered_cd_cycling_chart_data["dQ/dV"].max()]
+    _dqdv_domain = [0, df_filtered_cd_cycling_chart_index["dQ/dV_max"].max()]
 
     # build a plot of voltage vs. capacity for the selected cycle
     cd_cycling_capacity_voltage = (
@@ -2077,7 +3049,203 @@ def _(
 
 
 @app.cell
-def _(df_filtered_cd_cycling_data, get_linregress_params):
+def _(cd_cycling_dvdq_df, cd_cycling_filtered_df):
+    # CHARGE-DISCHARGE CYCLING EVALUATION
+    # STEP 2c: Prepare the differential voltage (dV/dQ) curves of the charge-discharge cycling data
+    # NOTE: dV/dQ is precomputed per half cycle on a uniform capacity grid in precompute.py (see build_cd_cycling_dvdq_df)
+
+    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+    df_filtered_cd_cycling_dvdq_data = cd_cycling_dvdq_df.join(
+        cd_cycling_filtered_df.select(_meta_cols).unique(),
+        on=_meta_cols,
+        how="semi",
+    ).with_columns(
+        pl.when(pl.col("capacity/mAh") > 0)
+        .then(pl.lit("Charge"))
+        .otherwise(pl.lit("Discharge"))
+        .alias("step"),
+        pl.col("capacity/mAh").abs().alias("capacity/mAh"),
+    )
+
+    # create a ui range slider to chose the cycles to overlay
+    _first_cycle = int(df_filtered_cd_cycling_dvdq_data["cycle"].min())
+    _last_cycle = int(df_filtered_cd_cycling_dvdq_data["cycle"].max())
+    slider_dvdq_cycles = mo.ui.range_slider(
+        label="",
+        start=_first_cycle,
+        stop=_last_cycle,
+        step=1,
+        value=[_first_cycle, min(_first_cycle + 9, _last_cycle)],
+        full_width=True,
+        show_value=True,
+    )
+    return df_filtered_cd_cycling_dvdq_data, slider_dvdq_cycles
+
+
+@app.cell
+def _(
+    df_filtered_cd_cycling_dvdq_data,
+    slider_dvdq_cycles,
+    wheel_zoom_x,
+    wheel_zoom_xy,
+    wheel_zoom_y,
+):
+    # CHARGE-DISCHARGE CYCLING EVALUATION
+    # STEP 2d: Build the dV/dQ overlay of the selected cycles
+
+    # create selectors and bind them to the legend
+    _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
+
+    # filter the data for the selected range of cycles
+    _cd_cycling_dvdq_data = df_filtered_cd_cycling_dvdq_data.filter(
+        pl.col("cycle").is_between(*slider_dvdq_cycles.value)
+        & pl.col("dV/dQ").is_not_null()
+    )
+
+    # dV/dQ diverges at the end of each half cycle, so the y axis is limited to the bulk of the curves
+    _dvdq_domain = [0, df_filtered_cd_cycling_dvdq_data["dV/dQ"].quantile(0.98)]
+
+    cd_cycling_dvdq_chart = (
+        alt.Chart(_cd_cycling_dvdq_data)
+        .mark_line(clip=True)
+        .encode(
+            x=alt.X("capacity/mAh:Q", title="Capacity / mAh"),
+            y=alt.Y("dV/dQ:Q", title="dV/dQ / mV/mAh", scale=alt.Scale(domain=_dvdq_domain)),
+            color=alt.Color("cycle:Q", title="Cycle", scale=alt.Scale(scheme="viridis")),
+            strokeDash=alt.StrokeDash("repetition:N", title="Repetition"),
+            detail=["participant:N", "half cycle:Q"],
+            opacity=alt.condition(
+                _repetition_selection,
+                alt.value(1.0),
+                alt.value(0.0),
+            ),
+            tooltip=[
+                "participant:N",
+                "repetition:O",
+                "flow_rate:Q",
+                alt.Tooltip("cycle:Q", format=".0f"),
+                alt.Tooltip("capacity/mAh:Q", format=".1f"),
+                alt.Tooltip("voltage/V:Q", format=".4f"),
+                alt.Tooltip("dV/dQ:Q", format=".3f"),
+            ],
+        )
+        .properties(
+            width=450,
+            height=300,
+        )
+        .interactive()
+        .add_params(_repetition_selection)
+        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y)
+        .facet(column=alt.Column("step:N", title=None))
+        .properties(
+            title=alt.TitleParams(
+                text="Figure 20. Differential voltage (dV/dQ) curves of the selected cycles.",
+                subtitle="Charge (left) and discharge (right) half cycles on a uniform capacity grid, colored by cycle number.",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+        )
+    )
+    return (cd_cycling_dvdq_chart,)
+
+
+@app.cell
+def _(cd_cycling_curves_df, cd_cycling_filtered_df):
+    # CHARGE-DISCHARGE CYCLING EVALUATION
+    # STEP 2e: Prepare the resampled voltage-capacity curves for the overlay of every n-th cycle
+    # NOTE: each half cycle is precomputed as fixed-size arrays of 64 points in precompute.py (see build_cd_cycling_curves_df)
+
+    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+    df_filtered_cd_cycling_curves_data = cd_cycling_curves_df.join(
+        cd_cycling_filtered_df.select(_meta_cols).unique(),
+        on=_meta_cols,
+        how="semi",
+    )
+
+    # create ui elements to switch to the overlay and to chose every n-th cycle
+    switch_cycle_overlay = mo.ui.switch(label="Overlay every n-th cycle")
+    slider_overlay_cycle_step = mo.ui.slider(
+        label="",
+        start=1,
+        stop=max(int(df_filtered_cd_cycling_curves_data["cycle"].max()), 1),
+        step=1,
+        value=min(5, max(int(df_filtered_cd_cycling_curves_data["cycle"].max()), 1)),
+        full_width=True,
+        show_value=True,
+    )
+    return (
+        df_filtered_cd_cycling_curves_data,
+        slider_overlay_cycle_step,
+        switch_cycle_overlay,
+    )
+
+
+@app.cell
+def _(
+    df_filtered_cd_cycling_curves_data,
+    slider_overlay_cycle_step,
+    wheel_zoom_x,
+    wheel_zoom_xy,
+    wheel_zoom_y,
+):
+    # CHARGE-DISCHARGE CYCLING EVALUATION
+    # STEP 2f: Build the voltage-capacity overlay of every n-th cycle
+
+    # create selectors and bind them to the legend
+    _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
+
+    # keep every n-th cycle and unpack the curve arrays into one row per point
+    _cd_cycling_overlay_data = (
+        df_filtered_cd_cycling_curves_data.filter(pl.col("cycle") % slider_overlay_cycle_step.value == 0)
+        .explode(["capacity/mAh", "voltage/V"])
+        .with_columns(
+            pl.col("capacity/mAh").abs().alias("capacity/mAh"),
+        )
+    )
+
+    cd_cycling_overlay_chart = (
+        alt.Chart(_cd_cycling_overlay_data)
+        .mark_line()
+        .encode(
+            x=alt.X("capacity/mAh:Q", title="Capacity / mAh"),
+            y=alt.Y("voltage/V:Q", title="Voltage / V"),
+            color=alt.Color("cycle:Q", title="Cycle", scale=alt.Scale(scheme="viridis")),
+            strokeDash=alt.StrokeDash("repetition:N", title="Repetition"),
+            detail=["participant:N", "half cycle:Q"],
+            opacity=alt.condition(
+                _repetition_selection,
+                alt.value(1.0),
+                alt.value(0.0),
+            ),
+            tooltip=[
+                "participant:N",
+                "repetition:O",
+                "flow_rate:Q",
+                alt.Tooltip("cycle:Q", format=".0f"),
+                alt.Tooltip("capacity/mAh:Q", format=".1f"),
+                alt.Tooltip("voltage/V:Q", format=".4f"),
+            ],
+        )
+        .properties(
+            width=720,
+            title=alt.TitleParams(
+                text="Figure 21. Voltage-capacity curves of every n-th cycle",
+                subtitle="Charge and discharge curves resampled to 64 points each, colored by cycle number.",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+        )
+        .interactive()
+        .add_params(_repetition_selection)
+        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y)
+    )
+    return (cd_cycling_overlay_chart,)
+
+
+@app.cell
+def _(df_filtered_cd_cycling_data, get_linregress_exprs):
     # CHARGE-DISCHARGE CYCLING EVALUATION
     # STEP 3a: Aggregate the capacity data for each cycle as charge and discharge capacity and compute the coulombic efficiency
 
@@ -2168,88 +3336,62 @@ def _(df_filtered_cd_cycling_data, get_linregress_params):
         pl.col("discharge_capacity/mAh").first().alias("capacity/mAh"),
     )
 
-    # compute the capacity fade relative to the initial discharge capacity for each group by performing a group mapping of get_linregress_params over the capacity-time data and extracting the slope of the linear regression as capacity fade rate
-    cd_cycling_filtered_capacity_fade_time = (
+    # compute the capacity fade relative to the initial discharge capacity for each group in a single grouped pass:
+    # linear regressions of the capacity retention over time and over cycles, plus separate fits of the cycles
+    # up to and after the median cycle of each group to tell the early from the late capacity fade
+    _cycle = pl.col("cycle").cast(pl.Float64)
+    _retention = pl.col("capacity_retention/%")
+    _early = pl.col("cycle") <= pl.col("cycle").median()
+    cd_cycling_filtered_capacity_fade = (
         cd_cycling_filtered_cycle_data.group_by(
             "study_phase",
             "participant",
             "repetition",
             "flow_rate",
         )
-        .map_groups(
-            lambda df: get_linregress_params(
-                df=df,
-                x_name="time/h",
-                y_name="capacity_retention/%",
-                with_columns=[
-                    "study_phase",
-                    "participant",
-                    "repetition",
-                    "flow_rate",
-                    "time/h",
-                    "cycle",
-                    "capacity_retention/%",
-                ],
-            )
-        )
-        .sort(
-            ["study_phase", "participant", "repetition", "flow_rate", "time/h", "cycle"]
+        .agg(
+            *get_linregress_exprs(pl.col("time/h"), _retention, "time"),
+            *get_linregress_exprs(_cycle, _retention, "cycle"),
+            *get_linregress_exprs(_cycle.filter(_early), _retention.filter(_early), "early"),
+            *get_linregress_exprs(_cycle.filter(~_early), _retention.filter(~_early), "late"),
         )
         .with_columns(
-            (pl.col("slope") * 24).alias("capacity_fade_rate/%/d"),
-        )
-        .select(
-            [
-                "study_phase",
-                "participant",
-                "repetition",
-                "flow_rate",
-                "capacity_fade_rate/%/d",
-            ]
+            (pl.col("time_slope") * 24).alias("capacity_fade_rate/%/d"),
+            (pl.col("time_stderr") * 24).alias("capacity_fade_rate_stderr/%/d"),
+            pl.col("time_r2").alias("capacity_fade_time_r2"),
+            pl.col("cycle_slope").alias("capacity_fade_rate/cycle"),
+            pl.col("cycle_stderr").alias("capacity_fade_rate_stderr/cycle"),
+            pl.col("cycle_r2").alias("capacity_fade_cycle_r2"),
+            pl.col("early_slope").alias("early_capacity_fade_rate/cycle"),
+            pl.col("late_slope").alias("late_capacity_fade_rate/cycle"),
         )
         .sort(["study_phase", "participant", "repetition", "flow_rate"])
     )
 
-    # compute the capacity fade relative to the initial discharge capacity for each group by performing a group mapping of get_linregress_params over the capacity-cycle data and extracting the slope of the linear regression as capacity fade rate
-    cd_cycling_filtered_capacity_fade_cycle = (
-        cd_cycling_filtered_cycle_data.group_by(
+    # capacity fade rates over time and over cycles for each group
+    cd_cycling_filtered_capacity_fade_time = cd_cycling_filtered_capacity_fade.select(
+        [
             "study_phase",
             "participant",
             "repetition",
             "flow_rate",
-        )
-        .map_groups(
-            lambda df: get_linregress_params(
-                df=df,
-                x_name="cycle",
-                y_name="capacity_retention/%",
-                with_columns=[
-                    "study_phase",
-                    "participant",
-                    "repetition",
-                    "flow_rate",
-                    "time/h",
-                    "cycle",
-                    "capacity_retention/%",
-                ],
-            )
-        )
-        .sort(
-            ["study_phase", "participant", "repetition", "flow_rate", "time/h", "cycle"]
-        )
-        .with_columns(
-            (pl.col("slope")).alias("capacity_fade_rate/cycle"),
-        )
-        .select(
-            [
-                "study_phase",
-                "participant",
-                "repetition",
-                "flow_rate",
-                "capacity_fade_rate/cycle",
-            ]
-        )
-        .sort(["study_phase", "participant", "repetition", "flow_rate"])
+            "capacity_fade_rate/%/d",
+            "capacity_fade_rate_stderr/%/d",
+            "capacity_fade_time_r2",
+        ]
+    )
+    cd_cycling_filtered_capacity_fade_cycle = cd_cycling_filtered_capacity_fade.select(
+        [
+            "study_phase",
+            "participant",
+            "repetition",
+            "flow_rate",
+            "capacity_fade_rate/cycle",
+            "capacity_fade_rate_stderr/cycle",
+            "capacity_fade_cycle_r2",
+            "early_capacity_fade_rate/cycle",
+            "late_capacity_fade_rate/cycle",
+        ]
     )
     return (
         cd_cycling_filtered_capacity_fade_cycle,
@@ -2334,6 +3476,10 @@ def _(
                 "repetition:O",
                 "flow_rate:Q",
                 alt.Tooltip("capacity_fade_rate/cycle:Q", format=".4f"),
+                alt.Tooltip("capacity_fade_rate_stderr/cycle:Q", format=".4f"),
+                alt.Tooltip("capacity_fade_cycle_r2:Q", format=".3f"),
+                alt.Tooltip("early_capacity_fade_rate/cycle:Q", format=".4f"),
+                alt.Tooltip("late_capacity_fade_rate/cycle:Q", format=".4f"),
             ],
         )
         .properties(
@@ -2358,11 +3504,110 @@ def _(
                 offset=20,
             ),
         )
-        .interactive()
-        .add_params(_participant_selection, _repetition_selection)
-        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y)
+        .interactive()
+        .add_params(_participant_selection, _repetition_selection)
+        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y)
+    )
+    return (cd_cycling_capacity_cycle_chart,)
+
+
+@app.cell
+def _(
+    cd_cycling_cycle_df,
+    cd_cycling_filtered_cycle_data,
+    wheel_zoom_x,
+    wheel_zoom_xy,
+    wheel_zoom_y,
+):
+    # CHARGE-DISCHARGE CYCLING EVALUATION
+    # STEP 3d: Build the round-trip energy loss and mean overpotential curves for the charge-discharge cycling data
+    # NOTE: energies and mean voltages are integrated per half cycle in precompute.py (see build_cd_cycling_cycle_df)
+
+    # keep the same (valid) cycles as in the capacity retention plots
+    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+    cd_cycling_energy_loss_data = cd_cycling_cycle_df.join(
+        cd_cycling_filtered_cycle_data.select([*_meta_cols, "cycle"]),
+        on=[*_meta_cols, "cycle"],
+        how="semi",
+    ).select(
+        [
+            *_meta_cols,
+            "cycle",
+            "mean_charge_voltage/V",
+            "mean_discharge_voltage/V",
+            "coulombic_efficiency/%",
+            "energy_loss/mWh",
+            pl.col("mean_overpotential/V").mul(1000).alias("mean_overpotential/mV"),
+        ]
+    )
+
+    # create selectors and bind them to the legend
+    _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
+    _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
+
+    # one panel per quantity with an independent y scale
+    _energy_loss_long_data = cd_cycling_energy_loss_data.unpivot(
+        on=["energy_loss/mWh", "mean_overpotential/mV"],
+        index=[
+            *_meta_cols,
+            "cycle",
+            "mean_charge_voltage/V",
+            "mean_discharge_voltage/V",
+            "coulombic_efficiency/%",
+        ],
+        variable_name="quantity",
+        value_name="value",
+    ).with_columns(
+        pl.col("quantity").replace(
+            {"energy_loss/mWh": "Energy Loss / mWh", "mean_overpotential/mV": "Mean Overpotential / mV"}
+        )
+    )
+
+    cd_cycling_energy_loss_chart = (
+        alt.Chart(_energy_loss_long_data)
+        .mark_point()
+        .encode(
+            x=alt.X("cycle:Q", title="Cycle"),
+            y=alt.Y("value:Q", title=None, scale=alt.Scale(zero=False)),
+            color=alt.Color("participant:N", title="Participant"),
+            shape=alt.Shape("repetition:N", title="Repetition"),
+            opacity=alt.condition(
+                _participant_selection & _repetition_selection,
+                alt.value(1.0),
+                alt.value(0.0),
+            ),
+            tooltip=[
+                "participant:N",
+                "repetition:O",
+                "flow_rate:Q",
+                alt.Tooltip("cycle:Q", format=".0f"),
+                alt.Tooltip("mean_charge_voltage/V:Q", format=".4f"),
+                alt.Tooltip("mean_discharge_voltage/V:Q", format=".4f"),
+                alt.Tooltip("coulombic_efficiency/%:Q", format=".2f"),
+                alt.Tooltip("quantity:N"),
+                alt.Tooltip("value:Q", format=".2f"),
+            ],
+        )
+        .properties(
+            width=350,
+            height=300,
+        )
+        .interactive()
+        .add_params(_participant_selection, _repetition_selection)
+        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y)
+        .facet(column=alt.Column("quantity:N", title=None, sort=["Energy Loss / mWh", "Mean Overpotential / mV"]))
+        .resolve_scale(y="independent")
+        .properties(
+            title=alt.TitleParams(
+                text="Figure 19. Round-trip energy loss (left) and mean overpotential (right) over cycle.",
+                subtitle="Sum of the signed integrals of the voltage over the capacity of the charge and discharge half cycle, and the same divided by the charge passed in both half cycles.",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+        )
     )
-    return (cd_cycling_capacity_cycle_chart,)
+    return (cd_cycling_energy_loss_chart,)
 
 
 @app.cell
@@ -2438,6 +3683,8 @@ def _(
                 "repetition:O",
                 "flow_rate:Q",
                 alt.Tooltip("capacity_fade_rate/%/d:Q", format=".4f"),
+                alt.Tooltip("capacity_fade_rate_stderr/%/d:Q", format=".4f"),
+                alt.Tooltip("capacity_fade_time_r2:Q", format=".3f"),
             ],
         )
         .properties(
@@ -2597,14 +3844,29 @@ def section_charge_discharge_cycling(cd_cycling_filtered_df):
 
 
 @app.cell
-def _(cd_cycling_charts, slider_half_cycle):
+def _(
+    cd_cycling_charts,
+    cd_cycling_overlay_chart,
+    slider_half_cycle,
+    slider_overlay_cycle_step,
+    switch_cycle_overlay,
+):
     mo.vstack(
         [
             mo.md("### Voltage-capacity data"),
             mo.md("""
-                These plots show the relationship between the voltage and the capacity for each selected file. The shape of the curves can provide insights into the electrochemical processes occurring in the system, such as the presence of different plateaus corresponding to different electrochemical reactions, changes in internal resistance, and capacity fade over cycles. You can compare the curves across different participants and repetitions to identify trends or differences in the charge-discharge behavior. Use the slider to select the cycle to display.
+                These plots show the relationship between the voltage and the capacity for each selected file. The shape of the curves can provide insights into the electrochemical processes occurring in the system, such as the presence of different plateaus corresponding to different electrochemical reactions, changes in internal resistance, and capacity fade over cycles. You can compare the curves across different participants and repetitions to identify trends or differences in the charge-discharge behavior. Use the slider to select the cycle to display, or switch to the overlay to compare every n-th cycle at once.
             """),
+            switch_cycle_overlay,
             mo.vstack(
+                [
+                    mo.md("**Show every n-th cycle:**"),
+                    slider_overlay_cycle_step,
+                    cd_cycling_overlay_chart,
+                ]
+            )
+            if switch_cycle_overlay.value
+            else mo.vstack(
                 [
                     mo.md("**Select cycle:**"),
                     slider_half_cycle,
@@ -2616,6 +3878,26 @@ def _(cd_cycling_charts, slider_half_cycle):
     return
 
 
+@app.cell
+def _(cd_cycling_dvdq_chart, slider_dvdq_cycles):
+    mo.vstack(
+        [
+            mo.md("### Differential voltage analysis"),
+            mo.md("""
+                The differential voltage (dV/dQ) was computed for every half cycle on a uniform capacity grid (5 mAh), using a Savitzky-Golay filter to differentiate the voltage. Peaks of dV/dQ mark transitions between voltage plateaus, and their positions on the capacity axis shift towards lower capacities as the accessible capacity fades. Overlaying several cycles therefore shows which part of the capacity is lost over time. Use the slider to select the range of cycles to overlay.
+            """),
+            mo.vstack(
+                [
+                    mo.md("**Select cycles:**"),
+                    slider_dvdq_cycles,
+                    mo.lazy(cd_cycling_dvdq_chart, show_loading_indicator=True),
+                ]
+            ),
+        ]
+    )
+    return
+
+
 @app.cell
 def _(
     cd_cycling_capacity_participant,
@@ -2650,7 +3932,7 @@ def _(cd_cycling_capacity_cycle_chart, cd_cycling_capacity_time_chart):
         [
             mo.md("### Capacity fade"),
             mo.md("""
-                These plots show the capacity retention over cycles and time for each selected file. The first plot shows the capacity at the end of each half cycle (i.e., after each charge and discharge step, respectively) over the cycle number, while the second plot shows the capacity over time. You can use these plots to analyze the capacity fade behavior of the system and identify trends or differences between participants and repetitions.
+                These plots show the capacity retention over cycles and time for each selected file. The first plot shows the capacity at the end of each half cycle (i.e., after each charge and discharge step, respectively) over the cycle number, while the second plot shows the capacity over time. You can use these plots to analyze the capacity fade behavior of the system and identify trends or differences between participants and repetitions. The tooltips of the fade rates also show the standard error and R² of the linear fits as well as separate fade rates for the first and the second half of the cycles, which tell an initial capacity drop from a steady long-term fade.
             """),
             mo.md("<br>"),
             mo.lazy(cd_cycling_capacity_cycle_chart, show_loading_indicator=True),
@@ -2662,5 +3944,493 @@ def _(cd_cycling_capacity_cycle_chart, cd_cycling_capacity_time_chart):
     return
 
 
+@app.cell
+def _(cd_cycling_energy_loss_chart):
+    mo.vstack(
+        [
+            mo.md("### Round-trip energy loss"),
+            mo.md("""
+                The energy of each half cycle was obtained by trapezoidal integration of the cell voltage over the capacity (equivalent to the integral of voltage times current over time). As the cells of this study are compositionally symmetric, the cell voltage crosses 0 V within every half cycle, so these integrals mainly reflect the overpotentials, and voltage or energy efficiencies (ratios of them) are not meaningful. Instead, the signed integrals of the charge and the following discharge are added to the round-trip energy loss of the cycle; divided by the charge passed in both half cycles, it gives the mean overpotential (half the difference between the mean charge and discharge voltage for equal capacities). Incomplete half cycles (e.g., the first charge from the rest state or an aborted last half cycle) are excluded, so each cycle consists of a complete charge followed by a complete discharge.
+            """),
+            mo.md("<br>"),
+            mo.lazy(cd_cycling_energy_loss_chart, show_loading_indicator=True),
+            mo.md("<br>"),
+        ]
+    )
+    return
+
+
+@app.cell
+def _(cd_cycling_sweep_df, dqdv_sweep_df, polarisation_sweep_df):
+    # SENSITIVITY ANALYSIS
+    # STEP 1: Create sliders for the evaluation parameters (values as evaluated in precompute.py)
+
+    def _sweep_slider(df: pl.DataFrame, column: str, default: float, label: str):
+        _steps = df[column].unique().sort().to_list()
+        return mo.ui.slider(
+            steps=_steps,
+            value=default if default in _steps else _steps[0],
+            label=label,
+            full_width=True,
+            show_value=True,
+        )
+
+    sweep_plateau_tolerance_slider = _sweep_slider(
+        polarisation_sweep_df, "plateau_voltage_tolerance/mV", 1.0, "Minimum polarisation plateau band (± mV)"
+    )
+    sweep_plateau_noise_slider = _sweep_slider(
+        polarisation_sweep_df, "plateau_noise_factor", 4.0, "Polarisation plateau band (± multiples of the voltage noise)"
+    )
+    sweep_plateau_fraction_slider = _sweep_slider(
+        polarisation_sweep_df, "plateau_min_fraction", 0.1, "Minimum polarisation plateau duration (fraction of step duration)"
+    )
+    sweep_rest_current_slider = _sweep_slider(
+        polarisation_sweep_df, "rest_current_tolerance/mA", 1.0, "Rest current tolerance (± mA)"
+    )
+    sweep_ce_lower_slider = _sweep_slider(
+        cd_cycling_sweep_df, "ce_lower_limit/%", 60, "Lower coulombic efficiency limit (%)"
+    )
+    sweep_ce_upper_slider = _sweep_slider(
+        cd_cycling_sweep_df, "ce_upper_limit/%", 140, "Upper coulombic efficiency limit (%)"
+    )
+    sweep_dqdv_window_slider = _sweep_slider(
+        dqdv_sweep_df, "dqdv_window", 11, "dQ/dV Savitzky-Golay window (grid points)"
+    )
+    return (
+        sweep_ce_lower_slider,
+        sweep_ce_upper_slider,
+        sweep_dqdv_window_slider,
+        sweep_plateau_fraction_slider,
+        sweep_plateau_noise_slider,
+        sweep_plateau_tolerance_slider,
+        sweep_rest_current_slider,
+    )
+
+
+@app.cell
+def _(
+    cd_cycling_sweep_df,
+    dqdv_sweep_df,
+    flow_rate_selector,
+    participant_selector,
+    polarisation_sweep_df,
+    repetition_selector,
+    study_phase_selector,
+    sweep_ce_lower_slider,
+    sweep_ce_upper_slider,
+    sweep_dqdv_window_slider,
+    sweep_plateau_fraction_slider,
+    sweep_plateau_noise_slider,
+    sweep_plateau_tolerance_slider,
+    sweep_rest_current_slider,
+):
+    # SENSITIVITY ANALYSIS
+    # STEP 2: Look up the headline metrics for the selected and the default parameters in the precomputed result cubes
+
+    _meta_cols = ["study_phase", "participant", "repetition", "flow_rate"]
+
+    # metrics per result cube and the parameter columns that select a slice of it
+    _cubes = [
+        (
+            polarisation_sweep_df,
+            {
+                "plateau_voltage_tolerance/mV": (sweep_plateau_tolerance_slider.value, 1.0),
+                "plateau_noise_factor": (sweep_plateau_noise_slider.value, 4.0),
+                "plateau_min_fraction": (sweep_plateau_fraction_slider.value, 0.1),
+                "rest_current_tolerance/mA": (sweep_rest_current_slider.value, 1.0),
+            },
+            ["polarisation_resistance/Ohm"],
+        ),
+        (
+            cd_cycling_sweep_df,
+            {"ce_lower_limit/%": (sweep_ce_lower_slider.value, 60), "ce_upper_limit/%": (sweep_ce_upper_slider.value, 140)},
+            ["initial_discharge_capacity/mAh", "mean_coulombic_efficiency/%", "capacity_fade_rate/%/cycle", "capacity_fade_rate/%/d"],
+        ),
+        (
+            dqdv_sweep_df,
+            {"dqdv_window": (sweep_dqdv_window_slider.value, 11)},
+            ["dqdv_peak_voltage_charge/V", "dqdv_peak_voltage_discharge/V"],
+        ),
+    ]
+
+    def _lookup(df: pl.DataFrame, params: dict, metrics: list[str], which: int, name: str) -> pl.DataFrame:
+        return (
+            df.filter(
+                pl.col("study_phase").is_in([study_phase_selector.value])
+                & pl.col("participant").is_in(participant_selector.value)
+                & pl.col("repetition").is_in(repetition_selector.value)
+                & pl.col("flow_rate").is_in(flow_rate_selector.value)
+                & pl.all_horizontal([pl.col(_col) == _values[which] for _col, _values in params.items()])
+            )
+            .unpivot(index=_meta_cols, on=metrics, variable_name="metric", value_name=name)
+        )
+
+    sensitivity_df = (
+        pl.concat(
+            [
+                _lookup(_df, _params, _metrics, 0, "value").join(
+                    _lookup(_df, _params, _metrics, 1, "default_value"),
+                    on=[*_meta_cols, "metric"],
+                    how="left",
+                )
+                for _df, _params, _metrics in _cubes
+            ]
+        )
+        .with_columns(
+            ((pl.col("value") - pl.col("default_value")) / pl.col("default_value").abs() * 100).alias(
+                "deviation/%"
+            )
+        )
+        .sort([*_meta_cols, "metric"])
+    )
+    return (sensitivity_df,)
+
+
+@app.cell
+def _(sensitivity_df, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y):
+    # SENSITIVITY ANALYSIS
+    # STEP 3: Plot the relative deviation of the headline metrics from their values with the default parameters
+
+    # create selectors and bind them to the legend
+    _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
+    _repetition_selection = alt.selection_point(fields=["repetition"], bind="legend")
+
+    sensitivity_plot = (
+        alt.Chart(sensitivity_df)
+        .mark_point(filled=True, size=60)
+        .encode(
+            x=alt.X("metric:N", title=None, axis=alt.Axis(labelAngle=-30)),
+            xOffset=alt.XOffset("participant:N"),
+            y=alt.Y("deviation/%:Q", title="Deviation from default parameters / %"),
+            color=alt.Color("participant:N", title="Participant"),
+            shape=alt.Shape("repetition:N", title="Repetition"),
+            opacity=alt.condition(
+                _participant_selection & _repetition_selection,
+                alt.value(1.0),
+                alt.value(0.05),
+            ),
+            tooltip=[
+                "metric:N",
+                "participant:N",
+                "repetition:O",
+                "flow_rate:O",
+                alt.Tooltip("value:Q", format=".4f"),
+                alt.Tooltip("default_value:Q", format=".4f"),
+                alt.Tooltip("deviation/%:Q", format=".2f"),
+            ],
+        )
+        .properties(
+            title=alt.TitleParams(
+                text="Figure 17. Sensitivity of the headline metrics to the evaluation parameters",
+                subtitle="Relative deviation of each metric per experiment from its value with the default parameters.",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+            width=720,
+            height=300,
+        )
+        .add_params(_participant_selection, _repetition_selection)
+        .interactive()
+        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y)
+    )
+    return (sensitivity_plot,)
+
+
+@app.cell
+def section_sensitivity_analysis(
+    sensitivity_df,
+    sensitivity_plot,
+    sweep_ce_lower_slider,
+    sweep_ce_upper_slider,
+    sweep_dqdv_window_slider,
+    sweep_plateau_fraction_slider,
+    sweep_plateau_noise_slider,
+    sweep_plateau_tolerance_slider,
+    sweep_rest_current_slider,
+):
+    mo.vstack(
+        [
+            mo.md("## Sensitivity of the evaluation parameters"),
+            mo.md("""
+                The evaluations above depend on a few constants: the detection of the steady-state plateau of each polarisation step (the half-width of the voltage band, given by a minimum value or a multiple of the voltage noise, whichever is larger, and the minimum plateau duration below which the final part of the step is used instead), the current below which a step is treated as a rest step, the range of coulombic efficiencies accepted as valid cycles, and the window of the Savitzky-Golay filter used to differentiate the charge on the voltage grid (dQ/dV). All combinations of these parameters were evaluated during precomputation, so the sliders below only look up the results. The plot shows how far each headline metric moves away from its value with the default parameters, i.e. the values shown in the sections above (± 1 mV or ± 4 × voltage noise, 10 % of the step duration, ± 1 mA, 60–140 %, 11 grid points); large deviations indicate results that depend on the choice of the evaluation parameters.
+            """),
+            mo.vstack(
+                [
+                    sweep_plateau_tolerance_slider,
+                    sweep_plateau_noise_slider,
+                    sweep_plateau_fraction_slider,
+                    sweep_rest_current_slider,
+                    sweep_ce_lower_slider,
+                    sweep_ce_upper_slider,
+                    sweep_dqdv_window_slider,
+                ]
+            ),
+            mo.md("<br>"),
+            mo.lazy(sensitivity_plot, show_loading_indicator=True)
+            if not sensitivity_df.is_empty()
+            else mo.md("*No results for the selected experiments and parameters.*"),
+            mo.accordion(
+                {
+                    "Data table": sensitivity_df,
+                },
+                lazy=True,
+            ),
+        ]
+    )
+    return
+
+
+@app.cell
+def _(
+    flow_rate_selector,
+    reproducibility_cells_df,
+    reproducibility_df,
+    study_phase_selector,
+):
+    # REPRODUCIBILITY ANALYSIS
+    # STEP 1: Select the precomputed ISO 5725-2 statistics of the selected study phase and flow rates
+    # NOTE: the statistics are computed over all participants and repetitions in precompute.py (see build_reproducibility_df)
+
+    def _filter_levels(df: pl.DataFrame) -> pl.DataFrame:
+        return df.filter(
+            pl.col("study_phase").is_in([study_phase_selector.value])
+            & pl.col("flow_rate").is_in(flow_rate_selector.value)
+        )
+
+    reproducibility_summary_df = _filter_levels(reproducibility_df).select(
+        [
+            "metric",
+            "study_phase",
+            "flow_rate",
+            "p",
+            "n_total",
+            "mean",
+            "s_r",
+            "s_R",
+            "s_r/%",
+            "s_R/%",
+            "repeatability_limit",
+            "reproducibility_limit",
+            "cochran_C",
+            "cochran_test",
+            "grubbs_G_high",
+            "grubbs_high_test",
+            "grubbs_G_low",
+            "grubbs_low_test",
+        ]
+    )
+    reproducibility_mandel_df = _filter_levels(reproducibility_cells_df)
+    mo.stop(reproducibility_summary_df.is_empty())
+    return reproducibility_mandel_df, reproducibility_summary_df
+
+
+@app.cell
+def _(reproducibility_mandel_df):
+    # REPRODUCIBILITY ANALYSIS
+    # STEP 2: Plot Mandel's between-laboratory (h) and within-laboratory (k) consistency statistics
+
+    # create selectors and bind them to the legend
+    _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
+
+    def _mandel_chart(statistic: str, title: str, figure: str, subtitle: str) -> alt.FacetChart:
+        _bars = (
+            alt.Chart()
+            .mark_bar()
+            .encode(
+                x=alt.X("participant:N", title=None, axis=alt.Axis(labels=False, ticks=False)),
+                y=alt.Y(f"mandel_{statistic}:Q", title=title),
+                color=alt.Color("participant:N", title="Participant"),
+                opacity=alt.condition(_participant_selection, alt.value(1.0), alt.value(0.2)),
+                tooltip=[
+                    "participant:N",
+                    "flow_rate:Q",
+                    "n:Q",
+                    alt.Tooltip("cell_mean:Q", format=".4g"),
+                    alt.Tooltip("cell_std:Q", format=".4g"),
+                    alt.Tooltip(f"mandel_{statistic}:Q", format=".3f"),
+                    alt.Tooltip(f"mandel_{statistic}_test:N"),
+                ],
+            )
+            .add_params(_participant_selection)
+        )
+        # critical values at the 5 % (dashed) and 1 % (solid) significance level;
+        # h is tested two-sided, k only for large within-laboratory scatter
+        _rules = [
+            alt.Chart()
+            .mark_rule(color="black", strokeDash=[4, 4] if _level == "5" else [1, 0])
+            .encode(y=alt.Y(f"mean({_sign}mandel_{statistic}_crit_{_level}):Q"))
+            .transform_calculate(**{f"-mandel_{statistic}_crit_{_level}": f"-datum.mandel_{statistic}_crit_{_level}"})
+            for _level in ["5", "1"]
+            for _sign in (["", "-"] if statistic == "h" else [""])
+        ]
+        return (
+            alt.layer(_bars, *_rules, data=reproducibility_mandel_df)
+            .properties(width=110, height=180)
+            .facet(
+                column=alt.Column("metric:N", title=None),
+                row=alt.Row("flow_rate:O", title="Flow rate / mL min⁻¹"),
+            )
+            .resolve_scale(y="independent")
+            .properties(
+                title=alt.TitleParams(
+                    text=figure,
+                    subtitle=subtitle,
+                    anchor="start",
+                    orient="top",
+                    offset=20,
+                ),
+            )
+        )
+
+    reproducibility_mandel_h_plot = _mandel_chart(
+        "h",
+        "Mandel's h",
+        "Figure 22. Between-laboratory consistency (Mandel's h)",
+        "Deviation of each participant's mean from the mean of all participants; lines: 5 % (dashed) and 1 % (solid) critical values.",
+    )
+    reproducibility_mandel_k_plot = _mandel_chart(
+        "k",
+        "Mandel's k",
+        "Figure 23. Within-laboratory consistency (Mandel's k)",
+        "Repeatability standard deviation of each participant relative to the pooled one; lines: 5 % (dashed) and 1 % (solid) critical values.",
+    )
+    return reproducibility_mandel_h_plot, reproducibility_mandel_k_plot
+
+
+@app.cell
+def section_reproducibility_analysis(
+    reproducibility_mandel_h_plot,
+    reproducibility_mandel_k_plot,
+    reproducibility_summary_df,
+):
+    mo.vstack(
+        [
+            mo.md("## Repeatability and reproducibility"),
+            mo.md("""
+                Following ISO 5725-2, the participants are treated as laboratories and the repetitions as replicate measurements; each combination of metric, study phase and flow rate is evaluated separately. The repeatability standard deviation (s_r) describes the scatter between repetitions of the same participant, the reproducibility standard deviation (s_R) additionally includes the scatter between participants. Two results of the same participant (of different participants) are expected to differ by less than the repeatability (reproducibility) limit of 2.8 s_r (2.8 s_R) with a probability of 95 %. Cochran's test flags participants with an unusually large scatter between their repetitions, Grubbs' test participants whose mean deviates from all others; results above the 5 % critical value are considered stragglers, above the 1 % critical value outliers. The statistics are always computed over all participants and repetitions of the selected study phase and flow rates.
+            """),
+            mo.md("<br>"),
+            mo.ui.table(reproducibility_summary_df, selection=None),
+            mo.md("<br>"),
+            mo.md("""
+                Mandel's h and k statistics show the consistency of each participant graphically: h compares the mean of a participant with the means of all participants, k the scatter of its repetitions with the pooled scatter of all participants. Bars beyond the dashed (solid) lines indicate stragglers (outliers).
+            """),
+            mo.lazy(reproducibility_mandel_h_plot, show_loading_indicator=True),
+            mo.md("<br>"),
+            mo.lazy(reproducibility_mandel_k_plot, show_loading_indicator=True),
+        ]
+    )
+    return
+
+
+@app.cell
+def _(flow_rate_selector, study_phase_selector, temperature_metrics_df):
+    # TEMPERATURE CORRELATION
+    # STEP 1: Select the results of the selected study phase and flow rates together with their mean experiment temperature
+    # NOTE: the logger temperature is attached to every measurement row in precompute.py (see build_temperature_metrics_df)
+
+    temperature_metrics_filtered_df = temperature_metrics_df.filter(
+        pl.col("study_phase").is_in([study_phase_selector.value])
+        & pl.col("flow_rate").is_in(flow_rate_selector.value)
+    )
+    mo.stop(temperature_metrics_filtered_df.is_empty())
+
+    temperature_coefficients_df = (
+        temperature_metrics_filtered_df.group_by(["metric", "study_phase", "flow_rate"], maintain_order=True)
+        .agg(
+            pl.len().alias("n"),
+            pl.col("temperature/°C").min().alias("temperature_min/°C"),
+            pl.col("temperature/°C").max().alias("temperature_max/°C"),
+            pl.col("temperature_r").first(),
+            pl.col("temperature_coefficient").first(),
+            pl.col("temperature_coefficient_stderr").first(),
+            pl.col("temperature_significant").first(),
+            pl.col("reference_temperature/°C").first(),
+            pl.col("value").std().alias("std"),
+            pl.col("value_corrected").std().alias("std_corrected"),
+        )
+    )
+    return temperature_coefficients_df, temperature_metrics_filtered_df
+
+
+@app.cell
+def _(temperature_metrics_filtered_df, wheel_zoom_x, wheel_zoom_xy, wheel_zoom_y):
+    # TEMPERATURE CORRELATION
+    # STEP 2: Plot every result against the mean temperature of its experiment, with the within-participant fit
+
+    # create selectors and bind them to the legend
+    _participant_selection = alt.selection_point(fields=["participant"], bind="legend")
+
+    _points = (
+        alt.Chart()
+        .mark_point(filled=True, size=60)
+        .encode(
+            x=alt.X("temperature/°C:Q", title="Mean experiment temperature / °C", scale=alt.Scale(zero=False)),
+            y=alt.Y("value:Q", title="Result", scale=alt.Scale(zero=False)),
+            color=alt.Color("participant:N", title="Participant"),
+            shape=alt.Shape("flow_rate:N", title="Flow rate / mL min⁻¹"),
+            opacity=alt.condition(_participant_selection, alt.value(1.0), alt.value(0.1)),
+            tooltip=[
+                "participant:N",
+                "repetition:Q",
+                "flow_rate:Q",
+                alt.Tooltip("temperature/°C:Q", format=".2f"),
+                alt.Tooltip("temperature_std/°C:Q", format=".2f"),
+                alt.Tooltip("value:Q", format=".4g"),
+                alt.Tooltip("value_corrected:Q", format=".4g"),
+            ],
+        )
+    )
+    # the temperature coefficient is pooled within participants, so each participant gets a parallel line
+    _fits = (
+        alt.Chart()
+        .mark_line(strokeDash=[4, 4])
+        .encode(
+            x="temperature/°C:Q",
+            y="value_fitted:Q",
+            color=alt.Color("participant:N", title="Participant"),
+            detail="flow_rate:N",
+            opacity=alt.condition(_participant_selection, alt.value(1.0), alt.value(0.1)),
+        )
+    )
+
+    temperature_correlation_plot = (
+        alt.layer(_points, _fits, data=temperature_metrics_filtered_df)
+        .properties(width=250, height=220)
+        .interactive()
+        .add_params(wheel_zoom_xy, wheel_zoom_x, wheel_zoom_y, _participant_selection)
+        .facet(facet=alt.Facet("metric:N", title=None), columns=2)
+        .resolve_scale(y="independent")
+        .properties(
+            title=alt.TitleParams(
+                text="Figure 24. Results against the experiment temperature",
+                subtitle="Mean logger temperature during each experiment and the resulting metric; dashed lines: linear fit within participants (common slope per flow rate).",
+                anchor="start",
+                orient="top",
+                offset=20,
+            ),
+        )
+    )
+    return (temperature_correlation_plot,)
+
+
+@app.cell
+def section_temperature_correlation(temperature_coefficients_df, temperature_correlation_plot):
+    mo.vstack(
+        [
+            mo.md("## Temperature correlation"),
+            mo.md("""
+                The laboratory temperature was logged once per minute during the study. Each measurement is assigned the nearest logger reading (within five minutes), and the mean temperature of every experiment is related to its result. Experiments outside the logging period are not shown. The slope of the linear fit per metric, study phase and flow rate serves as temperature coefficient (in the unit of the metric per kelvin). It is fitted within participants only (i.e., to the deviations of the temperatures and results of each participant from its means), so that systematic differences between the laboratories are not mistaken for a temperature effect. Only coefficients that differ significantly from zero (two-sided t-test, 5 % level) are used to correct the results, and only to the mean temperature of the respective study phase and flow rate, so the correction stays within the measured temperature range; all other levels (including those with too few repetitions per participant) remain uncorrected. A comparison of the standard deviation before and after the correction indicates how much of the scatter between experiments is explained by the temperature.
+            """),
+            mo.md("<br>"),
+            mo.lazy(temperature_correlation_plot, show_loading_indicator=True),
+            mo.md("<br>"),
+            mo.ui.table(temperature_coefficients_df, selection=None),
+        ]
+    )
+    return
+
+
 if __name__ == "__main__":
     app.run()